@@ -5,10 +5,25 @@ from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from modules.analyzer import MeetingAnalyzer
-from modules.report_generator import ReportGenerator
-import tempfile
+from modules.report_cache import ReportCache
+from modules.stage_profiler import StageProfiler
+from modules.result_cache import ResultCache
+from modules.feature_store import FeatureStore
+from modules.upload_store import UploadStore
+from modules.insight_cache import InsightCache
+from modules.meeting_store import MeetingStore
+from modules.openai_pool import shared_registry
+from modules.timeline_index import TimelineIndex
+from modules.timeline_pyramid import TimelinePyramid
+from modules.analysis_service import AnalysisServiceClient
+from modules.analysis_scheduler import AnalysisScheduler, SchedulerBusy
+from config import (
+    ANALYSIS_SERVICE_URL, LIVE_EMBED_MAX_MB, INSIGHT_DEADLINE, INSIGHT_POLL_INTERVAL, MEETING_TREND_WEEKS
+)
 import os
+import json
 import time
+import uuid
 from datetime import timedelta, datetime
 import base64
 import streamlit.components.v1 as components
@@ -160,6 +175,15 @@ with st.sidebar:
     
     st.markdown("---")
     
+    st.markdown("#### 👥 Team")
+    st.session_state.team = st.text_input(
+        "Team name",
+        help="Analyses are saved to this team's local meeting history for trend tracking. Leave empty to keep nothing.",
+        placeholder="e.g. Platform"
+    ).strip() or None
+    
+    st.markdown("---")
+    
     uploaded_file = st.file_uploader(
         "Upload Meeting Recording",
         type=['mp4', 'mp3', 'wav', 'avi', 'mov'],
@@ -170,6 +194,38 @@ with st.sidebar:
 
 st.markdown('<h1 class="main-header">🎭 Moodflo</h1>', unsafe_allow_html=True)
 
+@st.cache_resource
+def get_scheduler():
+    """One scheduler per server process, shared by every browser session."""
+    return AnalysisScheduler()
+
+@st.cache_resource
+def get_upload_store():
+    return UploadStore()
+
+@st.cache_resource
+def get_report_cache():
+    return ReportCache()
+
+@st.cache_resource
+def get_meeting_store():
+    return MeetingStore()
+
+@st.cache_resource
+def get_analyzer(api_key):
+    """Warm analyzer shared by every session using the same API key: Vokaturi, the OpenAI
+    client and the stage objects are built once per process instead of once per upload."""
+    return MeetingAnalyzer(
+        openai_api_key=api_key,
+        result_cache=ResultCache(),
+        feature_store=FeatureStore(),
+        emotion_executor=get_scheduler().emotion_executor,
+        insight_cache=InsightCache()
+    )
+
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
 def get_emotion_name(emotion_text):
     emotion_map = {
         '⚡ Energised': 'Energised',
@@ -185,13 +241,316 @@ def format_time(seconds):
     secs = int(seconds % 60)
     return f"{mins}:{secs:02d}"
 
-def create_video_player(video_path):
-    """Create custom HTML5 video player with real-time playback tracking"""
-    with open(video_path, 'rb') as video_file:
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_timeline_figure(analysis_id, zoom, _timeline_pyramid):
+    """Complete emotion timeline for one analysis and zoom range, cached across reruns."""
+    if zoom:
+        plot_df = _timeline_pyramid.select(zoom[0] * 60, zoom[1] * 60)
+    else:
+        plot_df = _timeline_pyramid.select()
+    
+    fig = go.Figure()
+    
+    colors = {'⚡ Energised': '#00d4aa', '🔥 Stressed/Tense': '#ff4444',
+             '🌫 Flat/Disengaged': '#888888', '💬 Thoughtful/Constructive': '#667eea',
+             '🌪 Volatile/Unstable': '#ffa500'}
+    
+    # Create color array for each point
+    point_colors = [colors.get(cat, '#667eea') for cat in plot_df['category']]
+    
+    # Add single trace with gradient colors
+    fig.add_trace(go.Scatter(
+        x=plot_df['time'] / 60,
+        y=plot_df['energy'],
+        mode='lines+markers',
+        line=dict(color='rgba(255,255,255,0.3)', width=1),
+        marker=dict(
+            size=8,
+            color=point_colors,
+            line=dict(width=0)
+        ),
+        hovertemplate='<b>%{text}</b><br>Energy: %{y:.1f}<br>Time: %{x:.2f} min<extra></extra>',
+        text=plot_df['category'],
+        showlegend=False
+    ))
+    
+    # Add legend entries manually
+    for category, color in colors.items():
+        if category in plot_df['category'].values:
+            fig.add_trace(go.Scatter(
+                x=[None], y=[None],
+                mode='markers',
+                marker=dict(size=10, color=color),
+                name=category,
+                showlegend=True
+            ))
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=400,
+        hovermode='closest',
+        xaxis_title='Time (minutes)',
+        yaxis_title='Energy Level',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    
+    return fig
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_overview_figures(analysis_id, _results, _timeline_pyramid):
+    """Overall-tab figures, derived once per analysis and reused on every rerun.
+    
+    Only analysis_id (content hash plus config version) is hashed; the result and pyramid it
+    identifies never change."""
+    results = _results
+    summary = results['summary']
+    timeline_df = results['timeline']
+    timeline_pyramid = _timeline_pyramid
+    figures = {}
+    
+    dist_df = pd.DataFrame({
+        'Emotion': list(summary['distribution'].keys()),
+        'Percentage': list(summary['distribution'].values())
+    })
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=dist_df['Emotion'],
+        values=dist_df['Percentage'],
+        hole=0.5,
+        marker=dict(colors=['#00d4aa', '#667eea', '#ff4444', '#ffa500', '#888888'])
+    )])
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=400,
+        showlegend=True
+    )
+    figures['distribution'] = fig
+    
+    cluster_data = results['clusters']
+    
+    # Map cluster numbers to meaningful names
+    cluster_names = {
+        0: 'High Energy Group',
+        1: 'Stressed/Tense Group',
+        2: 'Calm/Neutral Group',
+        3: 'Low Energy Group'
+    }
+    
+    cluster_df = pd.DataFrame({
+        'x': [coord[0] for coord in cluster_data['coordinates']],
+        'y': [coord[1] for coord in cluster_data['coordinates']],
+        'cluster': cluster_data['labels'],
+        'cluster_name': [cluster_names.get(label, f'Group {label}') for label in cluster_data['labels']]
+    })
+    
+    fig = px.scatter(
+        cluster_df, x='x', y='y', color='cluster',
+        color_continuous_scale='Viridis',
+        labels={'x': 'Dimension 1', 'y': 'Dimension 2'},
+        hover_data={'cluster_name': True, 'cluster': False, 'x': False, 'y': False}
+    )
+    
+    fig.update_traces(
+        hovertemplate='<b>%{customdata[0]}</b><extra></extra>'
+    )
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=350,
+        showlegend=False
+    )
+    figures['clusters'] = fig
+    
+    metrics_df = pd.DataFrame({
+        'Metric': ['Energy', 'Participation', 'Silence', 'Volatility'],
+        'Value': [
+            summary['avg_energy'],
+            summary['participation'],
+            summary['silence_pct'],
+            summary['volatility'] * 10
+        ]
+    })
+    
+    fig = go.Figure(data=[go.Bar(
+        x=metrics_df['Metric'],
+        y=metrics_df['Value'],
+        marker_color=['#667eea', '#00d4aa', '#ff4444', '#ffa500']
+    )])
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=350,
+        showlegend=False
+    )
+    figures['metrics'] = fig
+    
+    trajectory_df = timeline_pyramid.select()
+    energy_smooth = trajectory_df['energy'].rolling(window=5, center=True).mean()
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=trajectory_df['time'] / 60,
+        y=energy_smooth,
+        fill='tozeroy',
+        line=dict(color='#667eea', width=2),
+        name='Energy'
+    ))
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=350,
+        showlegend=False,
+        xaxis_title='Time (min)',
+        yaxis_title='Energy'
+    )
+    figures['trajectory'] = fig
+    
+    bin_size = max(1, len(timeline_df) // 20)
+    time_bin = np.arange(len(timeline_df)) // bin_size
+    pattern = timeline_df['energy'].groupby(time_bin).agg(['mean', 'std']).reset_index()
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=pattern.index,
+        y=pattern['mean'],
+        mode='lines+markers',
+        name='Avg Energy',
+        line=dict(color='#667eea', width=2),
+        marker=dict(size=6)
+    ))
+    fig.add_trace(go.Scatter(
+        x=pattern.index,
+        y=pattern['std'],
+        mode='lines',
+        name='Variability',
+        line=dict(color='#ffa500', width=2, dash='dash')
+    ))
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=350,
+        xaxis_title='Meeting Segment',
+        yaxis_title='Value'
+    )
+    figures['pattern'] = fig
+    
+    transitions_df = timeline_pyramid.select()
+    category_numeric = transitions_df['category'].map({
+        '⚡ Energised': 4,
+        '💬 Thoughtful/Constructive': 3,
+        '🌫 Flat/Disengaged': 2,
+        '🔥 Stressed/Tense': 1,
+        '🌪 Volatile/Unstable': 0
+    }).fillna(2)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=transitions_df['time'] / 60,
+        y=category_numeric,
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color='#00d4aa', width=2),
+        hovertemplate='%{y}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(),
+        height=350,
+        xaxis_title='Time (min)',
+        yaxis=dict(
+            tickmode='array',
+            tickvals=[0, 1, 2, 3, 4],
+            ticktext=['Volatile', 'Stressed', 'Disengaged', 'Thoughtful', 'Energised']
+        )
+    )
+    figures['transitions'] = fig
+    
+    return figures
+
+def render_insights():
+    results = st.session_state.results
+    if MeetingAnalyzer.resolve_insights(results):
+        # Refresh the whole page so the reports pick up the upgraded text too
+        st.rerun(scope='app')
+    
+    st.markdown(f'<div class="insights-panel">{results["suggestions"]}</div>', unsafe_allow_html=True)
+    if results.get('insights_future') is not None:
+        st.caption("⏳ AI insights are still being generated; showing built-in suggestions until they arrive")
+    if st.session_state.get('insights_notice'):
+        st.caption(st.session_state.insights_notice)
+
+def render_team_history(team):
+    """Weekly stress share and energy for team, read from the stored rollups."""
+    store = get_meeting_store()
+    since = datetime.now() - timedelta(weeks=MEETING_TREND_WEEKS)
+    start = time.perf_counter()
+    stressed = store.trend('stressed', team, since)
+    energy = store.trend('energy', team, since)
+    query_ms = (time.perf_counter() - start) * 1000
+    
+    if not stressed:
+        st.info("No meetings stored for this team yet.")
+        return
+    
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Bar(
+        x=[row['bucket'] for row in stressed],
+        y=[row['value'] for row in stressed],
+        name='Stressed/Tense (% of time)',
+        marker_color='#ff4444',
+        opacity=0.7,
+        customdata=[row['meetings'] for row in stressed],
+        hovertemplate='Week of %{x}<br>Stressed: %{y:.1f}%<br>Meetings: %{customdata}<extra></extra>'
+    ), secondary_y=False)
+    fig.add_trace(go.Scatter(
+        x=[row['bucket'] for row in energy],
+        y=[row['value'] for row in energy],
+        name='Average energy',
+        mode='lines+markers',
+        line=dict(color='#667eea', width=3)
+    ), secondary_y=True)
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=350,
+        hovermode='x unified',
+        legend=dict(orientation='h', y=1.1)
+    )
+    fig.update_yaxes(title_text='Stressed (%)', range=[0, 100], secondary_y=False)
+    fig.update_yaxes(title_text='Energy', range=[0, 100], secondary_y=True)
+    st.plotly_chart(fig, width='stretch')
+    
+    total = sum(row['meetings'] for row in stressed)
+    st.caption(f"{total} meeting{'s' if total != 1 else ''} over the last {MEETING_TREND_WEEKS} weeks · trend query {query_ms:.1f} ms")
+
+@st.cache_data(max_entries=2, ttl=timedelta(minutes=10), show_spinner=False)
+def create_video_player(analysis_id, _video_path, _timeline_payload):
+    """Create custom HTML5 player with a live dashboard rendered entirely in the browser.
+    
+    KPIs and charts are computed from the precomputed timeline payload on every player
+    tick, so playback and seeking never round-trip to the Streamlit server. The page is
+    cached per analysis (content hash plus config version, never the spool path), so
+    reruns don't re-encode the recording; the few large pages kept expire after a while."""
+    with open(_video_path, 'rb') as video_file:
         video_bytes = video_file.read()
     video_base64 = base64.b64encode(video_bytes).decode()
     
-    ext = os.path.splitext(video_path)[1].lower()
+    ext = os.path.splitext(_video_path)[1].lower()
     mime_types = {
         '.mp4': 'video/mp4',
         '.mov': 'video/quicktime',
@@ -201,9 +560,29 @@ def create_video_player(video_path):
     }
     mime_type = mime_types.get(ext, 'video/mp4')
     is_audio = ext in ['.mp3', '.wav']
+    payload_json = json.dumps(_timeline_payload, separators=(',', ':'))
     
     player_html = f"""
-    <div style="width: 100%; max-width: 800px; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;">
+    <style>
+        .live-root {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; color: #fafafa; }}
+        .live-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }}
+        .live-kpis {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; }}
+        .live-card {{
+            background: rgba(30, 30, 46, 0.6); border: 1px solid rgba(102, 126, 234, 0.3);
+            border-radius: 12px; padding: 14px 8px; text-align: center;
+        }}
+        .live-value {{ font-size: 1.3rem; font-weight: 700; color: #667eea; }}
+        .live-label {{ font-size: 0.8rem; opacity: 0.8; margin-top: 4px; }}
+        .live-panel h4 {{ margin: 18px 0 8px 0; font-weight: 600; }}
+        .dist-row {{ display: flex; align-items: center; gap: 8px; margin: 6px 0; font-size: 13px; }}
+        .dist-label {{ width: 190px; }}
+        .dist-track {{ flex: 1; height: 10px; background: rgba(102, 126, 234, 0.15); border-radius: 5px; }}
+        .dist-fill {{ height: 100%; border-radius: 5px; width: 0%; }}
+        .dist-pct {{ width: 44px; text-align: right; }}
+    </style>
+    <div class="live-root">
+    <div class="live-grid">
+    <div style="width: 100%; max-width: 800px;">
         {'<audio' if is_audio else '<video'} 
             id="meetingPlayer" 
             controls 
@@ -231,18 +610,61 @@ def create_video_player(video_path):
         </div>
     </div>
     
+    <div class="live-panel">
+        <div class="live-kpis">
+            <div class="live-card"><div class="live-value" id="kpiEmotion">-</div><div class="live-label">Current Emotion</div></div>
+            <div class="live-card"><div class="live-value" id="kpiEnergy">0</div><div class="live-label">Current Energy</div></div>
+            <div class="live-card"><div class="live-value" id="kpiSilence">0%</div><div class="live-label">Silence So Far</div></div>
+            <div class="live-card"><div class="live-value" id="kpiAvgEnergy">0</div><div class="live-label">Average Energy</div></div>
+            <div class="live-card"><div class="live-value" id="kpiShifts">0</div><div class="live-label">Emotion Shifts</div></div>
+            <div class="live-card"><div class="live-value" id="kpiElapsed">0:00</div><div class="live-label">Elapsed Time</div></div>
+        </div>
+        <h4>🎯 Live Distribution</h4>
+        <div id="distribution"></div>
+    </div>
+    </div>
+    
+    <div class="live-grid">
+        <div class="live-panel">
+            <h4>📈 Live Emotion Timeline</h4>
+            <canvas id="timelineChart" height="260" style="width: 100%;"></canvas>
+        </div>
+        <div class="live-panel">
+            <h4>📊 Running Avg Energy</h4>
+            <canvas id="avgChart" height="260" style="width: 100%;"></canvas>
+        </div>
+    </div>
+    </div>
+    
     <script>
+        const timeline = {payload_json};
+        const categoryColors = {{
+            energised: '#00d4aa', stressed: '#ff4444', flat: '#888888',
+            thoughtful: '#667eea', volatile: '#ffa500'
+        }};
+        const windowCount = timeline.times.length;
+        
         const player = document.getElementById('meetingPlayer');
         const progressBar = document.getElementById('progressBar');
         const progressFill = document.getElementById('progressFill');
         const progressHandle = document.getElementById('progressHandle');
-        let lastSentTime = -1;
+        let lastRenderedIndex = -1;
         let isDragging = false;
         
+        const distribution = document.getElementById('distribution');
+        const distributionRows = timeline.categories.map(function(category) {{
+            const row = document.createElement('div');
+            row.className = 'dist-row';
+            row.innerHTML = '<span class="dist-label">' + category.label + '</span>' +
+                '<div class="dist-track"><div class="dist-fill" style="background:' +
+                (categoryColors[category.key] || '#667eea') + '"></div></div><span class="dist-pct">0%</span>';
+            distribution.appendChild(row);
+            return {{fill: row.querySelector('.dist-fill'), pct: row.querySelector('.dist-pct')}};
+        }});
+        
         function initPlayer() {{
             const duration = player.duration;
             document.getElementById('duration').textContent = formatTime(duration);
-            console.log('Player initialized, duration:', duration);
         }}
         
         function formatTime(seconds) {{
@@ -251,6 +673,104 @@ def create_video_player(video_path):
             return mins + ':' + (secs < 10 ? '0' : '') + secs;
         }}
         
+        function indexAt(seconds) {{
+            if (windowCount === 0) return -1;
+            const index = timeline.duration > 0 ? Math.floor(seconds / timeline.duration * windowCount) : 0;
+            return Math.min(Math.max(index, 0), windowCount - 1);
+        }}
+        
+        function prepareCanvas(canvas) {{
+            const ratio = window.devicePixelRatio || 1;
+            const width = canvas.clientWidth;
+            const height = canvas.clientHeight;
+            if (canvas.width !== width * ratio) {{
+                canvas.width = width * ratio;
+                canvas.height = height * ratio;
+            }}
+            const ctx = canvas.getContext('2d');
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            ctx.clearRect(0, 0, width, height);
+            ctx.strokeStyle = 'rgba(255,255,255,0.15)';
+            ctx.beginPath();
+            ctx.moveTo(30, height - 20);
+            ctx.lineTo(width, height - 20);
+            ctx.stroke();
+            return {{ctx: ctx, width: width, height: height}};
+        }}
+        
+        function drawTimeline(index, seconds) {{
+            const c = prepareCanvas(document.getElementById('timelineChart'));
+            const x = t => 30 + (c.width - 40) * (t / Math.max(timeline.duration, 1));
+            const y = e => (c.height - 20) - (c.height - 30) * (e / 100);
+            
+            c.ctx.strokeStyle = 'rgba(255,255,255,0.3)';
+            c.ctx.beginPath();
+            for (let i = 0; i <= index; i++) {{
+                if (i === 0) c.ctx.moveTo(x(timeline.times[i]), y(timeline.energy[i]));
+                else c.ctx.lineTo(x(timeline.times[i]), y(timeline.energy[i]));
+            }}
+            c.ctx.stroke();
+            
+            for (let i = 0; i <= index; i++) {{
+                const category = timeline.categories[timeline.codes[i]];
+                c.ctx.fillStyle = category ? (categoryColors[category.key] || '#667eea') : '#667eea';
+                c.ctx.beginPath();
+                c.ctx.arc(x(timeline.times[i]), y(timeline.energy[i]), 3, 0, 2 * Math.PI);
+                c.ctx.fill();
+            }}
+            
+            c.ctx.strokeStyle = 'white';
+            c.ctx.setLineDash([5, 4]);
+            c.ctx.beginPath();
+            c.ctx.moveTo(x(seconds), 0);
+            c.ctx.lineTo(x(seconds), c.height - 20);
+            c.ctx.stroke();
+            c.ctx.setLineDash([]);
+        }}
+        
+        function drawRunningAverage(index) {{
+            const c = prepareCanvas(document.getElementById('avgChart'));
+            const x = t => 30 + (c.width - 40) * (t / Math.max(timeline.duration, 1));
+            const y = e => (c.height - 20) - (c.height - 30) * (e / 100);
+            
+            c.ctx.beginPath();
+            c.ctx.moveTo(x(timeline.times[0]), y(0));
+            for (let i = 0; i <= index; i++) {{
+                c.ctx.lineTo(x(timeline.times[i]), y(timeline.energy_cumsum[i] / (i + 1)));
+            }}
+            c.ctx.lineTo(x(timeline.times[index]), y(0));
+            c.ctx.closePath();
+            c.ctx.fillStyle = 'rgba(102, 126, 234, 0.3)';
+            c.ctx.fill();
+            c.ctx.strokeStyle = '#667eea';
+            c.ctx.stroke();
+        }}
+        
+        function renderLive(seconds) {{
+            document.getElementById('kpiElapsed').textContent = formatTime(seconds);
+            const index = indexAt(seconds);
+            if (index < 0 || index === lastRenderedIndex) return;
+            lastRenderedIndex = index;
+            
+            // Every "so far" KPI is a constant-time lookup into the prefix sums
+            const count = index + 1;
+            const category = timeline.categories[timeline.codes[index]];
+            document.getElementById('kpiEmotion').textContent = category ? category.label : '-';
+            document.getElementById('kpiEnergy').textContent = Math.round(timeline.energy[index]);
+            document.getElementById('kpiSilence').textContent = Math.round(timeline.low_energy_cumsum[index] / count * 100) + '%';
+            document.getElementById('kpiAvgEnergy').textContent = Math.round(timeline.energy_cumsum[index] / count);
+            document.getElementById('kpiShifts').textContent = timeline.change_cumsum[index];
+            
+            timeline.category_cumsum.forEach(function(counts, code) {{
+                const pct = counts[index] / count * 100;
+                distributionRows[code].fill.style.width = pct + '%';
+                distributionRows[code].pct.textContent = Math.round(pct) + '%';
+            }});
+            
+            drawTimeline(index, seconds);
+            drawRunningAverage(index);
+        }}
+        
         function updateProgressBar() {{
             if (!isDragging && player.duration) {{
                 const percent = (player.currentTime / player.duration) * 100;
@@ -272,16 +792,7 @@ def create_video_player(video_path):
             const currentTime = player.currentTime;
             document.getElementById('currentTime').textContent = formatTime(currentTime);
             updateProgressBar();
-            
-            // Send to Streamlit with throttling
-            if (Math.abs(currentTime - lastSentTime) > 0.5 || player.paused) {{
-                console.log('Sending time to Streamlit:', currentTime);
-                window.parent.postMessage({{
-                    type: 'streamlit:setComponentValue',
-                    value: currentTime
-                }}, '*');
-                lastSentTime = currentTime;
-            }}
+            renderLive(currentTime);
         }}
         
         // Update every 200ms during playback for smooth progress bar
@@ -293,10 +804,14 @@ def create_video_player(video_path):
         
         // Initialize when player is ready
         player.addEventListener('loadeddata', function() {{
-            console.log('Player ready to play');
             updatePlaybackTime();
         }});
         
+        window.addEventListener('resize', function() {{
+            lastRenderedIndex = -1;
+            renderLive(player.currentTime);
+        }});
+        
         // Drag functionality for progress handle
         progressHandle.addEventListener('mousedown', function(e) {{
             isDragging = true;
@@ -322,6 +837,8 @@ def create_video_player(video_path):
             }}
             isDragging = false;
         }});
+        
+        renderLive(0);
     </script>
     """
     
@@ -329,14 +846,21 @@ def create_video_player(video_path):
 
 if uploaded_file is not None:
     
-    if 'analysis_complete' not in st.session_state or st.session_state.get('current_file') != uploaded_file.name:
+    if 'analysis_complete' not in st.session_state or st.session_state.get('upload_id') != uploaded_file.file_id:
         st.session_state.analysis_complete = False
-        st.session_state.current_file = uploaded_file.name
+        st.session_state.upload_id = uploaded_file.file_id
+        
+        # Spool the upload to disk in bounded chunks, hashing on the way; the previous
+        # upload of this session is deleted as soon as it is replaced
+        upload_store = get_upload_store()
+        upload_store.release(st.session_state.get('temp_file_path'))
+        uploaded_file.seek(0)
+        st.session_state.temp_file_path, upload_hash = upload_store.save(
+            uploaded_file, suffix=os.path.splitext(uploaded_file.name)[1]
+        )
         
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1])
-        temp_file.write(uploaded_file.read())
-        temp_file.close()
-        st.session_state.temp_file_path = temp_file.name
+        # Identify uploads by content so renamed files hit the cache and same-named files don't
+        st.session_state.current_file = upload_hash
         
         st.markdown("### 🔄 Processing Analysis...")
         progress_container = st.container()
@@ -345,23 +869,87 @@ if uploaded_file is not None:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
+            first_progress = {}
+            
             def update_progress(value, message):
+                first_progress.setdefault('at', time.time())
                 progress_bar.progress(value)
                 status_text.text(message)
             
             start_time = time.time()
-            # Pass API key from sidebar to analyzer
-            api_key = st.session_state.get('openai_api_key', None)
-            analyzer = MeetingAnalyzer(openai_api_key=api_key)
-            results = analyzer.analyze(st.session_state.temp_file_path, progress_callback=update_progress)
+            if ANALYSIS_SERVICE_URL:
+                # Hand the recording to the shared analysis service and poll for the result
+                client = AnalysisServiceClient(ANALYSIS_SERVICE_URL)
+                # Keys are never sent to the service, which uses its own OpenAI configuration
+                if client.stats().get('insights') != 'llm':
+                    st.session_state.insights_notice = (
+                        "ℹ️ The analysis service has no OpenAI key configured; showing built-in suggestions"
+                    )
+                elif st.session_state.get('openai_api_key'):
+                    st.session_state.insights_notice = (
+                        "ℹ️ Generated with the analysis service's own OpenAI key; the sidebar key is not sent"
+                    )
+                else:
+                    st.session_state.insights_notice = None
+                job_id = client.submit(st.session_state.temp_file_path, filename=uploaded_file.name)
+                
+                def update_job(job):
+                    if job['status'] == 'queued':
+                        update_progress(0, f"Queued (position {job['queue_position']}, waiting {job['wait_s']:.0f}s)")
+                    else:
+                        update_progress(job['progress'], job['message'])
+                
+                try:
+                    results = MeetingAnalyzer.deserialize_result(
+                        client.wait(job_id, progress_callback=update_job)
+                    )
+                except (RuntimeError, TimeoutError) as exc:
+                    st.session_state.upload_id = None
+                    status_text.error(f"❌ {exc}")
+                    st.stop()
+            else:
+                st.session_state.insights_notice = None
+                scheduler = get_scheduler()
+                
+                def update_queue(position, reason):
+                    if reason == 'memory':
+                        update_progress(0, "Waiting for memory to free up before starting...")
+                    else:
+                        update_progress(0, f"Queued behind other analyses (position {position})")
+                
+                # Pass API key from sidebar to analyzer
+                analyzer = get_analyzer(st.session_state.get('openai_api_key', None))
+                try:
+                    with scheduler.slot(st.session_state.session_id, on_wait=update_queue):
+                        results = analyzer.analyze(
+                            st.session_state.temp_file_path,
+                            progress_callback=update_progress,
+                            content_hash=upload_hash,
+                            insights_deadline=INSIGHT_DEADLINE
+                        )
+                except SchedulerBusy as exc:
+                    st.session_state.upload_id = None
+                    status_text.error(f"⏳ {exc}")
+                    st.stop()
             processing_time = time.time() - start_time
             
             progress_bar.progress(100)
-            status_text.success(f"✅ Analysis complete in {processing_time:.1f}s!")
+            if results.get('cache_hit'):
+                status_text.success(f"✅ Loaded cached analysis in {processing_time:.1f}s!")
+            else:
+                status_text.success(f"✅ Analysis complete in {processing_time:.1f}s!")
         
         st.session_state.results = results
+        # Render the reports in the background while the dashboard is drawn
+        get_report_cache().submit(results)
+        st.session_state.timeline_index = TimelineIndex.from_result(results)
+        st.session_state.timeline_pyramid = TimelinePyramid.from_result(results)
+        st.session_state.live_payload = st.session_state.timeline_index.to_live_payload(
+            results['timeline'], results['duration']
+        )
         st.session_state.analysis_complete = True
         st.session_state.processing_time = processing_time
+        st.session_state.first_progress_time = first_progress.get('at', time.time()) - start_time
         time.sleep(1)
         st.rerun()
     
@@ -369,6 +957,10 @@ if uploaded_file is not None:
         results = st.session_state.results
         summary = results['summary']
         timeline_df = results['timeline']
+        timeline_pyramid = st.session_state.timeline_pyramid
+        # Figures follow the scoring config as well as the recording, so a config change redraws them
+        analysis_id = f"{st.session_state.current_file}-{ResultCache.config_version()}"
+        overview_figures = build_overview_figures(analysis_id, results, timeline_pyramid)
         
         tab1, tab2 = st.tabs([
             "📊 Overall Analysis", 
@@ -441,81 +1033,23 @@ if uploaded_file is not None:
             with col1:
                 st.markdown("### 📊 Complete Emotion Timeline")
                 
-                fig = go.Figure()
-                
-                colors = {'⚡ Energised': '#00d4aa', '🔥 Stressed/Tense': '#ff4444', 
-                         '🌫 Flat/Disengaged': '#888888', '💬 Thoughtful/Constructive': '#667eea',
-                         '🌪 Volatile/Unstable': '#ffa500'}
-                
-                timeline_df['time_minutes'] = timeline_df['time'] / 60
-                
-                # Create color array for each point
-                point_colors = [colors.get(cat, '#667eea') for cat in timeline_df['category']]
-                
-                # Add single trace with gradient colors
-                fig.add_trace(go.Scatter(
-                    x=timeline_df['time_minutes'],
-                    y=timeline_df['energy'],
-                    mode='lines+markers',
-                    line=dict(color='rgba(255,255,255,0.3)', width=1),
-                    marker=dict(
-                        size=8,
-                        color=point_colors,
-                        line=dict(width=0)
-                    ),
-                    hovertemplate='<b>%{text}</b><br>Energy: %{y:.1f}<br>Time: %{x:.2f} min<extra></extra>',
-                    text=timeline_df['category'],
-                    showlegend=False
-                ))
-                
-                # Add legend entries manually
-                for category, color in colors.items():
-                    if category in timeline_df['category'].values:
-                        fig.add_trace(go.Scatter(
-                            x=[None], y=[None],
-                            mode='markers',
-                            marker=dict(size=10, color=color),
-                            name=category,
-                            showlegend=True
-                        ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=400,
-                    hovermode='closest',
-                    xaxis_title='Time (minutes)',
-                    yaxis_title='Energy Level',
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
+                zoom = None
+                if len(timeline_pyramid.levels) > 1:
+                    # Long meetings are plotted from a downsampled level picked for the visible range
+                    zoom = st.slider(
+                        "Zoom (minutes)",
+                        min_value=0.0,
+                        max_value=float(results['duration'] / 60),
+                        value=(0.0, float(results['duration'] / 60)),
+                        step=0.5,
+                        format="%.1f min"
+                    )
                 
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(build_timeline_figure(analysis_id, zoom, timeline_pyramid), width='stretch')
             
             with col2:
                 st.markdown("### 🎯 Emotion Distribution")
-                
-                dist_df = pd.DataFrame({
-                    'Emotion': list(summary['distribution'].keys()),
-                    'Percentage': list(summary['distribution'].values())
-                })
-                
-                fig = go.Figure(data=[go.Pie(
-                    labels=dist_df['Emotion'],
-                    values=dist_df['Percentage'],
-                    hole=0.5,
-                    marker=dict(colors=['#00d4aa', '#667eea', '#ff4444', '#ffa500', '#888888'])
-                )])
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=400,
-                    showlegend=True
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['distribution'], width='stretch')
             
             st.markdown("---")
             
@@ -523,99 +1057,15 @@ if uploaded_file is not None:
             
             with col1:
                 st.markdown("### 🔬 Team Clustering")
-                
-                cluster_data = results['clusters']
-                
-                # Map cluster numbers to meaningful names
-                cluster_names = {
-                    0: 'High Energy Group',
-                    1: 'Stressed/Tense Group',
-                    2: 'Calm/Neutral Group',
-                    3: 'Low Energy Group'
-                }
-                
-                cluster_df = pd.DataFrame({
-                    'x': [coord[0] for coord in cluster_data['coordinates']],
-                    'y': [coord[1] for coord in cluster_data['coordinates']],
-                    'cluster': cluster_data['labels'],
-                    'cluster_name': [cluster_names.get(label, f'Group {label}') for label in cluster_data['labels']]
-                })
-                
-                fig = px.scatter(
-                    cluster_df, x='x', y='y', color='cluster',
-                    color_continuous_scale='Viridis',
-                    labels={'x': 'Dimension 1', 'y': 'Dimension 2'},
-                    hover_data={'cluster_name': True, 'cluster': False, 'x': False, 'y': False}
-                )
-                
-                fig.update_traces(
-                    hovertemplate='<b>%{customdata[0]}</b><extra></extra>'
-                )
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=350,
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['clusters'], width='stretch')
             
             with col2:
                 st.markdown("### 📊 Metrics Breakdown")
-                
-                metrics_df = pd.DataFrame({
-                    'Metric': ['Energy', 'Participation', 'Silence', 'Volatility'],
-                    'Value': [
-                        summary['avg_energy'],
-                        summary['participation'],
-                        summary['silence_pct'],
-                        summary['volatility'] * 10
-                    ]
-                })
-                
-                fig = go.Figure(data=[go.Bar(
-                    x=metrics_df['Metric'],
-                    y=metrics_df['Value'],
-                    marker_color=['#667eea', '#00d4aa', '#ff4444', '#ffa500']
-                )])
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=350,
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['metrics'], width='stretch')
             
             with col3:
                 st.markdown("### 📈 Energy Trajectory")
-                
-                energy_smooth = pd.Series(timeline_df['energy']).rolling(window=5, center=True).mean()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=timeline_df['time_minutes'],
-                    y=energy_smooth,
-                    fill='tozeroy',
-                    line=dict(color='#667eea', width=2),
-                    name='Energy'
-                ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=350,
-                    showlegend=False,
-                    xaxis_title='Time (min)',
-                    yaxis_title='Energy'
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['trajectory'], width='stretch')
             
             st.markdown("---")
             
@@ -623,94 +1073,49 @@ if uploaded_file is not None:
             
             with col1:
                 st.markdown("### 🎵 Speaking Pattern Analysis")
-                
-                bin_size = max(1, len(timeline_df) // 20)
-                timeline_df['time_bin'] = timeline_df.index // bin_size
-                pattern = timeline_df.groupby('time_bin')['energy'].agg(['mean', 'std']).reset_index()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=pattern.index,
-                    y=pattern['mean'],
-                    mode='lines+markers',
-                    name='Avg Energy',
-                    line=dict(color='#667eea', width=2),
-                    marker=dict(size=6)
-                ))
-                fig.add_trace(go.Scatter(
-                    x=pattern.index,
-                    y=pattern['std'],
-                    mode='lines',
-                    name='Variability',
-                    line=dict(color='#ffa500', width=2, dash='dash')
-                ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=350,
-                    xaxis_title='Meeting Segment',
-                    yaxis_title='Value'
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['pattern'], width='stretch')
             
             with col2:
                 st.markdown("### 📉 Emotion Transitions")
-                
-                category_numeric = timeline_df['category'].map({
-                    '⚡ Energised': 4,
-                    '💬 Thoughtful/Constructive': 3,
-                    '🌫 Flat/Disengaged': 2,
-                    '🔥 Stressed/Tense': 1,
-                    '🌪 Volatile/Unstable': 0
-                }).fillna(2)
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=timeline_df['time_minutes'],
-                    y=category_numeric,
-                    mode='lines',
-                    fill='tozeroy',
-                    line=dict(color='#00d4aa', width=2),
-                    hovertemplate='%{y}<extra></extra>'
-                ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=350,
-                    xaxis_title='Time (min)',
-                    yaxis=dict(
-                        tickmode='array',
-                        tickvals=[0, 1, 2, 3, 4],
-                        ticktext=['Volatile', 'Stressed', 'Disengaged', 'Thoughtful', 'Energised']
-                    )
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                st.plotly_chart(overview_figures['transitions'], width='stretch')
             
             st.markdown("---")
             st.markdown("## 💡 AI-Powered Insights")
             
-            st.markdown(f'<div class="insights-panel">{results["suggestions"]}</div>', unsafe_allow_html=True)
+            if results.get('insights_future') is not None:
+                # KPIs are already on screen; poll for the LLM text and upgrade in place
+                st.fragment(run_every=INSIGHT_POLL_INTERVAL)(render_insights)()
+            else:
+                render_insights()
             
             st.markdown("---")
             st.markdown("## 📥 Export Reports")
             
-            export_col1, export_col2 = st.columns([1.5, 1.5])
+            export_col1, export_col2, export_col3 = st.columns(3)
             
-            report_gen = ReportGenerator(results, summary, timeline_df)
-            txt_report = report_gen.generate_txt_report()
-            pdf_buffer = report_gen.generate_pdf_report()
+            reports = get_report_cache().submit(results)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
+            # Checked once per run so every button sees the same state; a failed render disables
+            # the buttons instead of raising out of the whole tab
+            rendered = reports.done()
+            render_failed = rendered and reports.exception() is not None
+            if render_failed:
+                st.error(f"⚠️ Reports could not be generated: {reports.exception()}")
+                if st.button("🔁 Retry report generation"):
+                    get_report_cache().discard(results)
+                    st.rerun()
+            
+            def report_data(kind):
+                # Served from the background render; waits for it only if clicked before it finishes
+                if not rendered:
+                    return lambda: reports.result()[kind]
+                return b'' if render_failed else reports.result()[kind]
+            
             with export_col1:
                 st.download_button(
                     label="📄 Download TXT Report",
-                    data=txt_report,
+                    data=report_data('txt'),
                     file_name=f"moodflo_report_{timestamp}.txt",
                     mime="text/plain",
                     width='stretch',
@@ -720,20 +1125,85 @@ if uploaded_file is not None:
             with export_col2:
                 st.download_button(
                     label="📑 Download PDF Report",
-                    data=pdf_buffer,
+                    data=report_data('pdf'),
                     file_name=f"moodflo_report_{timestamp}.pdf",
                     mime="application/pdf",
                     width='stretch',
                     help="Download professional PDF report with formatted tables"
                 )
             
+            with export_col3:
+                st.download_button(
+                    label="🧮 Download Frame Data (Parquet)",
+                    data=report_data('parquet'),
+                    file_name=f"moodflo_frames_{timestamp}.parquet",
+                    mime="application/vnd.apache.parquet",
+                    width='stretch',
+                    disabled=render_failed or (rendered and reports.result()['parquet'] is None),
+                    help="Per-window time, energy, emotion probabilities, mood category and cluster as typed columns"
+                )
+            
+            if st.session_state.team:
+                # Saved once per analysis and team, also when the team is entered afterwards
+                if st.session_state.get('history_saved') != (analysis_id, st.session_state.team):
+                    get_meeting_store().add(results, st.session_state.team)
+                    st.session_state.history_saved = (analysis_id, st.session_state.team)
+                st.markdown("---")
+                st.markdown(f"## 🗂️ {st.session_state.team} History")
+                render_team_history(st.session_state.team)
+            
             st.markdown("---")
             
             info_cols = st.columns(2)
             with info_cols[0]:
                 st.metric("Meeting Duration", f"{int(results['duration'] // 60)}m {int(results['duration'] % 60)}s")
             with info_cols[1]:
-                st.metric("Processing Time", f"{st.session_state.processing_time:.1f}s")
+                st.metric(
+                    "Processing Time",
+                    f"{st.session_state.processing_time:.1f}s",
+                    delta="cached" if results.get('cache_hit') else None,
+                    delta_color="off"
+                )
+            
+            stage_timings = results.get('stage_timings', [])
+            if reports.done() and reports.exception() is None:
+                stage_timings = stage_timings + reports.result()['stage_timings']
+            if stage_timings:
+                with st.expander("⏱️ Processing Breakdown by Stage"):
+                    timing_df = pd.DataFrame([{
+                        'Stage': stage['stage'],
+                        'Wall (ms)': round(stage['wall_ms'], 1),
+                        'CPU (ms)': round(stage['cpu_ms'], 1),
+                        'Peak RSS Δ (MB)': round(stage['peak_rss_delta_mb'], 1),
+                        'Items': stage['items']
+                    } for stage in stage_timings])
+                    
+                    st.dataframe(timing_df, hide_index=True, width='stretch')
+                    
+                    if 'first_progress_time' in st.session_state:
+                        st.caption(f"Time to first progress update: {st.session_state.first_progress_time * 1000:.0f} ms")
+                    
+                    insight_cache = get_analyzer(st.session_state.get('openai_api_key', None)).insights_generator.cache
+                    if insight_cache is not None and st.session_state.get('openai_api_key'):
+                        cache_stats = insight_cache.stats()
+                        st.caption(
+                            f"LLM insight cache: {cache_stats['hits']}/{cache_stats['lookups']} hits "
+                            f"({cache_stats['hit_rate'] * 100:.0f}%), {cache_stats['entries']} entries"
+                        )
+                        pool_stats = shared_registry().stats()
+                        st.caption(
+                            f"OpenAI connections: {pool_stats['reused']}/{pool_stats['requests']} requests on a "
+                            f"kept-alive connection ({pool_stats['reuse_rate'] * 100:.0f}%), "
+                            f"{pool_stats['tls_handshakes']} TLS handshakes"
+                        )
+                    
+                    st.download_button(
+                        label="🧭 Download Chrome Trace",
+                        data=json.dumps(StageProfiler.to_chrome_trace(stage_timings)),
+                        file_name=f"moodflo_trace_{timestamp}.json",
+                        mime="application/json",
+                        help="Open in chrome://tracing or ui.perfetto.dev"
+                    )
             
             st.markdown('<div class="privacy-footer">🔒 Privacy Protected: Only voice tone analyzed. No content recorded or stored.</div>', unsafe_allow_html=True)
             
@@ -741,287 +1211,299 @@ if uploaded_file is not None:
         
         with tab2:
             st.markdown('<div class="tab-content">', unsafe_allow_html=True)
- 
-            if 'playback_time' not in st.session_state:
-                st.session_state.playback_time = 0
             
-            # Add auto-refresh for live updates
-            if 'auto_refresh' not in st.session_state:
-                st.session_state.auto_refresh = False
-            
-            col_video, col_live = st.columns([1, 1])
-            
-            with col_video:
-                st.markdown("### 📹 Meeting Recording")
-                
-                # Simple video player without custom controls
-                ext = os.path.splitext(st.session_state.temp_file_path)[1].lower()
-                is_audio = ext in ['.mp3', '.wav']
-                
-                if is_audio:
-                    st.audio(st.session_state.temp_file_path)
-                else:
-                    st.video(st.session_state.temp_file_path)
-                
-                st.caption("📹 Watch the video and use the slider to analyze any moment")
-            
-                # Manual time slider in minutes
-                max_minutes = results['duration'] / 60
-                
-                playback_minutes = st.slider(
-                    "Seek to time (minutes)",
-                    min_value=0.0,
-                    max_value=float(max_minutes),
-                    value=float(st.session_state.playback_time / 60),
-                    step=0.1,
-                    format="%.1f min",
-                    help="Drag to analyze any moment in the meeting"
+            if os.path.getsize(st.session_state.temp_file_path) <= LIVE_EMBED_MAX_MB * 1024 * 1024:
+                # Playback, KPIs and charts all run in the browser from one precomputed payload
+                st.caption("▶️ Play or seek the recording; the dashboard follows playback in real time")
+                components.html(
+                    create_video_player(analysis_id, st.session_state.temp_file_path, st.session_state.live_payload),
+                    height=980
                 )
+            else:
+                # Recordings too large to embed in the page fall back to server-side seeking
+                if 'playback_time' not in st.session_state:
+                    st.session_state.playback_time = 0
+                
+                # Add auto-refresh for live updates
+                if 'auto_refresh' not in st.session_state:
+                    st.session_state.auto_refresh = False
+                
+                col_video, col_live = st.columns([1, 1])
+                
+                with col_video:
+                    st.markdown("### 📹 Meeting Recording")
+                    
+                    # Simple video player without custom controls
+                    ext = os.path.splitext(st.session_state.temp_file_path)[1].lower()
+                    is_audio = ext in ['.mp3', '.wav']
+                    
+                    if is_audio:
+                        st.audio(st.session_state.temp_file_path)
+                    else:
+                        st.video(st.session_state.temp_file_path)
+                    
+                    st.caption("📹 Watch the video and use the slider to analyze any moment")
+                    
+                    # Manual time slider in minutes
+                    max_minutes = results['duration'] / 60
+                    
+                    playback_minutes = st.slider(
+                        "Seek to time (minutes)",
+                        min_value=0.0,
+                        max_value=float(max_minutes),
+                        value=float(st.session_state.playback_time / 60),
+                        step=0.1,
+                        format="%.1f min",
+                        help="Drag to analyze any moment in the meeting"
+                    )
+                    
+                    # Convert back to seconds
+                    playback_time = playback_minutes * 60
+                    st.session_state.playback_time = playback_time
+                    
+                    
+                    timeline_index = st.session_state.timeline_index
+                    current_idx = timeline_index.index_at(playback_time, results['duration'])
+                    so_far = timeline_index.so_far(current_idx)
+                    
+                    # A view, not a copy: charts read it, KPIs come from the prefix sums
+                    current_data = timeline_df.iloc[:current_idx+1]
+                    current_emotion = timeline_df['category'].iat[current_idx]
+                    current_energy = timeline_df['energy'].iat[current_idx]
+                
+                with col_live:
+                    
+                    st.markdown("## 🔑 Key Performance Indicators")
+                    st.markdown("---")
+                    
+                    live_kpi_row1 = st.columns(3)
+                    
+                    with live_kpi_row1[0]:
+                        emotion_display = get_emotion_name(current_emotion)
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{emotion_display}</div>
+                                <div class="metric-label">Current Emotion</div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with live_kpi_row1[1]:
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{current_energy:.0f}</div>
+                                <div class="metric-label">Current Energy</div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with live_kpi_row1[2]:
+                        current_silence = so_far['silence_pct']
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{current_silence:.0f}%</div>
+                                <div class="metric-label">Silence So Far</div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    
+                    live_kpi_row2 = st.columns(3)
+                    
+                    with live_kpi_row2[0]:
+                        avg_energy = so_far['avg_energy']
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{avg_energy:.0f}</div>
+                                <div class="metric-label">Average Energy</div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with live_kpi_row2[1]:
+                        emotion_changes = so_far['emotion_shifts']
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{emotion_changes}</div>
+                                <div class="metric-label">Emotion Shifts</div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with live_kpi_row2[2]:
+                        elapsed_time = format_time(playback_time)
+                        st.markdown(f"""
+                            <div class="metric-card">
+                                <div class="metric-value">{elapsed_time}</div>
+                                <div class="metric-label">Elapsed Time</div>
+                            </div>
+                        """, unsafe_allow_html=True)
                 
-                # Convert back to seconds
-                playback_time = playback_minutes * 60
-                st.session_state.playback_time = playback_time
-
-                
-                current_idx = int((playback_time / results['duration']) * len(timeline_df))
-                current_idx = min(max(current_idx, 0), len(timeline_df) - 1)
-                
-                current_data = timeline_df.iloc[:current_idx+1].copy() if current_idx > 0 else timeline_df.iloc[:1].copy()
-                current_emotion = timeline_df.iloc[current_idx]['category']
-                current_energy = timeline_df.iloc[current_idx]['energy']
-            
-            with col_live:
-
-                st.markdown("## 🔑 Key Performance Indicators")
                 st.markdown("---")
                 
-                live_kpi_row1 = st.columns(3)
-                
-                with live_kpi_row1[0]:
-                    emotion_display = get_emotion_name(current_emotion)
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{emotion_display}</div>
-                            <div class="metric-label">Current Emotion</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with live_kpi_row1[1]:
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{current_energy:.0f}</div>
-                            <div class="metric-label">Current Energy</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with live_kpi_row1[2]:
-                    current_silence = (current_data['energy'] < 20).sum() / len(current_data) * 100 if len(current_data) > 0 else 0
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{current_silence:.0f}%</div>
-                            <div class="metric-label">Silence So Far</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                live_kpi_row2 = st.columns(3)
-                
-                with live_kpi_row2[0]:
-                    avg_energy = current_data['energy'].mean() if len(current_data) > 0 else 0
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{avg_energy:.0f}</div>
-                            <div class="metric-label">Average Energy</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with live_kpi_row2[1]:
-                    emotion_changes = (current_data['category'].shift() != current_data['category']).sum() if len(current_data) > 1 else 0
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{emotion_changes}</div>
-                            <div class="metric-label">Emotion Shifts</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                with live_kpi_row2[2]:
-                    elapsed_time = format_time(playback_time)
-                    st.markdown(f"""
-                        <div class="metric-card">
-                            <div class="metric-value">{elapsed_time}</div>
-                            <div class="metric-label">Elapsed Time</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### 📈 Live Emotion Timeline")
-                
-                fig = go.Figure()
-                
-                colors_map = {'⚡ Energised': '#00d4aa', '🔥 Stressed/Tense': '#ff4444', 
-                             '🌫 Flat/Disengaged': '#888888', '💬 Thoughtful/Constructive': '#667eea',
-                             '🌪 Volatile/Unstable': '#ffa500'}
-                
-                current_data['time_minutes'] = current_data['time'] / 60
-                
-                # Create color array for each point
-                point_colors = [colors_map.get(cat, '#667eea') for cat in current_data['category']]
-                
-                # Add single trace with gradient colors
-                fig.add_trace(go.Scatter(
-                    x=current_data['time_minutes'],
-                    y=current_data['energy'],
-                    mode='lines+markers',
-                    line=dict(color='rgba(255,255,255,0.3)', width=1),
-                    marker=dict(
-                        size=8,
-                        color=point_colors,
-                        line=dict(width=0)
-                    ),
-                    hovertemplate='<b>%{text}</b><br>Energy: %{y:.1f}<br>Time: %{x:.2f} min<extra></extra>',
-                    text=current_data['category'],
-                    showlegend=False
-                ))
-                
-                # Add legend entries manually
-                for category, color in colors_map.items():
-                    if category in current_data['category'].values:
-                        fig.add_trace(go.Scatter(
-                            x=[None], y=[None],
-                            mode='markers',
-                            marker=dict(size=10, color=color),
-                            name=category,
-                            showlegend=True
-                        ))
-                
-                fig.add_vline(x=playback_time/60, line_dash="dash", line_color="white", line_width=2, annotation_text="Now")
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=400,
-                    xaxis_title='Time (minutes)',
-                    yaxis_title='Energy Level',
-                    showlegend=True,
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
-                
-                st.plotly_chart(fig, width='stretch')
-            
-            with col2:
-                st.markdown("### 🎯 Live Distribution")
-                
-                current_dist = current_data['category'].value_counts(normalize=True) * 100
-                
-                fig = go.Figure(data=[go.Pie(
-                    labels=current_dist.index,
-                    values=current_dist.values,
-                    hole=0.5,
-                    marker=dict(colors=['#00d4aa', '#667eea', '#ff4444', '#ffa500', '#888888'])
-                )])
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=400
-                )
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("### 📈 Live Emotion Timeline")
+                    
+                    fig = go.Figure()
+                    
+                    colors_map = {'⚡ Energised': '#00d4aa', '🔥 Stressed/Tense': '#ff4444', 
+                                 '🌫 Flat/Disengaged': '#888888', '💬 Thoughtful/Constructive': '#667eea',
+                                 '🌪 Volatile/Unstable': '#ffa500'}
+                    
+                    time_minutes = current_data['time'] / 60
+                    live_plot_df = timeline_pyramid.select(end=playback_time)
+                    
+                    # Create color array for each point
+                    point_colors = [colors_map.get(cat, '#667eea') for cat in live_plot_df['category']]
+                    
+                    # Add single trace with gradient colors
+                    fig.add_trace(go.Scatter(
+                        x=live_plot_df['time'] / 60,
+                        y=live_plot_df['energy'],
+                        mode='lines+markers',
+                        line=dict(color='rgba(255,255,255,0.3)', width=1),
+                        marker=dict(
+                            size=8,
+                            color=point_colors,
+                            line=dict(width=0)
+                        ),
+                        hovertemplate='<b>%{text}</b><br>Energy: %{y:.1f}<br>Time: %{x:.2f} min<extra></extra>',
+                        text=live_plot_df['category'],
+                        showlegend=False
+                    ))
+                    
+                    # Add legend entries manually
+                    for category, color in colors_map.items():
+                        if category in so_far['distribution']:
+                            fig.add_trace(go.Scatter(
+                                x=[None], y=[None],
+                                mode='markers',
+                                marker=dict(size=10, color=color),
+                                name=category,
+                                showlegend=True
+                            ))
+                    
+                    fig.add_vline(x=playback_time/60, line_dash="dash", line_color="white", line_width=2, annotation_text="Now")
+                    
+                    fig.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        font=dict(),
+                        height=400,
+                        xaxis_title='Time (minutes)',
+                        yaxis_title='Energy Level',
+                        showlegend=True,
+                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+                    )
+                    
+                    st.plotly_chart(fig, width='stretch')
+                
+                with col2:
+                    st.markdown("### 🎯 Live Distribution")
+                    
+                    current_dist = dict(sorted(so_far['distribution'].items(), key=lambda item: item[1], reverse=True))
+                    
+                    fig = go.Figure(data=[go.Pie(
+                        labels=list(current_dist.keys()),
+                        values=list(current_dist.values()),
+                        hole=0.5,
+                        marker=dict(colors=['#00d4aa', '#667eea', '#ff4444', '#ffa500', '#888888'])
+                    )])
+                    
+                    fig.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        font=dict(),
+                        height=400
+                    )
+                    
+                    st.plotly_chart(fig, width='stretch')
                 
-                st.plotly_chart(fig, width='stretch')
-            
-            st.markdown("---")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("### ⚡ Energy Gauge")
+                st.markdown("---")
                 
-                fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=current_energy,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': "#667eea"},
-                        'steps': [
-                            {'range': [0, 30], 'color': "#888888"},
-                            {'range': [30, 70], 'color': "#00d4aa"},
-                            {'range': [70, 100], 'color': "#ffa500"}
-                        ],
-                        'threshold': {
-                            'line': {'color': "red", 'width': 4},
-                            'thickness': 0.75,
-                            'value': 90
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.markdown("### ⚡ Energy Gauge")
+                    
+                    fig = go.Figure(go.Indicator(
+                        mode="gauge+number",
+                        value=current_energy,
+                        domain={'x': [0, 1], 'y': [0, 1]},
+                        gauge={
+                            'axis': {'range': [None, 100]},
+                            'bar': {'color': "#667eea"},
+                            'steps': [
+                                {'range': [0, 30], 'color': "#888888"},
+                                {'range': [30, 70], 'color': "#00d4aa"},
+                                {'range': [70, 100], 'color': "#ffa500"}
+                            ],
+                            'threshold': {
+                                'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75,
+                                'value': 90
+                            }
                         }
-                    }
-                ))
-                
-                fig.update_layout(
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font={'color': '#fafafa'},
-                    height=300
-                )
-                
-                st.plotly_chart(fig, width='stretch')
-            
-            with col2:
-                st.markdown("### 📊 Running Avg Energy")
-                
-                running_avg = current_data['energy'].expanding().mean()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=current_data['time_minutes'],
-                    y=running_avg,
-                    fill='tozeroy',
-                    line=dict(color='#667eea', width=2)
-                ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=300,
-                    xaxis_title='Time (min)',
-                    yaxis_title='Avg Energy'
-                )
-                
-                st.plotly_chart(fig, width='stretch')
-            
-            with col3:
-                st.markdown("### 🌊 Emotion Volatility")
-                
-                category_num = current_data['category'].map({
-                    '⚡ Energised': 4, '💬 Thoughtful/Constructive': 3,
-                    '🌫 Flat/Disengaged': 2, '🔥 Stressed/Tense': 1,
-                    '🌪 Volatile/Unstable': 0
-                }).fillna(2)
-                
-                volatility = category_num.diff().abs().rolling(window=5).mean()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=current_data['time_minutes'],
-                    y=volatility,
-                    mode='lines',
-                    fill='tozeroy',
-                    line=dict(color='#ffa500', width=2)
-                ))
-                
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(),
-                    height=300,
-                    xaxis_title='Time (min)',
-                    yaxis_title='Volatility'
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                    ))
+                    
+                    fig.update_layout(
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        font={'color': '#fafafa'},
+                        height=300
+                    )
+                    
+                    st.plotly_chart(fig, width='stretch')
+                
+                with col2:
+                    st.markdown("### 📊 Running Avg Energy")
+                    
+                    running_avg = timeline_index.running_avg_energy(current_idx)
+                    
+                    fig = go.Figure()
+                    fig.add_trace(go.Scatter(
+                        x=time_minutes,
+                        y=running_avg,
+                        fill='tozeroy',
+                        line=dict(color='#667eea', width=2)
+                    ))
+                    
+                    fig.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        font=dict(),
+                        height=300,
+                        xaxis_title='Time (min)',
+                        yaxis_title='Avg Energy'
+                    )
+                    
+                    st.plotly_chart(fig, width='stretch')
+                
+                with col3:
+                    st.markdown("### 🌊 Emotion Volatility")
+                    
+                    category_num = current_data['category'].map({
+                        '⚡ Energised': 4, '💬 Thoughtful/Constructive': 3,
+                        '🌫 Flat/Disengaged': 2, '🔥 Stressed/Tense': 1,
+                        '🌪 Volatile/Unstable': 0
+                    }).fillna(2)
+                    
+                    volatility = category_num.diff().abs().rolling(window=5).mean()
+                    
+                    fig = go.Figure()
+                    fig.add_trace(go.Scatter(
+                        x=time_minutes,
+                        y=volatility,
+                        mode='lines',
+                        fill='tozeroy',
+                        line=dict(color='#ffa500', width=2)
+                    ))
+                    
+                    fig.update_layout(
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        font=dict(),
+                        height=300,
+                        xaxis_title='Time (min)',
+                        yaxis_title='Volatility'
+                    )
+                    
+                    st.plotly_chart(fig, width='stretch')
             
             st.markdown('<div class="privacy-footer">🔒 Privacy Protected: Only voice tone analyzed. No content recorded or stored.</div>', unsafe_allow_html=True)
             
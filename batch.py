@@ -0,0 +1,72 @@
+"""Headless batch analysis of a directory of meeting recordings.
+
+Examples:
+    python batch.py recordings/ results/
+    python batch.py recordings/ results/ --workers 8 --features
+    python batch.py recordings/ results/ --frames arrow
+    python batch.py recordings/platform/ results/ --team Platform
+    python batch.py recordings/ results/ --features --rescore
+"""
+import argparse
+from config import OPENAI_API_KEY, FEATURE_STORE_DIR
+from modules.batch_runner import BatchRunner
+
+def main():
+    parser = argparse.ArgumentParser(description="Moodflo batch analysis")
+    parser.add_argument('input_dir', help="Directory containing recordings")
+    parser.add_argument('output_dir', help="Directory for per-file results and the manifest")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--llm', action='store_true', help="Use GPT-4 insights (needs OPENAI_API_KEY)")
+    parser.add_argument('--features', action='store_true', help="Persist per-frame features for later rescoring")
+    parser.add_argument('--rescore', action='store_true',
+                        help="Rescore every recording with stored features instead of skipping it (needs --features)")
+    parser.add_argument('--frames', choices=['parquet', 'arrow'], default=None,
+                        help="Also write per-frame data as Parquet or memory-mappable Arrow files")
+    parser.add_argument('--team', default=None, help="Add every result to this team's meeting history")
+    parser.add_argument('--no-recursive', action='store_true', help="Only scan the top-level directory")
+    args = parser.parse_args()
+    if args.rescore and not args.features:
+        parser.error("--rescore needs --features")
+    
+    runner = BatchRunner(
+        args.input_dir,
+        args.output_dir,
+        workers=args.workers,
+        openai_api_key=OPENAI_API_KEY if args.llm else None,
+        feature_dir=FEATURE_STORE_DIR if args.features else None,
+        recursive=not args.no_recursive,
+        frames=args.frames,
+        team=args.team,
+        rescore=args.rescore
+    )
+    
+    def report_progress(relative, entry, done, total):
+        if entry['status'] == 'done':
+            print(f"[{done}/{total}] {relative}: {entry['duration']:.0f}s audio in {entry['wall_s']:.1f}s "
+                  f"({entry['psych_risk']} risk)", flush=True)
+        else:
+            print(f"[{done}/{total}] {relative}: FAILED {entry['error']}", flush=True)
+    
+    report = runner.run(progress_callback=report_progress)
+    
+    print("\n" + "=" * 60)
+    print("BATCH PERFORMANCE REPORT")
+    print("=" * 60)
+    print(f"Files done / failed / skipped: {report['files_done']} / {report['files_failed']} / {report['files_skipped']}")
+    print(f"Rescored from stored features: {report['files_rescored']}")
+    print(f"Workers:                       {report['workers']}")
+    print(f"Wall time:                     {report['wall_s']:.1f}s")
+    print(f"Audio processed:               {report['audio_s'] / 60:.1f} min")
+    print(f"Throughput:                    {report['realtime_factor']:.1f}x real-time, {report['files_per_min']:.1f} files/min")
+    print(f"Speedup:                       {report['speedup']:.2f}x ({report['parallel_efficiency'] * 100:.0f}% efficiency)")
+    if args.llm:
+        print(f"LLM insights (batched):        {report['insights_s']:.1f}s")
+        print(f"Re-attached to earlier files:  {report['files_insights_only']}")
+    
+    if report['stage_totals']:
+        print("\nStage totals (summed over files):")
+        for stage, totals in sorted(report['stage_totals'].items(), key=lambda item: -item[1]['wall_ms']):
+            print(f"  {stage:15} wall {totals['wall_ms'] / 1000:8.1f}s   cpu {totals['cpu_ms'] / 1000:8.1f}s")
+
+if __name__ == "__main__":
+    main()
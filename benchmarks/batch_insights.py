@@ -0,0 +1,117 @@
+"""Batch insights benchmark against a local mock OpenAI-compatible server.
+
+Starts an HTTP server that answers /v1/chat/completions after a fixed latency and
+rejects a fraction of requests with 429, then generates suggestions for N synthetic
+meeting summaries with InsightsGenerator.generate_batch() and compares the wall time
+with the serial estimate and the rate-limit floor.
+    
+    python benchmarks/batch_insights.py --meetings 1000 --latency 0.8 --rpm 3000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import MOODFLO_CATEGORIES
+from modules.insights_generator import InsightsGenerator
+from modules.openai_pool import shared_registry
+from modules.rate_limiter import RateLimiter
+
+def make_handler(latency, error_rate, counters):
+    
+    class MockCompletions(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            counters['requests'] += 1
+            
+            if random.random() < error_rate:
+                counters['rejected'] += 1
+                body = json.dumps({'error': {'message': 'Rate limit reached', 'type': 'requests'}}).encode('utf-8')
+                self.send_response(429)
+                self.send_header('Retry-After', '0.5')
+            else:
+                time.sleep(latency)
+                body = json.dumps({
+                    'id': 'chatcmpl-mock',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': request['model'],
+                    'choices': [{
+                        'index': 0,
+                        'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': '• Mock suggestion'}
+                    }],
+                    'usage': {'prompt_tokens': 150, 'completion_tokens': 10, 'total_tokens': 160}
+                }).encode('utf-8')
+                self.send_response(200)
+            
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return MockCompletions
+
+def make_summary(rng):
+    weights = [rng.random() for _ in MOODFLO_CATEGORIES]
+    total = sum(weights)
+    distribution = {name: weight / total * 100 for name, weight in zip(MOODFLO_CATEGORIES.values(), weights)}
+    return {
+        'dominant_emotion': max(distribution, key=distribution.get),
+        'avg_energy': rng.uniform(0, 100),
+        'silence_pct': rng.uniform(0, 40),
+        'participation': rng.uniform(20, 100),
+        'volatility': rng.uniform(0, 10),
+        'psych_risk': rng.choice(['Low', 'Medium', 'High']),
+        'distribution': distribution
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch insights benchmark")
+    parser.add_argument('--meetings', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.8, help="Mock completion latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="Fraction of requests answered with 429")
+    parser.add_argument('--rpm', type=int, default=3000)
+    parser.add_argument('--tpm', type=int, default=1000000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+    
+    counters = {'requests': 0, 'rejected': 0}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.latency, args.error_rate, counters))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    rng = random.Random(0)
+    summaries = [make_summary(rng) for _ in range(args.meetings)]
+    generator = InsightsGenerator(api_key='mock', base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    limiter = RateLimiter(args.rpm, args.tpm)
+    
+    start = time.perf_counter()
+    results = generator.generate_batch(summaries, max_concurrency=args.concurrency, rate_limiter=limiter)
+    wall_s = time.perf_counter() - start
+    server.shutdown()
+    
+    llm = sum(1 for _, source in results if source == 'llm')
+    print(f"meetings          {args.meetings} ({llm} LLM, {args.meetings - llm} fallback)")
+    print(f"requests          {counters['requests']} ({counters['rejected']} rejected with 429)")
+    print(f"wall time         {wall_s:.1f}s")
+    print(f"serial estimate   {args.meetings * args.latency:.1f}s")
+    print(f"rate-limit floor  {args.meetings / args.rpm * 60:.1f}s")
+    print(f"limiter waits     {limiter.waited_s:.1f}s summed over threads")
+    pool = shared_registry().stats()
+    print(f"connections       {pool['new_connections']} opened, {pool['reuse_rate'] * 100:.0f}% of requests reused one")
+
+if __name__ == "__main__":
+    main()
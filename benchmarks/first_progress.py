@@ -0,0 +1,61 @@
+"""Time-to-first-progress benchmark for the dashboard's analyzer setup.
+
+Compares building a new MeetingAnalyzer per upload (the old behaviour) with reusing
+one warm analyzer, measuring the time from the start of an upload until the first
+progress update reaches the UI. Each cold sample runs in a freshly spawned process, so
+it pays the process-wide Vokaturi load and OpenAI client setup that warm reuse avoids.
+    
+    python benchmarks/first_progress.py meeting.wav --runs 5
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from config import OPENAI_API_KEY
+from modules.analyzer import MeetingAnalyzer
+
+class FirstProgress(Exception):
+    pass
+
+def _stop_at_first_progress(value, message):
+    raise FirstProgress()
+
+def time_to_first_progress(make_analyzer, recording):
+    start = time.perf_counter()
+    analyzer = make_analyzer()
+    try:
+        analyzer.analyze(recording, progress_callback=_stop_at_first_progress)
+    except FirstProgress:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+def cold_sample(recording):
+    return time_to_first_progress(lambda: MeetingAnalyzer(openai_api_key=OPENAI_API_KEY), recording)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-progress benchmark")
+    parser.add_argument('recording')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    cold = []
+    context = multiprocessing.get_context('spawn')
+    for _ in range(args.runs):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            cold.append(executor.submit(cold_sample, args.recording).result())
+    
+    warm_analyzer = MeetingAnalyzer(openai_api_key=OPENAI_API_KEY)
+    warm = [time_to_first_progress(lambda: warm_analyzer, args.recording) for _ in range(args.runs)]
+    
+    print(f"{'':18}{'p50':>10}{'max':>10}")
+    print(f"{'new per upload':18}{np.percentile(cold, 50):>8.1f}ms{max(cold):>8.1f}ms")
+    print(f"{'warm (cached)':18}{np.percentile(warm, 50):>8.1f}ms{max(warm):>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
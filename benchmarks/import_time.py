@@ -0,0 +1,56 @@
+"""Cold-start import benchmark.
+
+Imports each entry point in a fresh interpreter and reports wall time, plus which
+heavy optional dependencies got loaded as a side effect. None of them should be
+loaded before a stage that needs them actually runs.
+    
+    python benchmarks/import_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    'modules.analyzer',
+    'modules.report_generator',
+    'modules.live_analyzer',
+    'modules.batch_runner',
+]
+
+HEAVY_MODULES = ['librosa', 'sklearn', 'reportlab', 'openai', 'imageio_ffmpeg']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', action='append', help="Entry point to measure (repeatable)")
+    args = parser.parse_args()
+    
+    print(f"{'module':28}{'median':>10}{'min':>10}  heavy deps loaded")
+    for module in args.module or ENTRY_POINTS:
+        samples = [measure(module) for _ in range(args.runs)]
+        times = [sample['ms'] for sample in samples]
+        loaded = ', '.join(samples[-1]['loaded']) or '-'
+        print(f"{module:28}{statistics.median(times):>8.0f}ms{min(times):>8.0f}ms  {loaded}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Update-lag benchmark for the live analyzer.
+
+Plays a recording back at real-time pace and reports p50/p99 lag between the arrival of
+the newest audio sample and the update that includes it.
+    
+    python benchmarks/live_latency.py meeting.wav --seconds 60
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import LIVE_UPDATE_INTERVAL, LIVE_LATENCY_BUDGET_MS
+from modules.live_analyzer import LiveAnalyzer, WavPlaybackSource
+
+def main():
+    parser = argparse.ArgumentParser(description="Live analyzer latency benchmark")
+    parser.add_argument('recording')
+    parser.add_argument('--seconds', type=float, default=60.0, help="How much of the recording to play")
+    parser.add_argument('--interval', type=float, default=LIVE_UPDATE_INTERVAL)
+    parser.add_argument('--budget-ms', type=float, default=LIVE_LATENCY_BUDGET_MS)
+    args = parser.parse_args()
+    
+    analyzer = LiveAnalyzer(update_interval=args.interval, latency_budget_ms=args.budget_ms)
+    source = WavPlaybackSource(args.recording, max_duration=args.seconds)
+    
+    for _ in analyzer.run(source):
+        pass
+    
+    report = analyzer.latency_report()
+    if not report['updates']:
+        print("No updates produced")
+        return
+    
+    print(f"updates          {report['updates']}")
+    print(f"skipped ticks    {report['skipped']}")
+    print(f"lag p50          {report['p50_ms']:.2f} ms")
+    print(f"lag p99          {report['p99_ms']:.2f} ms")
+    print(f"lag max          {report['max_ms']:.2f} ms")
+    print(f"compute p50      {report['compute_p50_ms']:.2f} ms")
+    print(f"compute p99      {report['compute_p99_ms']:.2f} ms")
+    print(f"over {report['budget_ms']:.0f} ms budget  {report['over_budget']}")
+
+if __name__ == "__main__":
+    main()
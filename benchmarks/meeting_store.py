@@ -0,0 +1,114 @@
+"""Meeting history trend query benchmark.
+
+Fills a temporary MeetingStore with synthetic meeting summaries spread over a year and
+many teams, then times the trend and filter queries the dashboard runs, against the
+same trend computed by scanning the meetings table. Trend queries must stay under
+--budget-ms at the 95th percentile.
+    
+    python benchmarks/meeting_store.py --meetings 50000 --teams 40
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from config import MOODFLO_CATEGORIES
+from modules.meeting_store import MeetingStore
+
+def synthetic_summaries(count, teams, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = list(MOODFLO_CATEGORIES)
+    start = datetime.now() - timedelta(days=365)
+    
+    for index in range(count):
+        shares = rng.dirichlet(np.ones(len(keys))) * 100
+        distribution = {MOODFLO_CATEGORIES[key]: float(share) for key, share in zip(keys, shares)}
+        results = {
+            'summary': {
+                'dominant_emotion': max(distribution, key=distribution.get),
+                'avg_energy': float(rng.uniform(20, 80)),
+                'silence_pct': float(rng.uniform(0, 35)),
+                'participation': float(rng.uniform(30, 95)),
+                'volatility': float(rng.uniform(1, 9)),
+                'psych_risk': str(rng.choice(['Low', 'Medium', 'High'], p=[0.5, 0.35, 0.15])),
+                'distribution': distribution
+            },
+            'duration': float(rng.uniform(900, 5400)),
+            'filename': f"meeting_{index}.wav"
+        }
+        recorded_at = start + timedelta(seconds=float(rng.uniform(0, 365 * 86400)))
+        yield results, f"team-{index % teams:03d}", recorded_at, f"meeting-{index}"
+
+def timed(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return value, np.percentile(samples, 50), np.percentile(samples, 95)
+
+def main():
+    parser = argparse.ArgumentParser(description="Meeting history trend query benchmark")
+    parser.add_argument('--meetings', type=int, default=50000)
+    parser.add_argument('--teams', type=int, default=40)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--budget-ms', type=float, default=10.0)
+    args = parser.parse_args()
+    
+    store_dir = tempfile.mkdtemp(prefix='moodflo_history_')
+    try:
+        store = MeetingStore(store_dir)
+        
+        start = time.perf_counter()
+        records = list(synthetic_summaries(args.meetings, args.teams))
+        for offset in range(0, len(records), 5000):
+            store.add_many(records[offset:offset + 5000], frames=False)
+        insert_s = time.perf_counter() - start
+        print(f"stored {args.meetings} meetings for {args.teams} teams in {insert_s:.1f}s "
+              f"({args.meetings / insert_s:.0f}/s); {store.stats()['rollups']} rollup rows")
+        
+        since = (datetime.now() - timedelta(days=182)).date()
+        
+        def scan_trend():
+            with store._connection() as conn:
+                return conn.execute(
+                    "SELECT week, SUM(stressed_pct * duration) / SUM(duration) FROM meetings "
+                    "WHERE team = ? AND day >= ? GROUP BY week ORDER BY week",
+                    ('team-007', since.isoformat())
+                ).fetchall()
+        
+        queries = [
+            ("stressed weekly, one team, 6 months", lambda: store.trend('stressed', 'team-007', since), True),
+            ("energy daily, one team, 6 months", lambda: store.trend('energy', 'team-007', since, period='day'), True),
+            ("high risk weekly, all teams, 6 months", lambda: store.trend('high_risk', None, since), True),
+            ("high-risk meetings, one team", lambda: store.meetings('team-007', since, risk='High'), False),
+            ("stressed-dominant meetings, all teams, 50", lambda: store.meetings(mood='stressed', limit=50), False),
+            ("stressed weekly by scanning meetings", scan_trend, False)
+        ]
+        
+        print(f"\n{'query':<44}  {'rows':>5}  {'p50 ms':>7}  {'p95 ms':>7}")
+        over_budget = False
+        for name, query, budgeted in queries:
+            rows, p50, p95 = timed(query, args.repeats)
+            over_budget |= budgeted and p95 > args.budget_ms
+            print(f"{name:<44}  {len(rows):>5}  {p50:>7.2f}  {p95:>7.2f}"
+                  f"{'  OVER' if budgeted and p95 > args.budget_ms else ''}")
+        
+        rollup = store.trend('stressed', 'team-007', since)
+        scanned = dict(scan_trend())
+        drift = max(abs(row['value'] - scanned[row['bucket']]) for row in rollup)
+        print(f"\nrollup vs scan max difference: {drift:.2e} percentage points")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""PDF report time budget benchmark.
+
+Builds synthetic analysis results for meetings of increasing length and times the
+background report render (charts, TXT and PDF) with a cold chart cache and again with
+the charts already cached. Every cold render must stay under REPORT_PDF_BUDGET_MS.
+    
+    python benchmarks/pdf_report.py --hours 0.5 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from config import HOP_DURATION, MOODFLO_CATEGORIES, REPORT_PDF_BUDGET_MS
+from modules.chart_renderer import shared_renderer
+from modules.report_cache import ReportCache
+from modules.timeline_pyramid import TimelinePyramid
+
+def synthetic_result(hours, seed=0):
+    rng = np.random.default_rng(seed)
+    windows = int(hours * 3600 / HOP_DURATION)
+    categories = list(MOODFLO_CATEGORIES)
+    
+    # Sticky random walk, so moods come in stretches like a real meeting
+    codes = np.cumsum(rng.random(windows) < 0.1) % len(categories)
+    energy = np.clip(50 + np.cumsum(rng.normal(0, 3, windows)) % 60 - 30 + rng.normal(0, 8, windows), 0, 100)
+    timeline = pd.DataFrame({
+        'time': np.arange(windows) * HOP_DURATION,
+        'energy': energy,
+        'category': [categories[code] for code in codes]
+    })
+    counts = timeline['category'].value_counts(normalize=True) * 100
+    
+    return {
+        'summary': {
+            'dominant_emotion': MOODFLO_CATEGORIES[counts.index[0]],
+            'avg_energy': float(energy.mean()),
+            'silence_pct': 12.0,
+            'participation': 70.0,
+            'volatility': 4.2,
+            'psych_risk': 'Medium',
+            'distribution': {MOODFLO_CATEGORIES[key]: float(value) for key, value in counts.items()}
+        },
+        'timeline': timeline,
+        'timeline_pyramid': TimelinePyramid.build(timeline).to_dict(),
+        'suggestions': "• Keep the agenda short\n• Check in with quieter participants",
+        'duration': windows * HOP_DURATION,
+        'content_hash': f"synthetic-{hours}h"
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF report time budget benchmark")
+    parser.add_argument('--hours', type=float, nargs='+', default=[0.5, 2, 4, 8])
+    args = parser.parse_args()
+    
+    print(f"{'meeting':>8}  {'windows':>8}  {'cold ms':>8}  {'cached ms':>9}  {'pdf KB':>7}  budget {REPORT_PDF_BUDGET_MS} ms")
+    over_budget = False
+    for hours in args.hours:
+        results = synthetic_result(hours)
+        
+        start = time.perf_counter()
+        reports = ReportCache.render(results)
+        cold_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        ReportCache.render(results)
+        cached_ms = (time.perf_counter() - start) * 1000
+        
+        over_budget |= cold_ms > REPORT_PDF_BUDGET_MS
+        print(f"{hours:>7.1f}h  {len(results['timeline']):>8}  {cold_ms:>8.0f}  {cached_ms:>9.0f}  "
+              f"{len(reports['pdf']) / 1024:>7.0f}  {'OVER' if cold_ms > REPORT_PDF_BUDGET_MS else 'ok'}")
+    
+    print(f"chart cache entries: {len(shared_renderer().entries)}")
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Dashboard rerun latency benchmark.
+
+Runs app.py headlessly with Streamlit's AppTest, analyzes a recording once, then
+times repeated reruns of the finished dashboard, which is what every widget
+interaction costs.
+    
+    python benchmarks/rerun_latency.py meeting.wav --reruns 20
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+class RecordingUpload(io.BytesIO):
+    """Stands in for st.file_uploader's UploadedFile."""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+        self.size = len(self.getvalue())
+        self.file_id = f"{self.name}-{self.size}"
+    
+    def getbuffer(self):
+        return memoryview(self.getvalue())
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard rerun latency benchmark")
+    parser.add_argument('recording')
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+    
+    upload = RecordingUpload(args.recording)
+    st.file_uploader = lambda *_, **__: upload
+    
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=600)
+    start = time.perf_counter()
+    app.run()
+    print(f"analysis run     {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    # Otherwise the reruns below would time an error page
+    if app.exception:
+        sys.exit(f"Analysis failed: {app.exception[0].message}")
+    if 'analysis_complete' not in app.session_state or not app.session_state['analysis_complete']:
+        sys.exit(f"Analysis did not complete: {[error.value for error in app.error]}")
+    
+    timings = []
+    for _ in range(args.reruns):
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    if app.exception:
+        sys.exit(f"App raised during reruns: {app.exception[0].message}")
+    
+    print(f"rerun p50        {np.percentile(timings, 50):.0f} ms")
+    print(f"rerun p95        {np.percentile(timings, 95):.0f} ms")
+    print(f"rerun min        {min(timings):.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,9 +10,33 @@ AUDIO_SAMPLE_RATE = 16000
 FRAME_DURATION = 5.0
 HOP_DURATION = 2.5
 SILENCE_THRESHOLD = 0.015
+LOW_ENERGY_THRESHOLD = 20
+PARTICIPATION_THRESHOLD = 0.02
 ENERGY_SCALE = 100
+ENERGY_GAIN = 2.5
+VOLATILITY_GAIN = 2.5
+VOLATILITY_MAX = 10.0
 PARALLEL_WORKERS = 80
 BATCH_SIZE = 60
+STREAM_BLOCK_DURATION = 30.0
+BATCH_EXTENSIONS = ['.mp4', '.mp3', '.wav', '.avi', '.mov', '.mkv']
+
+LIVE_CHUNK_DURATION = 0.02
+LIVE_UPDATE_INTERVAL = 0.5
+LIVE_RISK_WINDOW = 60.0
+LIVE_LATENCY_BUDGET_MS = 250
+LIVE_EMBED_MAX_MB = 100
+
+TIMELINE_POINT_BUDGET = int(os.getenv("MOODFLO_CHART_POINTS", 2000))
+TIMELINE_PYRAMID_FACTOR = 4
+
+SCHEDULER_MAX_CONCURRENT = int(os.getenv("MOODFLO_MAX_CONCURRENT", 2))
+SCHEDULER_EMOTION_WORKERS = min(PARALLEL_WORKERS, (os.cpu_count() or 1) * 4)
+SCHEDULER_MAX_QUEUE = 20
+SCHEDULER_MIN_FREE_MB = 512
+SCHEDULER_POLL_INTERVAL = 0.5
+
+EMOTION_KEYS = ['neutral', 'happy', 'sad', 'angry', 'fearful']
 
 MOODFLO_CATEGORIES = {
     "energised": "⚡ Energised",
@@ -21,7 +46,82 @@ MOODFLO_CATEGORIES = {
     "volatile": "🌪 Volatile/Unstable"
 }
 
+# Emotion-probability and energy cutoffs, checked in this order; anything else is volatile
+MOOD_CUTOFFS = {
+    "energised": {"happy": 0.4, "min_energy": 30},
+    "stressed": {"angry_fearful": 0.35, "high_energy": 40, "angry": 0.25},
+    "flat": {"neutral": 0.55, "max_energy": 20},
+    "thoughtful": {"neutral": 0.35, "min_energy": 20, "max_energy": 45, "max_sad": 0.25}
+}
+
 PSYCH_SAFETY_THRESHOLDS = {
     "high_risk": {"silence": 25, "stress": 40, "volatility": 7.5},
     "medium_risk": {"silence": 15, "stress": 30, "volatility": 5.5}
 }
+
+PSYCH_SAFETY_SCORING = {
+    "high_points": {"silence": 3, "stress": 3, "volatility": 2},
+    "medium_points": {"silence": 1, "stress": 1, "volatility": 1},
+    "min_participation": 40,
+    "low_participation_points": 2,
+    "levels": {"High": 5, "Medium": 2}
+}
+
+# Bump whenever decoding, features or the stored result shape change, so cached entries are rebuilt
+# 2: one decode path for batch and streaming (soxr block resampling, downmix before resample)
+# 3: results carry timeline_index, timeline_pyramid, emotion_probabilities and timeline_digest
+ANALYZER_VERSION = "3"
+RESULT_CACHE_DIR = os.getenv("MOODFLO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".moodflo", "results"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("MOODFLO_CACHE_MAX_MB", "512")) * 1024 * 1024
+FEATURE_STORE_DIR = os.getenv("MOODFLO_FEATURE_DIR", os.path.join(os.path.expanduser("~"), ".moodflo", "features"))
+UPLOAD_DIR = os.getenv("MOODFLO_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "moodflo_uploads"))
+UPLOAD_MAX_BYTES = int(os.getenv("MOODFLO_UPLOAD_MAX_MB", "8192")) * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Spool files another process may still be using are only evicted once untouched for this long
+UPLOAD_LEASE_SECONDS = float(os.getenv("MOODFLO_UPLOAD_LEASE", "21600"))
+
+INSIGHT_MODEL = "gpt-4"
+INSIGHT_TEMPERATURE = 0.2
+INSIGHT_MAX_TOKENS = 300
+INSIGHT_TIMEOUT = 30.0
+INSIGHT_DEADLINE = float(os.getenv("MOODFLO_INSIGHT_DEADLINE", "2.0"))
+INSIGHT_POLL_INTERVAL = 1.0
+INSIGHT_BATCH_CONCURRENCY = 8
+INSIGHT_REQUESTS_PER_MINUTE = int(os.getenv("MOODFLO_INSIGHT_RPM", "500"))
+INSIGHT_TOKENS_PER_MINUTE = int(os.getenv("MOODFLO_INSIGHT_TPM", "40000"))
+INSIGHT_MAX_RETRIES = 5
+INSIGHT_BACKOFF_BASE = 1.0
+INSIGHT_BACKOFF_MAX = 30.0
+INSIGHT_PROMPT_VERSION = "2"
+OPENAI_MAX_CONNECTIONS = int(os.getenv("MOODFLO_OPENAI_MAX_CONNECTIONS", "64"))
+OPENAI_MAX_KEEPALIVE = 32
+OPENAI_KEEPALIVE_EXPIRY = 60.0
+INSIGHT_CACHE_PATH = os.getenv("MOODFLO_INSIGHT_CACHE", os.path.join(os.path.expanduser("~"), ".moodflo", "insights.sqlite3"))
+INSIGHT_CACHE_TTL = int(os.getenv("MOODFLO_INSIGHT_CACHE_TTL_HOURS", "168")) * 3600
+INSIGHT_CACHE_MAX_ENTRIES = 1000
+INSIGHT_QUANTUM = 5.0
+DIGEST_MAX_SEGMENTS = 8
+DIGEST_MIN_SEGMENT = 30.0
+DIGEST_TENSION_SPANS = 3
+DIGEST_TENSION_GAP = 10.0
+DIGEST_QUARTERS = 4
+DIGEST_MAX_TOKENS = 250
+REPORT_MAX_ROWS = 120
+REPORT_CACHE_MAX_ENTRIES = 32
+REPORT_WORKERS = 2
+REPORT_PDF_BUDGET_MS = 1500
+CHART_WIDTH_PX = 1600
+CHART_HEIGHT_PX = 560
+CHART_POINT_BUDGET = 1500
+CHART_CACHE_MAX_ENTRIES = 16
+REPORT_INTERVAL_STEPS = [30, 60, 120, 300, 600, 900, 1800, 3600]
+MEETING_STORE_DIR = os.getenv("MOODFLO_MEETING_STORE", os.path.join(os.path.expanduser("~"), ".moodflo", "meetings"))
+MEETING_TREND_WEEKS = 26
+SERVICE_DATA_DIR = os.getenv("MOODFLO_SERVICE_DIR", os.path.join(os.path.expanduser("~"), ".moodflo", "service"))
+SERVICE_POLL_INTERVAL = 0.2
+SERVICE_HEARTBEAT_INTERVAL = 5.0
+SERVICE_LEASE_TIMEOUT = 60.0
+SERVICE_MAX_ATTEMPTS = 3
+SERVICE_SUPERVISE_INTERVAL = 2.0
+SERVICE_WAIT_TIMEOUT = float(os.getenv("MOODFLO_SERVICE_WAIT_TIMEOUT", "7200"))
+ANALYSIS_SERVICE_URL = os.getenv("MOODFLO_SERVICE_URL")
@@ -0,0 +1,64 @@
+"""Real-time meeting analysis from a live PCM stream.
+
+Examples:
+    python live.py --wav meeting.wav
+    ffmpeg -re -i meeting.mp4 -f s16le -ac 1 -ar 16000 - | python live.py --stdin
+    ffmpeg -i meeting.mp4 -f s16le -ac 1 -ar 16000 - | python live.py --stdin --fast
+    python live.py --socket 127.0.0.1:5000 --format f32le
+"""
+import argparse
+import sys
+from config import AUDIO_SAMPLE_RATE, LIVE_UPDATE_INTERVAL, LIVE_LATENCY_BUDGET_MS
+from modules.live_analyzer import LiveAnalyzer, PcmStreamSource, WavPlaybackSource
+
+def format_time(seconds):
+    mins = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{mins}:{secs:02d}"
+
+def build_source(args):
+    if args.wav:
+        return WavPlaybackSource(args.wav, sample_rate=args.sample_rate, realtime=not args.fast)
+    if args.socket:
+        host, port = args.socket.rsplit(':', 1)
+        return PcmStreamSource.from_socket(host, int(port), sample_rate=args.sample_rate, sample_format=args.format)
+    return PcmStreamSource(
+        sys.stdin.buffer, sample_rate=args.sample_rate, sample_format=args.format, realtime=not args.fast
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Moodflo live meeting analysis")
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--wav', help="Play back a recording at real-time pace")
+    source_group.add_argument('--stdin', action='store_true', help="Read raw mono PCM from stdin")
+    source_group.add_argument('--socket', help="Read raw mono PCM from HOST:PORT")
+    parser.add_argument('--format', default='s16le', choices=['s16le', 'f32le'], help="Raw PCM sample format")
+    parser.add_argument('--sample-rate', type=int, default=AUDIO_SAMPLE_RATE)
+    parser.add_argument('--interval', type=float, default=LIVE_UPDATE_INTERVAL, help="Seconds between updates")
+    parser.add_argument('--budget-ms', type=float, default=LIVE_LATENCY_BUDGET_MS, help="Update lag budget")
+    parser.add_argument('--fast', action='store_true',
+                        help="Feed --wav as fast as possible, or read --stdin faster than real time; "
+                             "updates then follow stream time")
+    args = parser.parse_args()
+    
+    analyzer = LiveAnalyzer(
+        sample_rate=args.sample_rate,
+        update_interval=args.interval,
+        latency_budget_ms=args.budget_ms
+    )
+    
+    for update in analyzer.run(build_source(args)):
+        flag = " !" if update['over_budget'] else ""
+        print(
+            f"{format_time(update['stream_time']):>6}  {update['category']:28} "
+            f"energy {update['energy']:5.1f}  risk {update['risk']:6}  lag {update['lag_ms']:6.1f} ms{flag}",
+            flush=True
+        )
+    
+    report = analyzer.latency_report()
+    if report['updates']:
+        print(f"\n{report['updates']} updates | lag p50 {report['p50_ms']:.1f} ms | "
+              f"p99 {report['p99_ms']:.1f} ms | skipped {report['skipped']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from config import (
+    SCHEDULER_MAX_CONCURRENT, SCHEDULER_EMOTION_WORKERS, SCHEDULER_MAX_QUEUE,
+    SCHEDULER_MIN_FREE_MB, SCHEDULER_POLL_INTERVAL
+)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+class SchedulerBusy(Exception):
+    """Raised when the analysis queue is full and new work is rejected."""
+
+def available_memory_mb():
+    """Memory available to new work in MB, or None when it cannot be determined.
+    
+    Without psutil this falls back to free physical pages from sysconf, which only
+    POSIX systems expose and which leaves out reclaimable cache, so it reads low. Where
+    neither works memory admission is skipped and only max_concurrent applies."""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+class FairShareExecutor:
+    """Thread pool whose concurrent map() calls are served round-robin: each free
+    thread takes the next task of the next active batch. An analysis admitted while
+    another is mid-way through its frames starts progressing at once instead of
+    waiting behind every queued frame of the earlier one."""
+    
+    def __init__(self, max_workers, thread_name_prefix='fair'):
+        self._condition = threading.Condition()
+        self._batches = deque()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{thread_name_prefix}_{index}", daemon=True)
+            for index in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _next_task(self):
+        with self._condition:
+            while not self._batches and not self._shutdown:
+                self._condition.wait()
+            if not self._batches:
+                return None
+            
+            batch = self._batches.popleft()
+            task = batch.popleft()
+            if batch:
+                self._batches.append(batch)
+            return task
+    
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            
+            fn, args, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+    
+    def _enqueue(self, tasks):
+        if not tasks:
+            return
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._batches.append(deque(tasks))
+            self._condition.notify_all()
+    
+    def submit(self, fn, *args):
+        future = Future()
+        self._enqueue([(fn, args, future)])
+        return future
+    
+    def map(self, fn, iterable):
+        """Like ThreadPoolExecutor.map(): results in input order, exceptions raised
+        when their result is reached. All tasks of one call form one batch."""
+        tasks = [(fn, (item,), Future()) for item in iterable]
+        self._enqueue(tasks)
+        
+        def results():
+            try:
+                for _, _, future in tasks:
+                    yield future.result()
+            finally:
+                for _, _, future in tasks:
+                    future.cancel()
+        
+        return results()
+    
+    def shutdown(self, wait=True):
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+class AnalysisScheduler:
+    """Process-wide admission control for analyses started from any session.
+    
+    At most max_concurrent analyses run at once and all of them share one emotion
+    thread pool, which serves their frames round-robin. Waiting requests are admitted
+    fairly: sessions with nothing running go first, FIFO within that. New work is rejected when the queue is full and
+    deferred while free memory is below min_free_mb (unless nothing is running)."""
+    
+    def __init__(self, max_concurrent=SCHEDULER_MAX_CONCURRENT, emotion_workers=SCHEDULER_EMOTION_WORKERS,
+                 max_queue=SCHEDULER_MAX_QUEUE, min_free_mb=SCHEDULER_MIN_FREE_MB,
+                 poll_interval=SCHEDULER_POLL_INTERVAL):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.min_free_mb = min_free_mb
+        self.poll_interval = poll_interval
+        self.emotion_executor = FairShareExecutor(max_workers=emotion_workers, thread_name_prefix='emotion')
+        
+        self._condition = threading.Condition()
+        self._waiting = deque()
+        self._active = {}
+        self._tickets = itertools.count()
+        
+        self.admitted = 0
+        self.rejected = 0
+        self.deferred = 0
+        self.wait_times = deque(maxlen=200)
+    
+    def _ordered_waiting(self):
+        return sorted(self._waiting, key=lambda ticket: (self._active.get(ticket[1], 0) > 0, ticket[0]))
+    
+    def _position(self, ticket):
+        return self._ordered_waiting().index(ticket) + 1
+    
+    def _blocked_reason(self, ticket):
+        if self._ordered_waiting()[0] != ticket or sum(self._active.values()) >= self.max_concurrent:
+            return 'queue'
+        if not self._memory_ok():
+            return 'memory'
+        return None
+    
+    def _memory_ok(self):
+        if not self._active:
+            return True
+        available = available_memory_mb()
+        return available is None or available >= self.min_free_mb
+    
+    @contextmanager
+    def slot(self, session_id, on_wait=None):
+        """Block until this session may run an analysis. on_wait(position, reason) is
+        called while queued, whenever either changes; reason is 'queue' or 'memory'. It
+        runs outside the scheduler lock, so a slow UI update never delays other sessions."""
+        with self._condition:
+            if len(self._waiting) >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerBusy(f"Analysis queue is full ({self.max_queue} waiting), try again shortly")
+            
+            ticket = (next(self._tickets), session_id)
+            self._waiting.append(ticket)
+        queued_at = time.perf_counter()
+        deferred = False
+        reported = None
+        
+        try:
+            while True:
+                with self._condition:
+                    reason = self._blocked_reason(ticket)
+                    if reason is None:
+                        self._waiting.remove(ticket)
+                        self._active[session_id] = self._active.get(session_id, 0) + 1
+                        self.admitted += 1
+                        self.wait_times.append(time.perf_counter() - queued_at)
+                        break
+                    
+                    if reason == 'memory' and not deferred:
+                        self.deferred += 1
+                        deferred = True
+                    status = (self._position(ticket), reason)
+                
+                if on_wait and status != reported:
+                    on_wait(*status)
+                    reported = status
+                
+                with self._condition:
+                    # Anything released while on_wait ran is caught by this re-check
+                    if self._blocked_reason(ticket) is not None:
+                        self._condition.wait(self.poll_interval)
+        except BaseException:
+            with self._condition:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                self._condition.notify_all()
+            raise
+        
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active[session_id] -= 1
+                if not self._active[session_id]:
+                    del self._active[session_id]
+                self._condition.notify_all()
+    
+    def stats(self):
+        with self._condition:
+            waits = list(self.wait_times)
+            return {
+                'running': sum(self._active.values()),
+                'queued': len(self._waiting),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'deferred': self.deferred,
+                'mean_wait_s': sum(waits) / len(waits) if waits else 0.0,
+                'max_wait_s': max(waits) if waits else 0.0,
+                'available_memory_mb': available_memory_mb()
+            }
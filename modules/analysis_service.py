@@ -0,0 +1,269 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from config import (
+    OPENAI_API_KEY, SERVICE_DATA_DIR, SERVICE_POLL_INTERVAL, BATCH_EXTENSIONS, SERVICE_HEARTBEAT_INTERVAL,
+    SERVICE_LEASE_TIMEOUT, SERVICE_MAX_ATTEMPTS, SERVICE_SUPERVISE_INTERVAL, SERVICE_WAIT_TIMEOUT, INSIGHT_DEADLINE
+)
+from modules.job_queue import JobQueue
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def _worker_loop(db_path, result_dir, openai_api_key, worker_name):
+    """Worker process: keeps one warm analyzer and drains the queue until terminated."""
+    from modules.analyzer import MeetingAnalyzer
+    
+    queue = JobQueue(db_path)
+    analyzer = MeetingAnalyzer(openai_api_key=openai_api_key, emotion_workers=1)
+    
+    while True:
+        job = queue.claim(worker_name)
+        if job is None:
+            time.sleep(SERVICE_POLL_INTERVAL)
+            continue
+        
+        def report_progress(value, message, job_id=job['id']):
+            queue.update_progress(job_id, value, message)
+        
+        # Stages can run for minutes without reporting progress; the lease is renewed meanwhile
+        stop_heartbeat = threading.Event()
+        
+        def heartbeat(job_id=job['id']):
+            while not stop_heartbeat.wait(SERVICE_HEARTBEAT_INTERVAL):
+                queue.heartbeat(job_id)
+        
+        threading.Thread(target=heartbeat, daemon=True).start()
+        try:
+            results = analyzer.analyze(
+                job['file_path'], progress_callback=report_progress, insights_deadline=INSIGHT_DEADLINE
+            )
+            if results.pop('insights_future', None) is not None:
+                # Nobody polls a finished job, so a late LLM answer is not waited for
+                results['suggestions_source'] = 'fallback'
+            result_path = os.path.join(result_dir, f"{job['id']}.json")
+            with open(result_path, 'w', encoding='utf-8') as f:
+                json.dump(analyzer.serialize_result(results), f, ensure_ascii=False)
+            queue.complete(job['id'], result_path)
+        except Exception as exc:
+            queue.fail(job['id'], f"{type(exc).__name__}: {exc}")
+        finally:
+            stop_heartbeat.set()
+            # Recordings are only kept for as long as it takes to analyze them
+            _remove_upload(job['file_path'])
+
+def _remove_upload(file_path):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+class AnalysisService:
+    """Local analysis service: HTTP submit/poll/result API in front of a SQLite job queue
+    drained by a pool of worker processes with warm analyzers. A supervisor thread
+    respawns workers that die and requeues jobs whose worker stopped renewing its lease."""
+    
+    def __init__(self, data_dir=SERVICE_DATA_DIR, workers=2, openai_api_key=OPENAI_API_KEY):
+        self.data_dir = Path(data_dir)
+        self.upload_dir = self.data_dir / 'uploads'
+        self.result_dir = self.data_dir / 'results'
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.db_path = str(self.data_dir / 'jobs.sqlite3')
+        self.queue = JobQueue(self.db_path)
+        self.workers = workers
+        self.openai_api_key = openai_api_key
+        self.processes = []
+        self.restarts = 0
+        self.stopping = threading.Event()
+    
+    def _spawn(self, index):
+        process = multiprocessing.get_context('spawn').Process(
+            target=_worker_loop,
+            args=(self.db_path, str(self.result_dir), self.openai_api_key, f"worker-{index}"),
+            daemon=True
+        )
+        process.start()
+        return process
+    
+    def start_workers(self):
+        requeued = self.queue.requeue_running()
+        self.stopping.clear()
+        self.processes = [self._spawn(index) for index in range(self.workers)]
+        return requeued
+    
+    def _reclaim(self, worker=None):
+        _, failed = self.queue.reclaim(SERVICE_LEASE_TIMEOUT, SERVICE_MAX_ATTEMPTS, worker=worker)
+        for job in failed:
+            _remove_upload(job['file_path'])
+    
+    def supervise_once(self):
+        """Respawn dead workers, requeueing their jobs, then requeue expired leases."""
+        for index, process in enumerate(self.processes):
+            if not process.is_alive() and not self.stopping.is_set():
+                process.join()
+                self._reclaim(worker=f"worker-{index}")
+                self.processes[index] = self._spawn(index)
+                self.restarts += 1
+        self._reclaim()
+    
+    def supervise(self):
+        while not self.stopping.wait(SERVICE_SUPERVISE_INTERVAL):
+            self.supervise_once()
+    
+    def stop_workers(self):
+        self.stopping.set()
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+    
+    def save_upload(self, stream, length, filename):
+        suffix = Path(filename or '').suffix.lower()
+        if suffix not in BATCH_EXTENSIONS:
+            raise ValueError(f"Unsupported file type '{suffix}'")
+        
+        upload_path = self.upload_dir / f"{os.urandom(8).hex()}{suffix}"
+        remaining = length
+        with open(upload_path, 'wb') as f:
+            while remaining > 0:
+                chunk = stream.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        return str(upload_path)
+    
+    def make_handler(self):
+        service = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_POST(self):
+                if self.path.rstrip('/') != '/jobs':
+                    return self._send_json({'error': 'Not found'}, 404)
+                
+                filename = urllib.parse.unquote(self.headers.get('X-Filename', ''))
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    file_path = service.save_upload(self.rfile, length, filename)
+                except ValueError as exc:
+                    return self._send_json({'error': str(exc)}, 400)
+                
+                job_id = service.queue.submit(file_path, filename=filename)
+                self._send_json({'job_id': job_id, 'status': 'queued'}, 202)
+            
+            def do_GET(self):
+                parts = [part for part in self.path.split('?')[0].split('/') if part]
+                
+                if parts == ['stats']:
+                    return self._send_json(dict(
+                        service.queue.stats(), worker_restarts=service.restarts,
+                        insights='llm' if service.openai_api_key else 'fallback'
+                    ))
+                
+                if len(parts) >= 2 and parts[0] == 'jobs':
+                    job = service.queue.get(parts[1])
+                    if job is None:
+                        return self._send_json({'error': 'Unknown job'}, 404)
+                    
+                    if len(parts) == 2:
+                        job.pop('file_path', None)
+                        job.pop('result_path', None)
+                        return self._send_json(job)
+                    
+                    if parts[2:] == ['result']:
+                        if job['status'] != 'done':
+                            return self._send_json({'error': f"Job is {job['status']}"}, 409)
+                        with open(job['result_path'], 'rb') as f:
+                            body = f.read()
+                        self.send_response(200)
+                        self.send_header('Content-Type', 'application/json')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                        return
+                
+                self._send_json({'error': 'Not found'}, 404)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def serve(self, host='127.0.0.1', port=8765):
+        self.start_workers()
+        threading.Thread(target=self.supervise, daemon=True).start()
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.stop_workers()
+
+class AnalysisServiceClient:
+    """Thin client for AnalysisService used by the Streamlit app."""
+    
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+    
+    def _get_json(self, path):
+        with urllib.request.urlopen(self.base_url + path, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    
+    def submit(self, file_path, filename=None):
+        filename = filename or os.path.basename(file_path)
+        with open(file_path, 'rb') as f:
+            request = urllib.request.Request(
+                self.base_url + '/jobs',
+                data=f,
+                method='POST',
+                headers={
+                    'X-Filename': urllib.parse.quote(filename),
+                    'Content-Length': str(os.path.getsize(file_path)),
+                    'Content-Type': 'application/octet-stream'
+                }
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))['job_id']
+    
+    def status(self, job_id):
+        return self._get_json(f"/jobs/{job_id}")
+    
+    def result(self, job_id):
+        return self._get_json(f"/jobs/{job_id}/result")
+    
+    def stats(self):
+        return self._get_json("/stats")
+    
+    def wait(self, job_id, progress_callback=None, poll_interval=0.5, timeout=SERVICE_WAIT_TIMEOUT):
+        """Poll until the job finishes. Raises RuntimeError if it failed and TimeoutError
+        if it has not finished within timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if progress_callback:
+                progress_callback(job)
+            if job['status'] == 'done':
+                return self.result(job_id)
+            if job['status'] == 'failed':
+                raise RuntimeError(job.get('error') or "Analysis failed")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Analysis did not finish within {timeout:g}s (job {job_id} is {job['status']})")
+            time.sleep(poll_interval)
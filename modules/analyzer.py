@@ -1,64 +1,177 @@
+import asyncio
+import json
+import numpy as np
 import pandas as pd
-from modules.audio_processor import AudioProcessor
+from config import MOODFLO_CATEGORIES, STREAM_BLOCK_DURATION, PARALLEL_WORKERS, EMOTION_KEYS
+from modules.audio_processor import AudioProcessor, FrameSegmenter
 from modules.emotion_detector import EmotionDetector
 from modules.metrics_processor import MetricsProcessor
 from modules.mood_mapper import MoodMapper
 from modules.cluster_analyzer import ClusterAnalyzer
 from modules.risk_assessor import RiskAssessor
 from modules.insights_generator import InsightsGenerator
+from modules.stage_profiler import StageProfiler
+from modules.result_cache import ResultCache
+from modules.running_metrics import RunningMetrics
+from modules.timeline_index import TimelineIndex
+from modules.timeline_pyramid import TimelinePyramid
+from modules.timeline_digest import TimelineDigest
 
 class MeetingAnalyzer:
     
-    def __init__(self, openai_api_key=None):
-        """Initialize analyzer with optional OpenAI API key for AI-powered insights."""
+    def __init__(self, openai_api_key=None, result_cache=None, feature_store=None,
+                 emotion_workers=PARALLEL_WORKERS, emotion_executor=None, insight_cache=None):
+        """Initialize analyzer with optional OpenAI API key for AI-powered insights,
+        an optional ResultCache for reusing results of previously seen recordings and
+        an optional FeatureStore for persisting per-frame features between rescoring runs.
+        emotion_executor lets several analyzers share one emotion thread pool, and
+        insight_cache reuses LLM suggestions for near-identical summaries."""
         self.audio_processor = AudioProcessor()
-        self.emotion_detector = EmotionDetector()
+        self.emotion_detector = EmotionDetector(max_workers=emotion_workers, executor=emotion_executor)
         self.mood_mapper = MoodMapper()
         self.cluster_analyzer = ClusterAnalyzer()
         self.risk_assessor = RiskAssessor()
-        self.insights_generator = InsightsGenerator(api_key=openai_api_key)
+        self.insights_generator = InsightsGenerator(api_key=openai_api_key, cache=insight_cache)
+        self.result_cache = result_cache
+        self.feature_store = feature_store
     
-    def analyze(self, file_path, progress_callback=None):
+    def _emotion_variant(self):
+        return 'vokaturi' if self.emotion_detector.vokaturi_loaded else 'fallback'
+    
+    def feature_key(self, content_hash):
+        """FeatureStore key this analyzer reads and writes for a recording."""
+        return self.feature_store.make_key(content_hash, self._emotion_variant())
+    
+    def analyze(self, file_path, progress_callback=None, content_hash=None, insights_deadline=None):
+        """Analyze a recording end to end. With insights_deadline set, LLM suggestions that
+        take longer are finished in the background: the result carries the fallback text
+        and an 'insights_future' to pass to resolve_insights()."""
+        profiler = StageProfiler()
+        cache_key = None
+        
+        if content_hash is None and (self.result_cache is not None or self.feature_store is not None):
+            with profiler.stage('hash', items=1):
+                content_hash = ResultCache.hash_file(file_path)
+        
+        if self.result_cache is not None:
+            with profiler.stage('cache_lookup', items=1):
+                # Suggestions differ between the GPT-4 and fallback paths
+                insights_variant = 'llm' if self.insights_generator.client else 'fallback'
+                cache_key = self.result_cache.make_key(
+                    content_hash, f"{self._emotion_variant()}-{insights_variant}"
+                )
+                cached = self.result_cache.get(cache_key)
+            
+            if cached is not None:
+                if progress_callback:
+                    progress_callback(100, "Loaded cached analysis")
+                # A copy, so the stored result keeps the timings of the run that produced it
+                results = dict(cached)
+                results['cache_hit'] = True
+                results['stage_timings'] = profiler.stages
+                return results
+        
+        features = None
+        feature_key = None
+        if self.feature_store is not None:
+            with profiler.stage('feature_lookup', items=1):
+                feature_key = self.feature_key(content_hash)
+                features = self.feature_store.load(feature_key)
+        
+        if features is None:
+            features = self.extract_features(file_path, profiler, progress_callback)
+            if feature_key is not None:
+                self.feature_store.save(feature_key, features)
+        
+        results = self.score(features, profiler, progress_callback, insights_deadline)
+        results['content_hash'] = content_hash
+        results['cache_hit'] = False
+        
+        if cache_key is not None:
+            if results.get('insights_future') is not None:
+                # Cache the upgraded result once the LLM answers, never the placeholder
+                self._cache_when_insights_arrive(cache_key, results)
+            else:
+                self.result_cache.put(cache_key, results)
+        
+        return results
+    
+    def extract_features(self, file_path, profiler=None, progress_callback=None):
+        """Run the expensive, threshold-independent stages: decode, framing, emotion
+        detection, per-frame RMS, tempo and clustering."""
+        profiler = profiler or StageProfiler()
+        
         if progress_callback:
             progress_callback(10, "Processing audio...")
         
-        audio_data = self.audio_processor.process_file(file_path)
-        frames = audio_data['frames']
-        timestamps = audio_data['timestamps']
-        sample_rate = audio_data['sample_rate']
+        with profiler.stage('decode') as stage:
+            audio, sample_rate = self.audio_processor.decode_file(file_path)
+            stage['items'] = len(audio)
+        
+        with profiler.stage('framing') as stage:
+            frames, timestamps = self.audio_processor.segment_audio(audio)
+            duration = len(audio) / sample_rate
+            stage['items'] = len(frames)
         
         if progress_callback:
             progress_callback(30, "Detecting emotions...")
         
-        emotion_series = self.emotion_detector.batch_analyze(frames, sample_rate)
+        with profiler.stage('emotion', items=len(frames)):
+            emotion_series = self.emotion_detector.batch_analyze(frames, sample_rate)
+        
+        with profiler.stage('features', items=len(frames)):
+            rms_values = MetricsProcessor.compute_frame_rms(frames)
+            tempo = MetricsProcessor(sample_rate).estimate_tempo(frames.flatten())
         
         if progress_callback:
-            progress_callback(50, "Computing metrics...")
+            progress_callback(50, "Analyzing patterns...")
         
-        full_audio = frames.flatten()
-        metrics_proc = MetricsProcessor(sample_rate)
-        metrics = metrics_proc.calculate_all_metrics(frames, emotion_series, full_audio)
+        with profiler.stage('clustering', items=len(emotion_series)):
+            energy_values = MetricsProcessor.energy_from_rms(rms_values).tolist()
+            cluster_data = self.cluster_analyzer.analyze(emotion_series, energy_values)
+        
+        return {
+            'timestamps': timestamps,
+            'rms': rms_values,
+            'emotions': emotion_series,
+            'tempo': tempo,
+            'duration': duration,
+            'sample_rate': sample_rate,
+            'clusters': cluster_data
+        }
+    
+    def score(self, features, profiler=None, progress_callback=None, insights_deadline=None):
+        """Run the cheap, threshold-dependent stages on extracted features: metrics,
+        category mapping, risk assessment and insights."""
+        profiler = profiler or StageProfiler()
+        emotion_series = features['emotions']
         
         if progress_callback:
-            progress_callback(65, "Mapping to categories...")
+            progress_callback(65, "Computing metrics...")
         
-        distribution, categories = self.mood_mapper.get_category_distribution(
-            emotion_series, metrics['energy_timeline']
-        )
-        dominant_emotion = self.mood_mapper.get_dominant_emotion(distribution)
+        with profiler.stage('metrics', items=len(features['rms'])):
+            metrics_proc = MetricsProcessor(features['sample_rate'])
+            metrics = metrics_proc.calculate_metrics_from_features(
+                features['rms'], emotion_series, features['tempo']
+            )
         
         if progress_callback:
-            progress_callback(75, "Analyzing patterns...")
+            progress_callback(75, "Mapping to categories...")
         
-        cluster_data = self.cluster_analyzer.analyze(emotion_series, metrics['energy_timeline'])
+        with profiler.stage('mapping', items=len(emotion_series)):
+            distribution, categories = self.mood_mapper.get_category_distribution(
+                emotion_series, metrics['energy_timeline']
+            )
+            dominant_emotion = self.mood_mapper.get_dominant_emotion(distribution)
         
         if progress_callback:
             progress_callback(85, "Assessing risks...")
         
-        psych_risk = self.risk_assessor.assess_psychological_safety(metrics, distribution)
+        with profiler.stage('risk', items=1):
+            psych_risk = self.risk_assessor.assess_psychological_safety(metrics, distribution)
         
         timeline_df = pd.DataFrame({
-            'time': timestamps,
+            'time': features['timestamps'],
             'energy': metrics['energy_timeline'],
             'category': categories
         })
@@ -70,18 +183,172 @@ class MeetingAnalyzer:
             'participation': metrics['participation'],
             'volatility': metrics['volatility'],
             'psych_risk': psych_risk,
-            'distribution': distribution
+            'distribution': distribution,
+            'timeline_digest': TimelineDigest.build(timeline_df).to_dict()
         }
         
         if progress_callback:
             progress_callback(95, "Generating insights...")
         
-        suggestions = self.insights_generator.generate_suggestions(analysis_summary)
+        with profiler.stage('insights', items=1):
+            suggestions, suggestions_source, insights_future = self.insights_generator.generate_with_deadline(
+                analysis_summary, insights_deadline
+            )
         
-        return {
+        results = {
             'summary': analysis_summary,
             'timeline': timeline_df,
-            'clusters': cluster_data,
+            'timeline_index': TimelineIndex.build(timeline_df).to_dict(),
+            'timeline_pyramid': TimelinePyramid.build(timeline_df).to_dict(),
+            'clusters': features['clusters'],
+            # Per-window probabilities in EMOTION_KEYS order, for the per-frame export
+            'emotion_probabilities': [[emotion.get(name, 0.0) for name in EMOTION_KEYS] for emotion in emotion_series],
             'suggestions': suggestions,
-            'duration': audio_data['duration']
+            'suggestions_source': suggestions_source,
+            'duration': features['duration'],
+            'stage_timings': profiler.stages
+        }
+        if insights_future is not None:
+            results['insights_future'] = insights_future
+        return results
+    
+    def _cache_when_insights_arrive(self, cache_key, results):
+        # Snapshot now: resolve_insights() may edit results on the caller's thread while this
+        # callback runs on the insights thread
+        upgraded = {key: value for key, value in results.items() if key != 'insights_future'}
+        
+        def store(future):
+            try:
+                suggestions = future.result()
+            except Exception:
+                return
+            upgraded['suggestions'] = suggestions
+            upgraded['suggestions_source'] = 'llm'
+            self.result_cache.put(cache_key, upgraded)
+        
+        results['insights_future'].add_done_callback(store)
+    
+    @staticmethod
+    def resolve_insights(results):
+        """Swap in background LLM suggestions once they have arrived. Returns True when
+        the result changed; a failed call leaves the fallback text in place."""
+        future = results.get('insights_future')
+        if future is None or not future.done():
+            return False
+        
+        del results['insights_future']
+        try:
+            results['suggestions'] = future.result()
+            results['suggestions_source'] = 'llm'
+        except Exception:
+            results['suggestions_source'] = 'fallback'
+        return True
+    
+    def analyze_stream(self, file_path, block_duration=STREAM_BLOCK_DURATION):
+        """Generator variant of analyze() that decodes and frames the recording block by
+        block, yielding a 'window' event per analysis window as soon as it is scored and
+        a final 'summary' event whose result matches analyze()."""
+        profiler = StageProfiler()
+        segmenter = FrameSegmenter(self.audio_processor.sample_rate)
+        running = RunningMetrics()
+        sample_rate = self.audio_processor.sample_rate
+        
+        timestamps = []
+        rms_series = []
+        emotion_series = []
+        
+        with profiler.stage('stream') as stage:
+            for block in self.audio_processor.iter_audio_blocks(file_path, block_duration):
+                frames, frame_times = segmenter.push(block)
+                if not frames:
+                    continue
+                
+                frames = np.array(frames)
+                emotions = self.emotion_detector.batch_analyze(frames, sample_rate)
+                rms_values = MetricsProcessor.compute_frame_rms(frames)
+                energies = MetricsProcessor.energy_from_rms(rms_values)
+                
+                for frame_time, rms, energy, emotion in zip(frame_times, rms_values, energies, emotions):
+                    category = self.mood_mapper.map_emotion_to_category(emotion, energy)
+                    running.update(rms, energy, emotion, category)
+                    
+                    timestamps.append(frame_time)
+                    rms_series.append(rms)
+                    emotion_series.append(emotion)
+                    
+                    yield {
+                        'type': 'window',
+                        'index': len(timestamps) - 1,
+                        'time': frame_time,
+                        'energy': float(energy),
+                        'emotion': emotion,
+                        'category': MOODFLO_CATEGORIES[category],
+                        'running': running.snapshot()
+                    }
+            
+            stage['items'] = len(timestamps)
+        
+        rms_series = np.array(rms_series)
+        
+        with profiler.stage('clustering', items=len(emotion_series)):
+            energy_values = MetricsProcessor.energy_from_rms(rms_series).tolist()
+            cluster_data = self.cluster_analyzer.analyze(emotion_series, energy_values)
+        
+        features = {
+            'timestamps': np.array(timestamps),
+            'rms': rms_series,
+            'emotions': emotion_series,
+            # Tempo needs the whole signal at once; it is not part of the summary
+            'tempo': float('nan'),
+            'duration': segmenter.duration,
+            'sample_rate': sample_rate,
+            'clusters': cluster_data
         }
+        
+        results = self.score(features, profiler)
+        results['cache_hit'] = False
+        
+        yield {'type': 'summary', 'result': results}
+    
+    async def analyze_stream_async(self, file_path, block_duration=STREAM_BLOCK_DURATION):
+        """Async-iterator form of analyze_stream(); decoding and scoring run in a worker thread."""
+        stream = self.analyze_stream(file_path, block_duration)
+        done = object()
+        
+        while True:
+            event = await asyncio.to_thread(next, stream, done)
+            if event is done:
+                break
+            yield event
+    
+    @staticmethod
+    def serialize_result(results):
+        """JSON-compatible copy of an analysis result (the timeline becomes column lists)."""
+        serialized = {key: value for key, value in results.items() if key not in ('timeline', 'insights_future')}
+        serialized['timeline'] = results['timeline'].to_dict(orient='list')
+        return json.loads(json.dumps(serialized, default=float))
+    
+    @staticmethod
+    def deserialize_result(data):
+        """Inverse of serialize_result()."""
+        results = dict(data)
+        results['timeline'] = pd.DataFrame(data['timeline'])
+        return results
+    
+    def rescore(self, feature_key, progress_callback=None):
+        """Recompute a stored recording's result with the current thresholds and category
+        rules without decoding audio or re-running emotion detection."""
+        if self.feature_store is None:
+            raise ValueError("rescore requires a feature_store")
+        
+        profiler = StageProfiler()
+        with profiler.stage('feature_lookup', items=1):
+            features = self.feature_store.load(feature_key)
+        
+        if features is None:
+            raise KeyError(f"No stored features for {feature_key}")
+        
+        results = self.score(features, profiler, progress_callback)
+        results['content_hash'] = feature_key.split('-')[0]
+        results['cache_hit'] = False
+        return results
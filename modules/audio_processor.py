@@ -4,8 +4,13 @@ import subprocess
 import tempfile
 import os
 from pathlib import Path
-import imageio_ffmpeg as ffmpeg
-from config import AUDIO_SAMPLE_RATE, FRAME_DURATION, HOP_DURATION, SILENCE_THRESHOLD
+from config import AUDIO_SAMPLE_RATE, FRAME_DURATION, HOP_DURATION, SILENCE_THRESHOLD, STREAM_BLOCK_DURATION
+
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv']
+
+def _ffmpeg_exe():
+    import imageio_ffmpeg
+    return imageio_ffmpeg.get_ffmpeg_exe()
 
 class AudioProcessor:
     
@@ -13,13 +18,14 @@ class AudioProcessor:
         self.sample_rate = sample_rate
         self.frame_duration = FRAME_DURATION
         self.hop_duration = HOP_DURATION
-        
+    
     def extract_audio_from_video(self, video_path):
-        temp_dir = tempfile.gettempdir()
-        output_path = os.path.join(temp_dir, "extracted_audio.wav")
+        # Unique per call, so concurrent analyses never overwrite each other's audio
+        fd, output_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
         
         command = [
-             ffmpeg.get_ffmpeg_exe(),
+             _ffmpeg_exe(),
              '-i', str(video_path),
             '-ac', '1',
             '-ar', str(self.sample_rate),
@@ -31,16 +37,7 @@ class AudioProcessor:
         return output_path
     
     def load_audio(self, file_path):
-        audio, sr = sf.read(file_path)
-        
-        if sr != self.sample_rate:
-            import librosa
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=self.sample_rate)
-        
-        if len(audio.shape) > 1:
-            audio = np.mean(audio, axis=1)
-            
-        return audio, self.sample_rate
+        return self.decode_file(file_path)
     
     def segment_audio(self, audio):
         win_samples = int(self.frame_duration * self.sample_rate)
@@ -53,25 +50,92 @@ class AudioProcessor:
             frame = audio[i:i + win_samples]
             frames.append(frame)
             timestamps.append(i / self.sample_rate)
-            
+        
         return np.array(frames), np.array(timestamps)
     
+    def iter_audio_blocks(self, file_path, block_duration=STREAM_BLOCK_DURATION):
+        """Decode a recording in mono blocks at the target sample rate.
+        
+        This is the only decode path: decode_file() concatenates these blocks, so batch
+        and streaming analyses see identical samples. Files soundfile can read are
+        downmixed and, if needed, resampled block by block with soxr's streaming
+        resampler (the one librosa uses); everything else is decoded by an ffmpeg pipe.
+        No full-length copy is ever held in memory."""
+        block_samples = int(block_duration * self.sample_rate)
+        
+        if Path(file_path).suffix.lower() not in VIDEO_EXTENSIONS:
+            try:
+                info = sf.info(file_path)
+            except RuntimeError:
+                info = None
+            
+            if info is not None:
+                yield from self._iter_soundfile_blocks(file_path, info.samplerate, block_duration)
+                return
+        
+        yield from self._iter_ffmpeg_blocks(file_path, block_samples)
+    
+    def _iter_soundfile_blocks(self, file_path, file_rate, block_duration):
+        resampler = None
+        if file_rate != self.sample_rate:
+            import soxr
+            resampler = soxr.ResampleStream(file_rate, self.sample_rate, 1, dtype='float64', quality='HQ')
+        
+        for block in sf.blocks(file_path, blocksize=int(block_duration * file_rate), dtype='float64'):
+            # Downmix before resampling, so every channel is treated alike
+            if len(block.shape) > 1:
+                block = np.mean(block, axis=1)
+            if resampler is not None:
+                block = resampler.resample_chunk(block)
+            if len(block):
+                yield block
+        
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0), last=True)
+            if len(tail):
+                yield tail
+    
+    def _iter_ffmpeg_blocks(self, file_path, block_samples):
+        command = [
+            _ffmpeg_exe(),
+            '-i', str(file_path),
+            '-ac', '1',
+            '-ar', str(self.sample_rate),
+            '-vn',
+            '-f', 's16le', '-acodec', 'pcm_s16le',
+            '-'
+        ]
+        
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                data = process.stdout.read(block_samples * 2)
+                if len(data) < 2:
+                    break
+                # Same scaling soundfile applies when reading 16-bit PCM as float
+                samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype='<i2')
+                yield samples.astype(np.float64) / 32768.0
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+    
     def compute_rms(self, frame):
         return float(np.sqrt(np.mean(frame ** 2)))
     
     def is_silent(self, frame):
         return self.compute_rms(frame) < SILENCE_THRESHOLD
     
+    def decode_file(self, file_path):
+        """Whole recording as mono float64 at the target sample rate, decoded exactly as
+        iter_audio_blocks() streams it."""
+        blocks = list(self.iter_audio_blocks(file_path))
+        audio = np.concatenate(blocks) if blocks else np.zeros(0)
+        return audio, self.sample_rate
+    
     def process_file(self, file_path):
-        file_ext = Path(file_path).suffix.lower()
-        
-        if file_ext in ['.mp4', '.avi', '.mov', '.mkv']:
-            audio_path = self.extract_audio_from_video(file_path)
-            audio, sr = self.load_audio(audio_path)
-            os.remove(audio_path)
-        else:
-            audio, sr = self.load_audio(file_path)
-        
+        audio, sr = self.decode_file(file_path)
         frames, timestamps = self.segment_audio(audio)
         
         return {
@@ -82,3 +146,34 @@ class AudioProcessor:
         }
 
 
+class FrameSegmenter:
+    """Cuts a stream of audio blocks into the same overlapping windows as
+    AudioProcessor.segment_audio, carrying the unfinished tail between blocks."""
+    
+    def __init__(self, sample_rate=AUDIO_SAMPLE_RATE, frame_duration=FRAME_DURATION, hop_duration=HOP_DURATION):
+        self.sample_rate = sample_rate
+        self.win_samples = int(frame_duration * sample_rate)
+        self.hop_samples = int(hop_duration * sample_rate)
+        self.buffer = np.zeros(0)
+        self.offset = 0
+        self.total_samples = 0
+    
+    def push(self, block):
+        self.total_samples += len(block)
+        self.buffer = np.concatenate([self.buffer, block])
+        
+        frames = []
+        timestamps = []
+        start = 0
+        while start + self.win_samples <= len(self.buffer):
+            frames.append(self.buffer[start:start + self.win_samples].copy())
+            timestamps.append((self.offset + start) / self.sample_rate)
+            start += self.hop_samples
+        
+        self.buffer = self.buffer[start:]
+        self.offset += start
+        return frames, timestamps
+    
+    @property
+    def duration(self):
+        return self.total_samples / self.sample_rate
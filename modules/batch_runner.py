@@ -0,0 +1,311 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from config import BATCH_EXTENSIONS
+from modules.feature_store import FeatureStore
+from modules.result_cache import ResultCache
+
+_worker_analyzer = None
+
+def _init_worker(openai_api_key, feature_dir):
+    """Build one warm analyzer per worker process; Vokaturi is loaded once per process."""
+    global _worker_analyzer
+    from modules.analyzer import MeetingAnalyzer
+    from modules.feature_store import FeatureStore
+    
+    _worker_analyzer = MeetingAnalyzer(
+        openai_api_key=openai_api_key,
+        feature_store=FeatureStore(feature_dir) if feature_dir else None,
+        # Parallelism comes from the process pool; nested thread pools only oversubscribe
+        emotion_workers=1
+    )
+
+def _analyze_file(file_path, output_path, frames_path=None, meeting_id=None, team=None):
+    start = time.perf_counter()
+    results = _worker_analyzer.analyze(file_path)
+    return _write_outputs(results, start, file_path, output_path, frames_path, meeting_id, team)
+
+def _rescore_file(feature_key, file_path, output_path, frames_path=None, meeting_id=None, team=None):
+    """Rebuild a recording's outputs from its stored features with the current scoring settings."""
+    start = time.perf_counter()
+    results = _worker_analyzer.rescore(feature_key)
+    return _write_outputs(results, start, file_path, output_path, frames_path, meeting_id, team)
+
+def _write_outputs(results, start, file_path, output_path, frames_path, meeting_id, team):
+    serialized = _worker_analyzer.serialize_result(results)
+    serialized['source'] = str(file_path)
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(serialized, f, ensure_ascii=False)
+    
+    if frames_path:
+        from modules.frame_export import write_frames
+        write_frames(results, frames_path, meeting_id=meeting_id)
+    
+    if team:
+        from modules.meeting_store import MeetingStore
+        # Keyed by content, so re-running a batch replaces rather than duplicates meetings
+        MeetingStore().add(
+            results, team, recorded_at=os.path.getmtime(file_path),
+            meeting_id=results.get('content_hash') or ResultCache.hash_file(file_path)
+        )
+    
+    return {
+        'duration': results['duration'],
+        'wall_s': time.perf_counter() - start,
+        'stage_timings': results['stage_timings'],
+        'psych_risk': results['summary']['psych_risk'],
+        'suggestions_source': results.get('suggestions_source'),
+        # Lets later runs tell stale outputs apart and rescore them from the stored features
+        'config_version': ResultCache.config_version(),
+        'feature_key': (
+            _worker_analyzer.feature_key(results['content_hash'])
+            if _worker_analyzer.feature_store is not None and results.get('content_hash') else None
+        ),
+        'worker_pid': os.getpid()
+    }
+
+class BatchRunner:
+    """Analyzes every recording under a directory on a process pool, recording progress
+    in a manifest so interrupted runs resume where they stopped. With an OpenAI key, LLM
+    suggestions are fetched afterwards in one rate-limited batch rather than serially by
+    each worker. With frames set to 'parquet' or 'arrow', each recording's per-frame data
+    is also written next to its JSON result for columnar analysis across meetings. With a
+    team, every result is also added to that team's meeting history. With a feature store,
+    recordings whose scoring settings changed since their last run (or every recording,
+    with rescore set) are rescored from their stored features instead of re-decoded."""
+    
+    MANIFEST_NAME = 'manifest.json'
+    
+    def __init__(self, input_dir, output_dir, workers=None, openai_api_key=None, feature_dir=None,
+                 recursive=True, frames=None, team=None, rescore=False):
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.openai_api_key = openai_api_key
+        self.feature_dir = feature_dir
+        self.recursive = recursive
+        self.frames = frames
+        self.team = team
+        self.rescore = rescore
+        self.manifest_path = self.output_dir / self.MANIFEST_NAME
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._load_manifest()
+    
+    def _load_manifest(self):
+        if not self.manifest_path.exists():
+            return {'files': {}}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _save_manifest(self):
+        fd, temp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+    
+    def scan(self):
+        pattern = '**/*' if self.recursive else '*'
+        return sorted(
+            path for path in self.input_dir.glob(pattern)
+            if path.is_file() and path.suffix.lower() in BATCH_EXTENSIONS
+        )
+    
+    def _output_path(self, relative):
+        return self.output_dir / (relative.replace(os.sep, '__') + '.json')
+    
+    def _frames_path(self, relative):
+        if not self.frames:
+            return None
+        return self.output_dir / (relative.replace(os.sep, '__') + '.' + self.frames)
+    
+    def _is_analyzed(self, path, relative):
+        entry = self.manifest['files'].get(relative)
+        if not entry or entry.get('status') != 'done':
+            return False
+        
+        stat = path.stat()
+        return (
+            entry.get('size') == stat.st_size
+            and entry.get('mtime') == stat.st_mtime
+            and Path(entry.get('output', '')).exists()
+            and (not self.frames or Path(entry.get('frames') or '').exists())
+        )
+    
+    def _needs_insights(self, entry):
+        # With a key only LLM suggestions count, so fallback text from a crashed or keyless run is upgraded
+        return bool(self.openai_api_key) and entry.get('suggestions_source') != 'llm'
+    
+    def _rescore_key(self, entry, feature_store):
+        """The stored feature key to rescore an analyzed file from, or None when it is current
+        or its features are missing or were extracted with other settings."""
+        if feature_store is None or not entry.get('feature_key'):
+            return None
+        if not self.rescore and entry.get('config_version') == ResultCache.config_version():
+            return None
+        return entry['feature_key'] if feature_store.is_current(entry['feature_key']) else None
+    
+    def run(self, progress_callback=None):
+        files = self.scan()
+        feature_store = FeatureStore(self.feature_dir) if self.feature_dir else None
+        pending = []
+        awaiting_insights = []
+        skipped = 0
+        rescored = 0
+        
+        for path in files:
+            relative = str(path.relative_to(self.input_dir))
+            if self._is_analyzed(path, relative):
+                entry = self.manifest['files'][relative]
+                feature_key = self._rescore_key(entry, feature_store)
+                if feature_key is not None:
+                    pending.append((path, relative, feature_key))
+                    rescored += 1
+                    continue
+                if entry.get('config_version') != ResultCache.config_version():
+                    # Written with other settings and nothing current to rescore from
+                    pending.append((path, relative, None))
+                    continue
+                skipped += 1
+                if self._needs_insights(entry):
+                    awaiting_insights.append(entry)
+            else:
+                pending.append((path, relative, None))
+        
+        if self.workers > 1:
+            # Keep BLAS/OpenMP single-threaded inside workers so processes don't oversubscribe cores
+            for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+                os.environ.setdefault(variable, '1')
+        
+        run_start = time.perf_counter()
+        completed = []
+        failed = 0
+        
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(None, self.feature_dir)
+        ) as executor:
+            futures = {}
+            for path, relative, feature_key in pending:
+                stat = path.stat()
+                output_path = self._output_path(relative)
+                frames_path = self._frames_path(relative)
+                self.manifest['files'][relative] = {
+                    'status': 'running',
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime,
+                    'output': str(output_path),
+                    'frames': str(frames_path) if frames_path else None,
+                    'feature_key': feature_key,
+                    'started_at': datetime.now().isoformat(timespec='seconds')
+                }
+                frames_arg = str(frames_path) if frames_path else None
+                if feature_key is not None:
+                    future = executor.submit(
+                        _rescore_file, feature_key, str(path), str(output_path), frames_arg, relative, self.team
+                    )
+                else:
+                    future = executor.submit(
+                        _analyze_file, str(path), str(output_path), frames_arg, relative, self.team
+                    )
+                futures[future] = relative
+            self._save_manifest()
+            
+            for future in as_completed(futures):
+                relative = futures[future]
+                entry = self.manifest['files'][relative]
+                entry['finished_at'] = datetime.now().isoformat(timespec='seconds')
+                
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    entry['status'] = 'failed'
+                    entry['error'] = f"{type(exc).__name__}: {exc}"
+                    failed += 1
+                else:
+                    entry.update(outcome)
+                    entry['status'] = 'done'
+                    entry.pop('error', None)
+                    completed.append(entry)
+                
+                # Persist after every file so a crash loses at most the in-flight work
+                self._save_manifest()
+                
+                if progress_callback:
+                    progress_callback(relative, entry, len(completed) + failed, len(pending))
+        
+        analysis_s = time.perf_counter() - run_start
+        insights_s = 0.0
+        enrich = [entry for entry in awaiting_insights + completed if self._needs_insights(entry)]
+        if enrich:
+            insights_s = self.attach_insights(enrich)
+            self._save_manifest()
+        
+        # Throughput figures cover the analysis pool; the LLM batch is reported on its own
+        report = self.performance_report(completed, failed, skipped, analysis_s)
+        report['insights_s'] = insights_s
+        report['files_insights_only'] = len(awaiting_insights)
+        report['files_rescored'] = rescored
+        self.manifest['last_run'] = report
+        self._save_manifest()
+        return report
+    
+    def attach_insights(self, entries, progress_callback=None):
+        """Replace the fallback suggestions in the given entries' result files with LLM
+        suggestions generated by InsightsGenerator.generate_batch(). Returns the wall time."""
+        from modules.insight_cache import InsightCache
+        from modules.insights_generator import InsightsGenerator
+        
+        start = time.perf_counter()
+        outputs = []
+        for entry in entries:
+            with open(entry['output'], 'r', encoding='utf-8') as f:
+                outputs.append(json.load(f))
+        
+        generator = InsightsGenerator(api_key=self.openai_api_key, cache=InsightCache())
+        suggestions = generator.generate_batch(
+            [output['summary'] for output in outputs], progress_callback=progress_callback
+        )
+        
+        for entry, output, (text, source) in zip(entries, outputs, suggestions):
+            output['suggestions'] = text
+            output['suggestions_source'] = source
+            with open(entry['output'], 'w', encoding='utf-8') as f:
+                json.dump(output, f, ensure_ascii=False)
+            entry['suggestions_source'] = source
+        
+        return time.perf_counter() - start
+    
+    def performance_report(self, completed, failed, skipped, wall_s):
+        audio_s = sum(entry['duration'] for entry in completed)
+        busy_s = sum(entry['wall_s'] for entry in completed)
+        
+        stage_totals = {}
+        for entry in completed:
+            for stage in entry['stage_timings']:
+                totals = stage_totals.setdefault(stage['stage'], {'wall_ms': 0.0, 'cpu_ms': 0.0})
+                totals['wall_ms'] += stage['wall_ms']
+                totals['cpu_ms'] += stage['cpu_ms']
+        
+        speedup = busy_s / wall_s if wall_s > 0 else 0.0
+        return {
+            'files_done': len(completed),
+            'files_failed': failed,
+            'files_skipped': skipped,
+            'workers': self.workers,
+            'wall_s': wall_s,
+            'audio_s': audio_s,
+            'realtime_factor': audio_s / wall_s if wall_s > 0 else 0.0,
+            'files_per_min': len(completed) / wall_s * 60 if wall_s > 0 else 0.0,
+            'speedup': speedup,
+            'parallel_efficiency': speedup / self.workers if self.workers else 0.0,
+            'stage_totals': stage_totals
+        }
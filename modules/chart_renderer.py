@@ -0,0 +1,187 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import (
+    MOODFLO_CATEGORIES, CHART_WIDTH_PX, CHART_HEIGHT_PX, CHART_POINT_BUDGET, CHART_CACHE_MAX_ENTRIES
+)
+from modules.timeline_pyramid import TimelinePyramid
+
+CATEGORY_COLORS = {
+    'energised': '#00d4aa',
+    'stressed': '#ff4444',
+    'flat': '#888888',
+    'thoughtful': '#667eea',
+    'volatile': '#ffa500'
+}
+DISPLAY_KEYS = {name: key for key, name in MOODFLO_CATEGORIES.items()}
+ACCENT = '#667eea'
+AXIS = '#444444'
+GRID = '#e6e6e6'
+
+def category_label(category):
+    """Category key or display name without its emoji, which the bitmap font lacks."""
+    name = MOODFLO_CATEGORIES.get(category, category)
+    return name.split(' ', 1)[1] if ' ' in name else name
+
+def _rgba(color, alpha=255):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5)) + (alpha,)
+
+class ChartRenderer:
+    """Rasterizes the report charts (emotion timeline, distribution, energy trajectory)
+    to PNG with Pillow from the downsampled timeline, so drawing cost is bounded by
+    CHART_POINT_BUDGET rather than meeting length. Rendered charts are kept per analysis
+    in an LRU and rendered on a thread pool."""
+    
+    def __init__(self, width=CHART_WIDTH_PX, height=CHART_HEIGHT_PX, max_points=CHART_POINT_BUDGET,
+                 max_entries=CHART_CACHE_MAX_ENTRIES, workers=3):
+        self.width = width
+        self.height = height
+        self.max_points = max_points
+        self.max_entries = max_entries
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='charts')
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+    
+    @staticmethod
+    def analysis_key(results):
+        """Charts only depend on the timeline, so upgraded suggestions reuse them."""
+        digest = hashlib.sha256()
+        digest.update(str(results.get('content_hash')).encode('utf-8'))
+        digest.update(repr(results['duration']).encode('utf-8'))
+        digest.update(np.ascontiguousarray(results['timeline']['energy'].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+    
+    def _canvas(self):
+        from PIL import Image, ImageDraw, ImageFont
+        image = Image.new('RGB', (self.width, self.height), 'white')
+        # RGBA drawing on an RGB image blends translucent fills
+        draw = ImageDraw.Draw(image, 'RGBA')
+        font = ImageFont.load_default(size=max(12, self.height // 28))
+        return image, draw, font
+    
+    @staticmethod
+    def _png(image):
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', optimize=False, compress_level=3)
+        return buffer.getvalue()
+    
+    def _plot_area(self, draw, font, x_max, x_label, y_label, y_max=100):
+        """Draw axes, grid and tick labels; returns a function mapping data to pixels."""
+        left, right = int(self.width * 0.08), int(self.width * 0.98)
+        top, bottom = int(self.height * 0.06), int(self.height * 0.84)
+        
+        for value in np.linspace(0, y_max, 6):
+            y = bottom - (bottom - top) * value / y_max
+            draw.line([(left, y), (right, y)], fill=GRID, width=1)
+            draw.text((left - 10, y), f"{value:.0f}", fill=AXIS, font=font, anchor='rm')
+        
+        x_max = max(x_max, 1e-9)
+        for value in np.linspace(0, x_max, 7):
+            x = left + (right - left) * value / x_max
+            draw.line([(x, bottom), (x, bottom + 6)], fill=AXIS, width=2)
+            draw.text((x, bottom + 10), f"{value:.0f}" if x_max >= 10 else f"{value:.1f}", fill=AXIS, font=font, anchor='mt')
+        
+        draw.line([(left, top), (left, bottom), (right, bottom)], fill=AXIS, width=2)
+        draw.text(((left + right) / 2, self.height - 8), x_label, fill=AXIS, font=font, anchor='md')
+        draw.text((8, top - 4), y_label, fill=AXIS, font=font, anchor='la')
+        
+        def to_pixels(x, y):
+            px = left + (right - left) * np.asarray(x, dtype=float) / x_max
+            py = bottom - (bottom - top) * np.clip(np.asarray(y, dtype=float), 0, y_max) / y_max
+            return px, py
+        
+        return to_pixels
+    
+    def render_timeline(self, frame):
+        image, draw, font = self._canvas()
+        minutes = frame['time'].to_numpy(dtype=float) / 60
+        to_pixels = self._plot_area(draw, font, minutes[-1] if len(minutes) else 1, 'Time (minutes)', 'Energy')
+        
+        xs, ys = to_pixels(minutes, frame['energy'].to_numpy(dtype=float))
+        if len(xs) > 1:
+            draw.line(list(zip(xs.tolist(), ys.tolist())), fill=(120, 120, 120, 110), width=2)
+        
+        radius = max(2, self.height // 140)
+        for x, y, category in zip(xs.tolist(), ys.tolist(), frame['category']):
+            color = CATEGORY_COLORS.get(DISPLAY_KEYS.get(category, category), ACCENT)
+            draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=color)
+        
+        # Legend along the top edge
+        x = self.width * 0.10
+        for key, color in CATEGORY_COLORS.items():
+            draw.ellipse([x, 6, x + 2 * radius + 6, 12 + 2 * radius], fill=color)
+            draw.text((x + 2 * radius + 12, 9 + radius), category_label(key), fill=AXIS, font=font, anchor='lm')
+            x += draw.textlength(category_label(key), font=font) + 4 * radius + 40
+        return self._png(image)
+    
+    def render_distribution(self, distribution):
+        image, draw, font = self._canvas()
+        items = sorted(distribution.items(), key=lambda item: item[1], reverse=True)
+        if not items:
+            return self._png(image)
+        
+        left, right = int(self.width * 0.26), int(self.width * 0.92)
+        top, bottom = int(self.height * 0.06), int(self.height * 0.94)
+        row = (bottom - top) / len(items)
+        largest = max(percentage for _, percentage in items) or 1
+        
+        for index, (category, percentage) in enumerate(items):
+            y0 = top + index * row + row * 0.15
+            y1 = top + (index + 1) * row - row * 0.15
+            x1 = left + (right - left) * percentage / largest
+            color = CATEGORY_COLORS.get(DISPLAY_KEYS.get(category, category), ACCENT)
+            draw.rectangle([left, y0, max(left + 1, x1), y1], fill=color)
+            draw.text((left - 12, (y0 + y1) / 2), category_label(category), fill=AXIS, font=font, anchor='rm')
+            draw.text((x1 + 10, (y0 + y1) / 2), f"{percentage:.1f}%", fill=AXIS, font=font, anchor='lm')
+        return self._png(image)
+    
+    def render_trajectory(self, frame):
+        image, draw, font = self._canvas()
+        minutes = frame['time'].to_numpy(dtype=float) / 60
+        smooth = frame['energy'].rolling(window=5, center=True, min_periods=1).mean().to_numpy()
+        to_pixels = self._plot_area(draw, font, minutes[-1] if len(minutes) else 1, 'Time (minutes)', 'Energy')
+        
+        xs, ys = to_pixels(minutes, smooth)
+        if len(xs) > 1:
+            _, baseline = to_pixels([0], [0])
+            outline = list(zip(xs.tolist(), ys.tolist()))
+            draw.polygon(outline + [(xs[-1], baseline[0]), (xs[0], baseline[0])], fill=_rgba(ACCENT, 60))
+            draw.line(outline, fill=ACCENT, width=3)
+        return self._png(image)
+    
+    def charts(self, results):
+        """Futures of PNG bytes per chart name for an analysis result. The three charts
+        render concurrently and are cached, so later reports for the same analysis get
+        completed futures straight away."""
+        key = self.analysis_key(results)
+        with self.lock:
+            charts = self.entries.get(key)
+            failed = charts is not None and any(
+                job.done() and job.exception() is not None for job in charts.values()
+            )
+            if charts is None or failed:
+                frame = TimelinePyramid.from_result(results).select(max_points=self.max_points)
+                charts = {
+                    'timeline': self.executor.submit(self.render_timeline, frame),
+                    'distribution': self.executor.submit(self.render_distribution, results['summary']['distribution']),
+                    'trajectory': self.executor.submit(self.render_trajectory, frame)
+                }
+                self.entries[key] = charts
+            self.entries.move_to_end(key)
+            
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return charts
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def shared_renderer():
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
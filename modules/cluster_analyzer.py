@@ -1,6 +1,4 @@
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.manifold import TSNE
 
 class ClusterAnalyzer:
     
@@ -27,6 +25,10 @@ class ClusterAnalyzer:
         if len(features) < self.n_clusters:
             return np.zeros(len(features)), features[:, :2]
         
+        # scikit-learn is only imported once a recording actually reaches clustering
+        from sklearn.cluster import KMeans
+        from sklearn.manifold import TSNE
+        
         kmeans = KMeans(n_clusters=self.n_clusters, random_state=42, n_init=10)
         labels = kmeans.fit_predict(features)
         
@@ -14,16 +14,29 @@ try:
 except ImportError:
     VOKATURI_AVAILABLE = False
 
+_loaded_library = None
+
+def _load_vokaturi(lib_path):
+    """Load the native library once per process; later detectors reuse it."""
+    global _loaded_library
+    if _loaded_library is None:
+        Vokaturi.load(str(lib_path))
+        _loaded_library = str(lib_path)
+    return True
+
 class EmotionDetector:
     
-    def __init__(self):
+    def __init__(self, max_workers=PARALLEL_WORKERS, executor=None):
+        """executor: optional shared thread pool; when given, frames are analyzed on it
+        instead of on a pool created per batch."""
         self.vokaturi_loaded = False
+        self.max_workers = max_workers
+        self.executor = executor
         
         if VOKATURI_AVAILABLE:
             lib_path = self._get_vokaturi_lib_path()
             if lib_path and os.path.exists(lib_path):
-                Vokaturi.load(str(lib_path))
-                self.vokaturi_loaded = True
+                self.vokaturi_loaded = _load_vokaturi(lib_path)
     
     def _get_vokaturi_lib_path(self):
         base_path = Path(__file__).parent.parent / "OpenVokaturi-4-0" / "OpenVokaturi-4-0" / "lib" / "open"
@@ -65,16 +78,44 @@ class EmotionDetector:
         voice.destroy()
         
         if quality.valid:
-            return {
-                'neutral': emotion.neutrality,
-                'happy': emotion.happiness,
-                'sad': emotion.sadness,
-                'angry': emotion.anger,
-                'fearful': emotion.fear
-            }
+            return self._to_emotion_dict(emotion)
         
         return self._fallback_analysis(frame)
     
+    def _to_emotion_dict(self, emotion):
+        return {
+            'neutral': emotion.neutrality,
+            'happy': emotion.happiness,
+            'sad': emotion.sadness,
+            'angry': emotion.anger,
+            'fearful': emotion.fear
+        }
+    
+    def create_voice(self, sample_rate, buffer_length):
+        """Long-lived, multi-threaded Voice for continuous input, following the
+        OpenVokaListen example. Returns None when Vokaturi is unavailable."""
+        if not self.vokaturi_loaded:
+            return None
+        return Vokaturi.Voice(float(sample_rate), buffer_length, 1)
+    
+    def fill_voice(self, voice, samples, c_buffer=None):
+        num_samples = len(samples)
+        if c_buffer is None or len(c_buffer) < num_samples:
+            c_buffer = Vokaturi.float64array(num_samples)
+        c_buffer[:num_samples] = samples
+        voice.fill_float64array(num_samples, c_buffer)
+        return c_buffer
+    
+    def extract_voice(self, voice, recent_samples):
+        quality = Vokaturi.Quality()
+        emotion = Vokaturi.EmotionProbabilities()
+        voice.extract(quality, emotion)
+        
+        if quality.valid:
+            return self._to_emotion_dict(emotion)
+        
+        return self._fallback_analysis(recent_samples)
+    
     def _fallback_analysis(self, frame):
         energy = float(np.sqrt(np.mean(frame ** 2)))
         zcr = float(np.mean(np.abs(np.diff(np.sign(frame)))))
@@ -92,13 +133,16 @@ class EmotionDetector:
     def batch_analyze(self, frames, sample_rate):
         results = []
         
-        if not self.vokaturi_loaded or len(frames) < BATCH_SIZE:
+        if not self.vokaturi_loaded or len(frames) < BATCH_SIZE or self.max_workers <= 1:
             for frame in frames:
                 emotion = self.analyze_frame(frame, sample_rate)
                 results.append(emotion)
             return results
         
-        with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+        if self.executor is not None:
+            return list(self.executor.map(lambda frame: self.analyze_frame(frame, sample_rate), frames))
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_idx = {
                 executor.submit(self.analyze_frame, frame, sample_rate): idx 
                 for idx, frame in enumerate(frames)
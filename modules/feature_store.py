@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import config
+from config import FEATURE_STORE_DIR, ANALYZER_VERSION, EMOTION_KEYS
+
+class FeatureStore:
+    """Persists the expensive, threshold-independent part of an analysis: per-frame RMS,
+    emotion probabilities, tempo and clustering. Rescoring with new thresholds or category
+    rules only needs these arrays, not the recording."""
+    
+    def __init__(self, store_dir=FEATURE_STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+    
+    @staticmethod
+    def config_version():
+        """Fingerprint of the settings that the stored features depend on."""
+        settings = {
+            'version': ANALYZER_VERSION,
+            'sample_rate': config.AUDIO_SAMPLE_RATE,
+            'frame': config.FRAME_DURATION,
+            'hop': config.HOP_DURATION,
+            'energy_scale': config.ENERGY_SCALE,
+            # Clusters are computed from energies, so they follow the gain as well
+            'energy_gain': config.ENERGY_GAIN
+        }
+        encoded = json.dumps(settings, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+    
+    def make_key(self, content_hash, variant=""):
+        return f"{content_hash}-{self.config_version()}{'-' + variant if variant else ''}"
+    
+    def _path(self, key):
+        return os.path.join(self.store_dir, f"{key}.npz")
+    
+    def save(self, key, features):
+        emotions = np.array(
+            [[emotion.get(name, 0) for name in EMOTION_KEYS] for emotion in features['emotions']],
+            dtype=np.float64
+        ).reshape(-1, len(EMOTION_KEYS))
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(
+                f,
+                timestamps=np.asarray(features['timestamps'], dtype=np.float64),
+                rms=np.asarray(features['rms'], dtype=np.float64),
+                emotions=emotions,
+                tempo=np.float64(features['tempo']),
+                duration=np.float64(features['duration']),
+                sample_rate=np.int64(features['sample_rate']),
+                clusters=np.array(json.dumps(features['clusters']))
+            )
+        os.replace(temp_path, self._path(key))
+    
+    def load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        
+        with np.load(path, allow_pickle=False) as data:
+            return {
+                'timestamps': data['timestamps'],
+                'rms': data['rms'],
+                'emotions': [dict(zip(EMOTION_KEYS, row.tolist())) for row in data['emotions']],
+                'tempo': float(data['tempo']),
+                'duration': float(data['duration']),
+                'sample_rate': int(data['sample_rate']),
+                'clusters': json.loads(str(data['clusters']))
+            }
+    
+    def is_current(self, key):
+        """True when features are stored under key and were extracted with today's settings."""
+        parts = key.split('-')
+        return len(parts) > 1 and parts[1] == self.config_version() and os.path.exists(self._path(key))
+    
+    def keys(self):
+        return sorted(name[:-4] for name in os.listdir(self.store_dir) if name.endswith('.npz'))
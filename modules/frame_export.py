@@ -0,0 +1,120 @@
+import glob
+import os
+import numpy as np
+from config import MOODFLO_CATEGORIES, EMOTION_KEYS, ANALYZER_VERSION
+
+CATEGORY_KEYS = list(MOODFLO_CATEGORIES)
+FRAME_FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError as exc:
+        raise ImportError("Per-frame export needs pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+def frame_schema(pa=None):
+    """Typed per-frame schema: float32 measurements, dictionary-encoded category and meeting."""
+    pa = pa or _pyarrow()
+    return pa.schema(
+        [
+            pa.field('meeting', pa.dictionary(pa.int32(), pa.string())),
+            pa.field('time', pa.float32()),
+            pa.field('energy', pa.float32())
+        ]
+        + [pa.field(name, pa.float32()) for name in EMOTION_KEYS]
+        + [
+            pa.field('category', pa.dictionary(pa.int8(), pa.string())),
+            pa.field('cluster', pa.int8())
+        ]
+    )
+
+def frames_table(results, meeting_id=None):
+    """Arrow table with one row per analysis window of an analysis result.
+    
+    Categories use the same dictionary (MOODFLO_CATEGORIES order) in every file, so the
+    codes are comparable across meetings and tables concatenate without re-encoding."""
+    pa = _pyarrow()
+    timeline = results['timeline']
+    frames = len(timeline)
+    meeting_id = meeting_id or results.get('content_hash') or 'meeting'
+    
+    codes = {key: code for code, key in enumerate(CATEGORY_KEYS)}
+    category_codes = np.array([codes.get(category, -1) for category in timeline['category']], dtype=np.int8)
+    if (category_codes < 0).any():
+        raise ValueError("Timeline holds categories outside MOODFLO_CATEGORIES")
+    
+    # Older results carry no per-frame probabilities; those columns are exported as nulls
+    probabilities = results.get('emotion_probabilities')
+    probabilities = (
+        np.asarray(probabilities, dtype=np.float32).reshape(frames, len(EMOTION_KEYS))
+        if probabilities is not None else None
+    )
+    
+    labels = results.get('clusters', {}).get('labels')
+    columns = {
+        'meeting': pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(frames, dtype=np.int32)), pa.array([str(meeting_id)])
+        ),
+        'time': pa.array(timeline['time'].to_numpy(dtype=np.float32)),
+        'energy': pa.array(timeline['energy'].to_numpy(dtype=np.float32))
+    }
+    for index, name in enumerate(EMOTION_KEYS):
+        columns[name] = (
+            pa.array(np.ascontiguousarray(probabilities[:, index]))
+            if probabilities is not None else pa.nulls(frames, pa.float32())
+        )
+    columns['category'] = pa.DictionaryArray.from_arrays(pa.array(category_codes), pa.array(CATEGORY_KEYS))
+    columns['cluster'] = (
+        pa.array(np.asarray(labels, dtype=np.int8))
+        if labels is not None and len(labels) == frames else pa.nulls(frames, pa.int8())
+    )
+    
+    schema = frame_schema(pa).with_metadata({
+        'moodflo.analyzer_version': ANALYZER_VERSION,
+        'moodflo.duration': repr(float(results['duration'])),
+        'moodflo.summary_risk': str(results['summary']['psych_risk'])
+    })
+    return pa.Table.from_pydict(columns, schema=schema)
+
+def frame_format(path):
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix not in FRAME_FORMATS:
+        raise ValueError(f"Unsupported frame export extension '{suffix}' (use .parquet or .arrow)")
+    return FRAME_FORMATS[suffix]
+
+def write_frames(results, target, file_format=None, meeting_id=None):
+    """Write per-frame data to target (path or binary stream). Parquet is compressed for
+    storage; Arrow IPC is left uncompressed so read_frames() can memory-map it."""
+    pa = _pyarrow()
+    table = frames_table(results, meeting_id)
+    file_format = file_format or frame_format(target)
+    
+    if file_format == 'parquet':
+        pa.parquet.write_table(table, target, compression='zstd', use_dictionary=['meeting', 'category'])
+    elif file_format == 'arrow':
+        with pa.ipc.new_file(target, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown frame format '{file_format}'")
+    return table.num_rows
+
+def read_frames(path):
+    """Per-frame table from a file written by write_frames(). Arrow files are memory-mapped,
+    so columns reference the page cache instead of being copied."""
+    pa = _pyarrow()
+    if frame_format(path) == 'arrow':
+        return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    return pa.parquet.read_table(str(path), memory_map=True)
+
+def read_frames_dir(directory, file_format='arrow', columns=None):
+    """All meetings exported under directory as one table, optionally only some columns."""
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+    
+    suffixes = [suffix for suffix, kind in FRAME_FORMATS.items() if kind == file_format]
+    paths = sorted(path for suffix in suffixes for path in glob.glob(os.path.join(str(directory), f"*{suffix}")))
+    dataset = ds.dataset(paths, format='ipc' if file_format == 'arrow' else 'parquet', schema=frame_schema(pa))
+    return dataset.to_table(columns=columns)
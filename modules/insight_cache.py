@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from config import (
+    INSIGHT_CACHE_PATH, INSIGHT_CACHE_TTL, INSIGHT_CACHE_MAX_ENTRIES, INSIGHT_QUANTUM, INSIGHT_PROMPT_VERSION,
+    DIGEST_MAX_SEGMENTS, DIGEST_MIN_SEGMENT, DIGEST_TENSION_SPANS, DIGEST_TENSION_GAP, DIGEST_QUARTERS,
+    DIGEST_MAX_TOKENS
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS insights (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_insights_last_used ON insights (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+class InsightCache:
+    """Persistent cache of LLM suggestions keyed on a quantized analysis summary, so
+    near-identical meetings reuse an earlier response instead of calling the API.
+    Entries expire after ttl seconds; beyond max_entries the least recently used go."""
+    
+    def __init__(self, db_path=INSIGHT_CACHE_PATH, ttl=INSIGHT_CACHE_TTL, max_entries=INSIGHT_CACHE_MAX_ENTRIES,
+                 quantum=INSIGHT_QUANTUM):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.quantum = quantum
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def _connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+    
+    def _quantize(self, value, quantum):
+        return round(round(float(value) / quantum) * quantum, 3)
+    
+    def canonical_inputs(self, data):
+        """The prompt inputs with metrics rounded, so summaries that differ only by
+        noise map to the same key."""
+        return {
+            'dominant_emotion': data['dominant_emotion'],
+            'psych_risk': data['psych_risk'],
+            'avg_energy': self._quantize(data['avg_energy'], self.quantum),
+            'silence_pct': self._quantize(data['silence_pct'], self.quantum),
+            'participation': self._quantize(data['participation'], self.quantum),
+            'volatility': self._quantize(data['volatility'], self.quantum / 10),
+            'distribution': {
+                emotion: self._quantize(percentage, self.quantum)
+                for emotion, percentage in sorted(data['distribution'].items())
+            },
+            'timeline_digest': self._canonical_digest(data.get('timeline_digest'))
+        }
+    
+    def _canonical_digest(self, digest):
+        # Suggestions quote timestamps, so only meetings whose key moments line up to the minute share them
+        if not digest:
+            return None
+        return {
+            part: [
+                {
+                    field: self._quantize(value, 60) if field in ('start', 'end')
+                    else self._quantize(value, self.quantum) if isinstance(value, float)
+                    else value
+                    for field, value in entry.items()
+                }
+                for entry in entries
+            ]
+            for part, entries in sorted(digest.items())
+        }
+    
+    def make_key(self, data, model, temperature, max_tokens):
+        payload = {
+            'inputs': self.canonical_inputs(data),
+            'model': model,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'prompt_version': INSIGHT_PROMPT_VERSION,
+            'digest': [
+                DIGEST_MAX_SEGMENTS, DIGEST_MIN_SEGMENT, DIGEST_TENSION_SPANS, DIGEST_TENSION_GAP,
+                DIGEST_QUARTERS, DIGEST_MAX_TOKENS
+            ]
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def _count(self, conn, name):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+    
+    def get(self, key):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT response FROM insights WHERE key = ? AND created_at >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self._count(conn, 'misses')
+                return None
+            
+            conn.execute("UPDATE insights SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._count(conn, 'hits')
+            return row[0]
+    
+    def put(self, key, response, model):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO insights (key, response, model, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, response, model, now, now)
+            )
+        self.evict()
+    
+    def evict(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM insights WHERE created_at < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM insights WHERE key NOT IN "
+                "(SELECT key FROM insights ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+    
+    def stats(self):
+        with self._connection() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+        
+        hits = counters.get('hits', 0)
+        lookups = hits + counters.get('misses', 0)
+        return {
+            'entries': entries,
+            'hits': hits,
+            'lookups': lookups,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
@@ -1,28 +1,159 @@
-from openai import OpenAI
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from config import (
+    INSIGHT_MODEL, INSIGHT_TEMPERATURE, INSIGHT_MAX_TOKENS, INSIGHT_TIMEOUT, INSIGHT_BATCH_CONCURRENCY,
+    INSIGHT_REQUESTS_PER_MINUTE, INSIGHT_TOKENS_PER_MINUTE, INSIGHT_MAX_RETRIES, INSIGHT_BACKOFF_BASE,
+    INSIGHT_BACKOFF_MAX
+)
+from modules.openai_pool import get_client
+from modules.rate_limiter import RateLimiter
+from modules.timeline_digest import TimelineDigest
+
+SYSTEM_PROMPT = "You are an expert meeting coach analyzing emotional patterns. Provide 4-5 concise, actionable suggestions based on acoustic analysis. Focus on psychological safety and practical next steps."
 
 class InsightsGenerator:
     
-    def __init__(self, api_key=None):
-        """Initialize with optional API key. If None, will use fallback suggestions."""
-        self.client = OpenAI(api_key=api_key) if api_key else None
+    _executor = None
+    _executor_lock = threading.Lock()
+    
+    def __init__(self, api_key=None, cache=None, model=INSIGHT_MODEL, temperature=INSIGHT_TEMPERATURE,
+                 max_tokens=INSIGHT_MAX_TOKENS, base_url=None):
+        """Initialize with optional API key. If None, will use fallback suggestions.
+        An optional InsightCache is consulted before every chat completion; base_url points
+        the client at another OpenAI-compatible endpoint. Clients come from the process-wide
+        pool in openai_pool, so generators with the same key share connections."""
+        self.cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.client = None
+        if api_key:
+            self.client = get_client(api_key, base_url)
+    
+    @classmethod
+    def _background_executor(cls):
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='insights')
+            return cls._executor
+    
+    def generate_with_deadline(self, analysis_data, deadline=None):
+        """Suggestions without letting the LLM hold up the caller for longer than deadline
+        seconds (None waits for the call, bounded by the client timeout).
+        
+        Returns (suggestions, source, future). source is 'llm', 'fallback', or 'pending' when
+        the deadline passed first; the fallback text is returned then, and future resolves
+        to the LLM text once it arrives."""
+        if not self.client:
+            return self._fallback_suggestions(analysis_data), 'fallback', None
+        
+        future = self._background_executor().submit(self.generate_suggestions, analysis_data)
+        try:
+            return future.result(timeout=deadline), 'llm', None
+        except FutureTimeoutError:
+            return self._fallback_suggestions(analysis_data), 'pending', future
+        except Exception:
+            return self._fallback_suggestions(analysis_data), 'fallback', None
     
     def generate_suggestions(self, analysis_data):
         if not self.client:
             return self._fallback_suggestions(analysis_data)
+        return self._generate(self.client, analysis_data)
+    
+    def generate_batch(self, summaries, max_concurrency=INSIGHT_BATCH_CONCURRENCY, rate_limiter=None,
+                       timeout=INSIGHT_TIMEOUT, max_retries=INSIGHT_MAX_RETRIES, progress_callback=None):
+        """Suggestions for many analysis summaries at once, for archive runs.
+        
+        Requests run on max_concurrency threads under rate_limiter (by default the
+        configured requests- and tokens-per-minute quota), each bounded by timeout seconds
+        and retried with exponential backoff on rate limits, timeouts and server errors.
+        Returns a (suggestions, source) pair per summary, in input order; a summary whose
+        retries run out gets the fallback text with source 'fallback'."""
+        summaries = list(summaries)
+        if not self.client:
+            return [(self._fallback_suggestions(summary), 'fallback') for summary in summaries]
+        
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(INSIGHT_REQUESTS_PER_MINUTE, INSIGHT_TOKENS_PER_MINUTE)
+        # Retries are done here so that they go through the rate limiter as well
+        client = self.client.with_options(timeout=timeout, max_retries=0)
+        
+        results = [None] * len(summaries)
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='insights-batch') as executor:
+            futures = {
+                executor.submit(self._generate, client, summary, rate_limiter, max_retries): index
+                for index, summary in enumerate(summaries)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                try:
+                    results[index] = (future.result(), 'llm')
+                except Exception:
+                    results[index] = (self._fallback_suggestions(summaries[index]), 'fallback')
+                
+                if progress_callback:
+                    progress_callback(done, len(summaries))
+        
+        return results
+    
+    def _generate(self, client, analysis_data, rate_limiter=None, max_retries=0):
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(analysis_data, self.model, self.temperature, self.max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         prompt = self._build_prompt(analysis_data)
         
-        response = self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert meeting coach analyzing emotional patterns. Provide 4-5 concise, actionable suggestions based on acoustic analysis. Focus on psychological safety and practical next steps."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            max_tokens=300
-        )
+        for attempt in range(max_retries + 1):
+            if rate_limiter is not None:
+                rate_limiter.acquire(self._estimate_tokens(prompt))
+            try:
+                response = client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens
+                )
+                break
+            except Exception as exc:
+                if attempt == max_retries or not self._is_retryable(exc):
+                    raise
+                time.sleep(self._backoff_delay(exc, attempt))
         
-        return response.choices[0].message.content
+        suggestions = response.choices[0].message.content
+        if cache_key is not None:
+            self.cache.put(cache_key, suggestions, self.model)
+        return suggestions
+    
+    def _estimate_tokens(self, prompt):
+        # Roughly four characters per token, plus the completion budget the quota reserves
+        return (len(SYSTEM_PROMPT) + len(prompt)) // 4 + self.max_tokens
+    
+    @staticmethod
+    def _is_retryable(exc):
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+        return isinstance(exc, (APIConnectionError, InternalServerError, RateLimitError))
+    
+    @staticmethod
+    def _backoff_delay(exc, attempt):
+        delay = min(INSIGHT_BACKOFF_MAX, INSIGHT_BACKOFF_BASE * 2 ** attempt)
+        # Jitter keeps concurrent retries from arriving in lockstep
+        delay = random.uniform(delay / 2, delay)
+        
+        response = getattr(exc, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            delay = max(delay, min(INSIGHT_BACKOFF_MAX, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return delay
     
     def _build_prompt(self, data):
         prompt = f"""Meeting Acoustic Analysis Summary:
@@ -39,7 +170,11 @@ Emotion Distribution:
         for emotion, percentage in data['distribution'].items():
             prompt += f"- {emotion}: {percentage:.1f}%\n"
         
-        prompt += "\nGenerate 4-5 actionable suggestions for the meeting leader."
+        if data.get('timeline_digest'):
+            prompt += "\nTimeline Highlights:\n" + TimelineDigest.from_dict(data['timeline_digest']).to_prompt()
+            prompt += "\nGenerate 4-5 actionable suggestions for the meeting leader, referring to specific moments by timestamp where useful."
+        else:
+            prompt += "\nGenerate 4-5 actionable suggestions for the meeting leader."
         return prompt
     
     def _fallback_suggestions(self, data):
@@ -0,0 +1,241 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    status TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    filename TEXT,
+    options TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker TEXT,
+    progress INTEGER DEFAULT 0,
+    message TEXT,
+    result_path TEXT,
+    error TEXT,
+    heartbeat_at REAL,
+    attempts INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_seq ON jobs (status, seq);
+"""
+
+# Columns added after the first release, for queues created before them
+MIGRATIONS = {
+    'heartbeat_at': "ALTER TABLE jobs ADD COLUMN heartbeat_at REAL",
+    'attempts': "ALTER TABLE jobs ADD COLUMN attempts INTEGER DEFAULT 0"
+}
+
+class JobQueue:
+    """Durable FIFO job queue in SQLite, safe to share between processes. Running jobs
+    hold a lease that their worker renews with heartbeat(); reclaim() returns jobs whose
+    lease expired to the queue."""
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def submit(self, file_path, filename=None, options=None):
+        job_id = uuid.uuid4().hex
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, file_path, filename, options, submitted_at, message) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, 'Queued')",
+                (job_id, file_path, filename, json.dumps(options or {}), time.time())
+            )
+        return job_id
+    
+    def claim(self, worker):
+        """Atomically move the oldest queued job to running and return it, or None."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            
+            started_at = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ?, worker = ?, "
+                "attempts = attempts + 1, message = 'Starting...' WHERE id = ?",
+                (started_at, started_at, worker, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        
+        job = dict(row)
+        job['status'] = 'running'
+        job['started_at'] = started_at
+        job['heartbeat_at'] = started_at
+        job['attempts'] = (job['attempts'] or 0) + 1
+        job['worker'] = worker
+        job['options'] = json.loads(job['options'] or '{}')
+        return job
+    
+    def update_progress(self, job_id, progress, message):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, heartbeat_at = ? WHERE id = ?",
+                (progress, message, time.time(), job_id)
+            )
+    
+    def heartbeat(self, job_id):
+        """Renew a running job's lease."""
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'", (time.time(), job_id)
+            )
+    
+    def complete(self, job_id, result_path):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, progress = 100, message = 'Done', "
+                "result_path = ? WHERE id = ?",
+                (time.time(), result_path, job_id)
+            )
+    
+    def fail(self, job_id, error):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, message = 'Failed', error = ? WHERE id = ?",
+                (time.time(), error, job_id)
+            )
+    
+    def requeue_running(self):
+        """Return jobs orphaned by a previous service run to the queue."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, heartbeat_at = NULL, worker = NULL, "
+                "progress = 0, message = 'Requeued' WHERE status = 'running'"
+            )
+            return cursor.rowcount
+    
+    def reclaim(self, lease_timeout, max_attempts, worker=None):
+        """Requeue running jobs whose lease expired, or all of worker's running jobs when
+        its process is known to be dead. Jobs that already used max_attempts are failed
+        instead, so a recording that crashes workers cannot loop forever. Returns the
+        number requeued and the failed jobs."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if worker is not None:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'running' AND worker = ?", (worker,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < ?",
+                    (now - lease_timeout,)
+                ).fetchall()
+            
+            requeued, failed = 0, []
+            for row in rows:
+                if row['attempts'] >= max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', finished_at = ?, message = 'Failed', error = ? WHERE id = ?",
+                        (now, f"Worker lost {row['attempts']} times while analyzing this recording", row['id'])
+                    )
+                    failed.append(dict(row))
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'queued', started_at = NULL, heartbeat_at = NULL, worker = NULL, "
+                        "progress = 0, message = 'Requeued after worker loss' WHERE id = ?",
+                        (row['id'],)
+                    )
+                    requeued += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return requeued, failed
+    
+    def get(self, job_id):
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            
+            job = dict(row)
+            job['options'] = json.loads(job['options'] or '{}')
+            job['queue_position'] = None
+            if job['status'] == 'queued':
+                job['queue_position'] = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND seq < ?", (job['seq'],)
+                ).fetchone()[0] + 1
+        
+        now = time.time()
+        if job['started_at']:
+            job['wait_s'] = job['started_at'] - job['submitted_at']
+            job['service_s'] = (job['finished_at'] or now) - job['started_at']
+        else:
+            job['wait_s'] = now - job['submitted_at']
+            job['service_s'] = None
+        return job
+    
+    def stats(self, recent=200):
+        with self._connection() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            finished = conn.execute(
+                "SELECT started_at - submitted_at, finished_at - started_at FROM jobs "
+                "WHERE status IN ('done', 'failed') AND started_at IS NOT NULL ORDER BY seq DESC LIMIT ?",
+                (recent,)
+            ).fetchall()
+        
+        def summarize(values):
+            if not values:
+                return None
+            values = np.array(values)
+            return {
+                'mean': float(np.mean(values)),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'max': float(np.max(values))
+            }
+        
+        return {
+            'queue_depth': counts.get('queued', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'wait_s': summarize([row[0] for row in finished]),
+            'service_s': summarize([row[1] for row in finished])
+        }
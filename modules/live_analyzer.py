@@ -0,0 +1,294 @@
+import socket
+import threading
+import time
+from collections import deque
+import numpy as np
+from config import (
+    AUDIO_SAMPLE_RATE, FRAME_DURATION, MOODFLO_CATEGORIES, SILENCE_THRESHOLD, PARTICIPATION_THRESHOLD,
+    LIVE_CHUNK_DURATION, LIVE_UPDATE_INTERVAL, LIVE_RISK_WINDOW, LIVE_LATENCY_BUDGET_MS
+)
+from modules.audio_processor import AudioProcessor
+from modules.emotion_detector import EmotionDetector
+from modules.metrics_processor import MetricsProcessor
+from modules.mood_mapper import MoodMapper
+from modules.risk_assessor import RiskAssessor
+
+PCM_FORMATS = {
+    's16le': ('<i2', 32768.0),
+    'f32le': ('<f4', 1.0)
+}
+
+class PcmStreamSource:
+    """Raw little-endian mono PCM from any binary stream: a pipe, a socket or a file. Set
+    realtime=False when the stream arrives faster than it was spoken (a file, or ffmpeg
+    without -re) so updates are scheduled on stream time."""
+    
+    def __init__(self, stream, sample_rate=AUDIO_SAMPLE_RATE, sample_format='s16le',
+                 chunk_duration=LIVE_CHUNK_DURATION, realtime=True):
+        if sample_format not in PCM_FORMATS:
+            raise ValueError(f"Unsupported PCM format '{sample_format}', expected one of {list(PCM_FORMATS)}")
+        
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.dtype, self.scale = PCM_FORMATS[sample_format]
+        self.sample_width = np.dtype(self.dtype).itemsize
+        self.chunk_bytes = max(1, int(chunk_duration * sample_rate)) * self.sample_width
+    
+    @classmethod
+    def from_socket(cls, host, port, **kwargs):
+        connection = socket.create_connection((host, port))
+        return cls(connection.makefile('rb'), **kwargs)
+    
+    def chunks(self):
+        while True:
+            data = self.stream.read(self.chunk_bytes)
+            if not data:
+                break
+            data = data[:len(data) - len(data) % self.sample_width]
+            if data:
+                yield np.frombuffer(data, dtype=self.dtype).astype(np.float64) / self.scale
+
+class WavPlaybackSource:
+    """Plays a recording back at real-time pace, as a local stand-in for a meeting feed."""
+    
+    def __init__(self, file_path, sample_rate=AUDIO_SAMPLE_RATE, chunk_duration=LIVE_CHUNK_DURATION,
+                 realtime=True, max_duration=None):
+        self.file_path = file_path
+        self.sample_rate = sample_rate
+        self.chunk_duration = chunk_duration
+        self.realtime = realtime
+        self.max_duration = max_duration
+    
+    def chunks(self):
+        audio_processor = AudioProcessor(self.sample_rate)
+        max_samples = int(self.max_duration * self.sample_rate) if self.max_duration else None
+        start = time.perf_counter()
+        sent = 0
+        
+        for chunk in audio_processor.iter_audio_blocks(self.file_path, self.chunk_duration):
+            if max_samples is not None and sent >= max_samples:
+                break
+            
+            sent += len(chunk)
+            if self.realtime:
+                # Deliver each chunk when its last sample would have been captured
+                delay = start + sent / self.sample_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield chunk
+
+class LiveAnalyzer:
+    """Continuously scores a live PCM stream. A reader thread fills a ring buffer (and a
+    long-lived Vokaturi Voice); every update interval the newest window is scored for
+    emotion, energy and category, and rolling risk is assessed over the recent past.
+    Ticks that are already late are skipped rather than queued, keeping lag bounded."""
+    
+    def __init__(self, sample_rate=AUDIO_SAMPLE_RATE, emotion_detector=None, window_duration=FRAME_DURATION,
+                 update_interval=LIVE_UPDATE_INTERVAL, risk_window=LIVE_RISK_WINDOW,
+                 latency_budget_ms=LIVE_LATENCY_BUDGET_MS):
+        self.sample_rate = sample_rate
+        self.emotion_detector = emotion_detector or EmotionDetector()
+        self.update_interval = update_interval
+        self.latency_budget_ms = latency_budget_ms
+        self.window_samples = int(window_duration * sample_rate)
+        
+        self._ring = np.zeros(self.window_samples)
+        self._write_pos = 0
+        self._filled = 0
+        self._received = 0
+        self._last_arrival = None
+        self._scored_arrival = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        
+        self.voice = self.emotion_detector.create_voice(sample_rate, self.window_samples)
+        self.history = deque(maxlen=max(1, int(risk_window / update_interval)))
+        self.lags_ms = []
+        self.compute_ms = []
+        self.skipped_updates = 0
+    
+    def _append(self, chunk):
+        self._received += len(chunk)
+        chunk = chunk[-self.window_samples:]
+        count = len(chunk)
+        end = self._write_pos + count
+        
+        if end <= self.window_samples:
+            self._ring[self._write_pos:end] = chunk
+        else:
+            first = self.window_samples - self._write_pos
+            self._ring[self._write_pos:] = chunk[:first]
+            self._ring[:count - first] = chunk[first:]
+        
+        self._write_pos = end % self.window_samples
+        self._filled = min(self.window_samples, self._filled + count)
+    
+    def _window(self):
+        if self._filled < self.window_samples:
+            return self._ring[:self._filled].copy()
+        return np.concatenate([self._ring[self._write_pos:], self._ring[:self._write_pos]])
+    
+    def _feed(self, source):
+        c_buffer = None
+        try:
+            for chunk in source.chunks():
+                arrival = time.perf_counter()
+                with self._lock:
+                    self._append(chunk)
+                    self._last_arrival = arrival
+                if self.voice is not None:
+                    c_buffer = self.emotion_detector.fill_voice(self.voice, chunk, c_buffer)
+        finally:
+            self._done.set()
+    
+    def _rolling_metrics(self):
+        frame_count = len(self.history)
+        rms_values = np.array([entry[0] for entry in self.history])
+        dominant = [MetricsProcessor.dominant_emotion_index(entry[2]) for entry in self.history]
+        shift_total = int(np.sum(np.abs(np.diff(dominant)))) if frame_count > 1 else 0
+        
+        counts = {}
+        for entry in self.history:
+            counts[entry[3]] = counts.get(entry[3], 0) + 1
+        
+        metrics = {
+            'silence_percentage': float(np.sum(rms_values < SILENCE_THRESHOLD) / frame_count * 100),
+            'participation': float(np.sum(rms_values > PARTICIPATION_THRESHOLD) / frame_count * 100),
+            'volatility': MetricsProcessor.volatility_from_shifts(shift_total, frame_count)
+        }
+        distribution = {
+            MOODFLO_CATEGORIES[category]: count / frame_count * 100 for category, count in counts.items()
+        }
+        return metrics, distribution
+    
+    def _update(self):
+        with self._lock:
+            if self._filled == 0 or self._last_arrival == self._scored_arrival:
+                return None
+            window = self._window()
+            arrival = self._last_arrival
+            stream_time = self._received / self.sample_rate
+        self._scored_arrival = arrival
+        
+        compute_start = time.perf_counter()
+        rms = float(np.sqrt(np.mean(window ** 2)))
+        energy = float(MetricsProcessor.energy_from_rms(rms))
+        
+        if self.voice is not None:
+            emotion = self.emotion_detector.extract_voice(self.voice, window)
+        else:
+            emotion = self.emotion_detector.analyze_frame(window, self.sample_rate)
+        
+        category = MoodMapper.map_emotion_to_category(emotion, energy)
+        self.history.append((rms, energy, emotion, category))
+        metrics, distribution = self._rolling_metrics()
+        risk = RiskAssessor.assess_psychological_safety(metrics, distribution)
+        
+        now = time.perf_counter()
+        lag_ms = (now - arrival) * 1000
+        compute_ms = (now - compute_start) * 1000
+        self.lags_ms.append(lag_ms)
+        self.compute_ms.append(compute_ms)
+        
+        return {
+            'stream_time': stream_time,
+            'emotion': emotion,
+            'energy': energy,
+            'category': MOODFLO_CATEGORIES[category],
+            'risk': risk,
+            'rolling': {
+                'silence_pct': metrics['silence_percentage'],
+                'participation': metrics['participation'],
+                'volatility': metrics['volatility'],
+                'distribution': distribution
+            },
+            'lag_ms': lag_ms,
+            'compute_ms': compute_ms,
+            'over_budget': lag_ms > self.latency_budget_ms
+        }
+    
+    def run(self, source):
+        """Consume the source until it ends, yielding one update per interval. Sources that
+        are not paced in real time (realtime=False) are ticked on stream time instead of the
+        wall clock, so every interval of audio still gets its update."""
+        if not getattr(source, 'realtime', True):
+            yield from self._run_on_stream_time(source)
+            return
+        
+        feeder = threading.Thread(target=self._feed, args=(source,), daemon=True)
+        feeder.start()
+        next_tick = time.perf_counter() + self.update_interval
+        
+        try:
+            while True:
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._done.wait(delay)
+                finished = self._done.is_set()
+                
+                update = self._update()
+                if update is not None:
+                    yield update
+                if finished:
+                    break
+                
+                next_tick += self.update_interval
+                now = time.perf_counter()
+                if next_tick < now:
+                    missed = int((now - next_tick) / self.update_interval) + 1
+                    self.skipped_updates += missed
+                    next_tick += missed * self.update_interval
+        finally:
+            feeder.join(timeout=1.0)
+            if self.voice is not None and not feeder.is_alive():
+                self.voice.destroy()
+                self.voice = None
+    
+    def _run_on_stream_time(self, source):
+        # Feeds and scores on one thread, cutting chunks at tick boundaries; lag is compute time
+        tick_samples = max(1, int(round(self.update_interval * self.sample_rate)))
+        next_tick = tick_samples
+        c_buffer = None
+        
+        try:
+            for chunk in source.chunks():
+                while len(chunk):
+                    piece, chunk = chunk[:next_tick - self._received], chunk[next_tick - self._received:]
+                    with self._lock:
+                        self._append(piece)
+                        self._last_arrival = time.perf_counter()
+                    if self.voice is not None:
+                        c_buffer = self.emotion_detector.fill_voice(self.voice, piece, c_buffer)
+                    
+                    if self._received >= next_tick:
+                        next_tick += tick_samples
+                        update = self._update()
+                        if update is not None:
+                            yield update
+            
+            # The audio after the last full interval
+            update = self._update()
+            if update is not None:
+                yield update
+        finally:
+            if self.voice is not None:
+                self.voice.destroy()
+                self.voice = None
+    
+    def latency_report(self):
+        if not self.lags_ms:
+            return {'updates': 0, 'skipped': self.skipped_updates}
+        
+        lags = np.array(self.lags_ms)
+        return {
+            'updates': len(lags),
+            'p50_ms': float(np.percentile(lags, 50)),
+            'p99_ms': float(np.percentile(lags, 99)),
+            'max_ms': float(np.max(lags)),
+            'compute_p50_ms': float(np.percentile(self.compute_ms, 50)),
+            'compute_p99_ms': float(np.percentile(self.compute_ms, 99)),
+            'over_budget': int(np.sum(lags > self.latency_budget_ms)),
+            'skipped': self.skipped_updates,
+            'budget_ms': self.latency_budget_ms
+        }
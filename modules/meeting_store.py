@@ -0,0 +1,354 @@
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from config import MOODFLO_CATEGORIES, ANALYZER_VERSION, MEETING_STORE_DIR
+
+CATEGORY_KEYS = list(MOODFLO_CATEGORIES)
+DISPLAY_KEYS = {name: key for key, name in MOODFLO_CATEGORIES.items()}
+PERIODS = ('day', 'week')
+ANALYZE_BATCH = 1000
+TREND_METRICS = CATEGORY_KEYS + ['energy', 'silence', 'high_risk']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    team TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    week TEXT NOT NULL,
+    filename TEXT,
+    duration REAL NOT NULL,
+    avg_energy REAL,
+    silence_pct REAL,
+    participation REAL,
+    volatility REAL,
+    psych_risk TEXT,
+    dominant_mood TEXT,
+    {''.join(f'{key}_pct REAL DEFAULT 0, ' for key in CATEGORY_KEYS)}
+    frames_path TEXT,
+    analyzer_version TEXT,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_team_day ON meetings (team, day);
+CREATE INDEX IF NOT EXISTS idx_meetings_team_week ON meetings (team, week);
+CREATE INDEX IF NOT EXISTS idx_meetings_day ON meetings (day);
+CREATE INDEX IF NOT EXISTS idx_meetings_risk_day ON meetings (psych_risk, day);
+CREATE INDEX IF NOT EXISTS idx_meetings_mood_day ON meetings (dominant_mood, day);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,
+    team TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    meetings INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    energy_s REAL NOT NULL,
+    silence_s REAL NOT NULL,
+    {''.join(f'{key}_s REAL NOT NULL, ' for key in CATEGORY_KEYS)}
+    high_risk INTEGER NOT NULL,
+    medium_risk INTEGER NOT NULL,
+    PRIMARY KEY (period, team, bucket)
+);
+CREATE INDEX IF NOT EXISTS idx_rollups_period_bucket ON rollups (period, bucket);
+"""
+
+SUM_COLUMNS = ['meetings', 'duration_s', 'energy_s', 'silence_s'] + [f'{key}_s' for key in CATEGORY_KEYS] + ['high_risk', 'medium_risk']
+
+# Sums are duration-weighted, so a two-hour meeting counts for more than a stand-up
+ROLLUP_SELECT = f"""
+SELECT COUNT(*), SUM(duration), SUM(avg_energy * duration), SUM(silence_pct * duration / 100),
+    {''.join(f'SUM({key}_pct * duration / 100), ' for key in CATEGORY_KEYS)}
+    SUM(psych_risk = 'High'), SUM(psych_risk = 'Medium')
+FROM meetings WHERE team = ? AND {{column}} = ?
+"""
+
+def _day(value):
+    """ISO date string for a date, datetime, epoch seconds or ISO string."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+def _timestamp(value):
+    """Epoch seconds for a date, datetime or epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).timestamp()
+    return float(value)
+
+def _week(day):
+    """Monday of the ISO week containing day."""
+    value = date.fromisoformat(day)
+    return (value - timedelta(days=value.weekday())).isoformat()
+
+class MeetingStore:
+    """Persistent history of analysed meetings. Summaries live in SQLite, indexed on team,
+    date, risk level and dominant mood, with daily and weekly rollups per team kept up to
+    date on every insert; per-frame timelines are written as Parquet files next to it.
+    Trend queries read only the rollups, so they never touch the raw timelines."""
+    
+    def __init__(self, store_dir=MEETING_STORE_DIR):
+        self.store_dir = store_dir
+        self.db_path = os.path.join(store_dir, 'meetings.sqlite3')
+        self.frames_dir = os.path.join(store_dir, 'frames')
+        os.makedirs(self.frames_dir, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _write_frames(self, results, meeting_id):
+        from modules.frame_export import write_frames
+        path = os.path.join(self.frames_dir, f"{meeting_id}.parquet")
+        try:
+            write_frames(results, path, 'parquet', meeting_id)
+        except ImportError:
+            # Without pyarrow only the summary is kept
+            return None
+        return path
+    
+    @staticmethod
+    def _row(results, team, recorded_at, meeting_id, frames_path):
+        summary = results['summary']
+        recorded_at = _timestamp(recorded_at) if recorded_at is not None else time.time()
+        day = _day(recorded_at)
+        
+        percentages = {DISPLAY_KEYS.get(name, name): pct for name, pct in summary['distribution'].items()}
+        row = {
+            'meeting_id': meeting_id,
+            'team': team,
+            'recorded_at': recorded_at,
+            'day': day,
+            'week': _week(day),
+            'filename': results.get('filename'),
+            'duration': float(results['duration']),
+            'avg_energy': float(summary['avg_energy']),
+            'silence_pct': float(summary['silence_pct']),
+            'participation': float(summary['participation']),
+            'volatility': float(summary['volatility']),
+            'psych_risk': summary['psych_risk'],
+            'dominant_mood': DISPLAY_KEYS.get(summary['dominant_emotion'], summary['dominant_emotion'])
+        }
+        for key in CATEGORY_KEYS:
+            row[f'{key}_pct'] = float(percentages.get(key, 0.0))
+        row['frames_path'] = frames_path
+        row['analyzer_version'] = ANALYZER_VERSION
+        row['stored_at'] = time.time()
+        return row
+    
+    def add(self, results, team, recorded_at=None, meeting_id=None, frames=True):
+        """Store one analysis result for team and return its meeting id. recorded_at
+        (epoch seconds or datetime) defaults to now; storing the same meeting id again
+        replaces the earlier entry."""
+        return self.add_many([(results, team, recorded_at, meeting_id)], frames=frames)[0]
+    
+    def add_many(self, records, frames=True):
+        """Store (results, team, recorded_at, meeting_id) records in one transaction."""
+        rows = []
+        for results, team, recorded_at, meeting_id in records:
+            meeting_id = meeting_id or results.get('content_hash') or uuid.uuid4().hex
+            frames_path = self._write_frames(results, meeting_id) if frames and 'timeline' in results else None
+            rows.append(self._row(results, team, recorded_at, meeting_id, frames_path))
+        
+        if not rows:
+            return []
+        
+        columns = list(rows[0])
+        with self._transaction() as conn:
+            # Replaced meetings must also leave the buckets they used to count in
+            touched = set()
+            for row in rows:
+                previous = conn.execute(
+                    "SELECT team, day, week FROM meetings WHERE meeting_id = ?", (row['meeting_id'],)
+                ).fetchone()
+                if previous is not None:
+                    touched.update([('day', previous['team'], previous['day']), ('week', previous['team'], previous['week'])])
+                touched.update([('day', row['team'], row['day']), ('week', row['team'], row['week'])])
+            
+            conn.executemany(
+                f"INSERT OR REPLACE INTO meetings ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[column] for column in columns) for row in rows]
+            )
+            self._refresh_rollups(conn, touched)
+        
+        self._update_statistics(len(rows))
+        return [row['meeting_id'] for row in rows]
+    
+    def _update_statistics(self, inserted):
+        """Keep planner statistics current so filters on several indexed columns pick the
+        most selective index (a team's meetings rather than every high-risk one)."""
+        with self._connection() as conn:
+            analyzed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone() is not None
+            if not analyzed or inserted >= ANALYZE_BATCH:
+                conn.execute("ANALYZE")
+            else:
+                conn.execute("PRAGMA optimize")
+    
+    def remove(self, meeting_id):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM meetings WHERE meeting_id = ?", (meeting_id,))
+            self._refresh_rollups(conn, {('day', row['team'], row['day']), ('week', row['team'], row['week'])})
+        
+        if row['frames_path'] and os.path.exists(row['frames_path']):
+            os.remove(row['frames_path'])
+        return True
+    
+    def _refresh_rollups(self, conn, buckets):
+        """Recompute the given (period, team, bucket) rollups from the indexed meetings."""
+        for period, team, bucket in buckets:
+            sums = conn.execute(ROLLUP_SELECT.format(column=period), (team, bucket)).fetchone()
+            if sums[0]:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO rollups (period, team, bucket, {', '.join(SUM_COLUMNS)}) "
+                    f"VALUES (?, ?, ?, {', '.join('?' * len(SUM_COLUMNS))})",
+                    (period, team, bucket) + tuple(sums)
+                )
+            else:
+                conn.execute("DELETE FROM rollups WHERE period = ? AND team = ? AND bucket = ?", (period, team, bucket))
+    
+    def rebuild_rollups(self):
+        """Recompute every rollup from the meetings table."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM rollups")
+            for period in PERIODS:
+                buckets = conn.execute(f"SELECT DISTINCT team, {period} FROM meetings").fetchall()
+                self._refresh_rollups(conn, {(period, team, bucket) for team, bucket in buckets})
+        self._update_statistics(ANALYZE_BATCH)
+    
+    @staticmethod
+    def _metric_value(metric, sums):
+        if metric == 'high_risk':
+            return sums['high_risk'] / sums['meetings'] * 100 if sums['meetings'] else 0.0
+        if not sums['duration_s']:
+            return 0.0
+        if metric == 'energy':
+            return sums['energy_s'] / sums['duration_s']
+        if metric == 'silence':
+            return sums['silence_s'] / sums['duration_s'] * 100
+        return sums[f'{metric}_s'] / sums['duration_s'] * 100
+    
+    def trend(self, metric='stressed', team=None, since=None, until=None, period='week'):
+        """Per-bucket value of metric, e.g. the weekly stressed share for one team:
+        a mood category key (share of meeting time, %), 'energy' (average 0-100),
+        'silence' (%) or 'high_risk' (% of meetings). Reads only the rollups."""
+        if metric not in TREND_METRICS:
+            raise ValueError(f"Unknown trend metric '{metric}' (use one of {', '.join(TREND_METRICS)})")
+        if period not in PERIODS:
+            raise ValueError(f"Unknown trend period '{period}' (use 'day' or 'week')")
+        
+        since = _day(since)
+        if since and period == 'week':
+            since = _week(since)
+        clauses, params = ["period = ?"], [period]
+        if team is not None:
+            clauses.append("team = ?")
+            params.append(team)
+        if since:
+            clauses.append("bucket >= ?")
+            params.append(since)
+        if until:
+            clauses.append("bucket <= ?")
+            params.append(_day(until))
+        
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT bucket, {', '.join(f'SUM({column}) AS {column}' for column in SUM_COLUMNS)} "
+                f"FROM rollups WHERE {' AND '.join(clauses)} GROUP BY bucket ORDER BY bucket",
+                params
+            ).fetchall()
+        
+        return [
+            {'bucket': row['bucket'], 'value': self._metric_value(metric, row), 'meetings': row['meetings']}
+            for row in rows
+        ]
+    
+    def meetings(self, team=None, since=None, until=None, risk=None, mood=None, limit=None):
+        """Stored meeting summaries, newest first, filtered on the indexed columns."""
+        clauses, params = [], []
+        for column, value in (('team', team), ('psych_risk', risk), ('dominant_mood', mood)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(_day(since))
+        if until is not None:
+            clauses.append("day <= ?")
+            params.append(_day(until))
+        
+        query = "SELECT * FROM meetings"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY day DESC, recorded_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+    
+    def teams(self):
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT team FROM meetings ORDER BY team").fetchall()]
+    
+    def timelines(self, meeting_ids, columns=None):
+        """Per-frame Parquet timelines of the given meetings as one Arrow table."""
+        from modules.frame_export import _pyarrow, frame_schema
+        import pyarrow.dataset as ds
+        
+        meeting_ids = list(meeting_ids)
+        with self._connection() as conn:
+            paths = [
+                row[0] for row in conn.execute(
+                    f"SELECT frames_path FROM meetings WHERE meeting_id IN ({', '.join('?' * len(meeting_ids))}) "
+                    "AND frames_path IS NOT NULL",
+                    meeting_ids
+                ).fetchall()
+            ] if meeting_ids else []
+        return ds.dataset(paths, format='parquet', schema=frame_schema(_pyarrow())).to_table(columns=columns)
+    
+    def stats(self):
+        with self._connection() as conn:
+            meetings, teams, first_day, last_day = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT team), MIN(day), MAX(day) FROM meetings"
+            ).fetchone()
+            rollups = conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+        return {'meetings': meetings, 'teams': teams, 'first_day': first_day, 'last_day': last_day, 'rollups': rollups}
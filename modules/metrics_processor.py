@@ -1,6 +1,7 @@
 import numpy as np
-import librosa
-from config import ENERGY_SCALE
+from config import (
+    ENERGY_SCALE, ENERGY_GAIN, SILENCE_THRESHOLD, PARTICIPATION_THRESHOLD, VOLATILITY_GAIN, VOLATILITY_MAX
+)
 
 class MetricsProcessor:
     
@@ -9,45 +10,80 @@ class MetricsProcessor:
     
     def compute_energy(self, frame):
         rms = np.sqrt(np.mean(frame ** 2))
-        return float(min(rms * ENERGY_SCALE * 2.5, ENERGY_SCALE))
+        return float(min(rms * ENERGY_SCALE * ENERGY_GAIN, ENERGY_SCALE))
     
-    def detect_silence(self, frames, threshold=0.015):
+    @staticmethod
+    def compute_frame_rms(frames):
+        if len(frames) == 0:
+            return np.zeros(0)
+        return np.sqrt(np.mean(frames ** 2, axis=1))
+    
+    @staticmethod
+    def energy_from_rms(rms_values):
+        return np.minimum(np.asarray(rms_values) * ENERGY_SCALE * ENERGY_GAIN, ENERGY_SCALE)
+    
+    def detect_silence(self, frames, threshold=SILENCE_THRESHOLD):
         silent_count = sum(1 for frame in frames if np.sqrt(np.mean(frame ** 2)) < threshold)
         return (silent_count / len(frames)) * 100 if frames.size > 0 else 0
     
     def estimate_tempo(self, audio):
+        import librosa
         onset_env = librosa.onset.onset_strength(y=audio, sr=self.sample_rate)
         tempo = librosa.feature.tempo(onset_envelope=onset_env, sr=self.sample_rate)[0]
         return float(tempo)
     
-    def compute_participation(self, frames, threshold=0.02):
+    def compute_participation(self, frames, threshold=PARTICIPATION_THRESHOLD):
         active_frames = sum(1 for frame in frames if np.sqrt(np.mean(frame ** 2)) > threshold)
         participation = (active_frames / len(frames)) * 100 if len(frames) > 0 else 0
         return float(participation)
     
+    @staticmethod
+    def dominant_emotion_index(emotions):
+        max_emotion = max(emotions.items(), key=lambda x: x[1])[0]
+        emotion_map = {'neutral': 0, 'happy': 1, 'sad': 2, 'angry': 3, 'fearful': 4}
+        return emotion_map.get(max_emotion, 0)
+    
+    @staticmethod
+    def volatility_from_shifts(shift_total, frame_count):
+        """Volatility score from the summed absolute dominant-emotion changes."""
+        if frame_count < 2:
+            return 0.0
+        return min(float(shift_total / (frame_count - 1) * VOLATILITY_GAIN), VOLATILITY_MAX)
+    
     def compute_volatility(self, emotion_series):
         if len(emotion_series) < 2:
             return 0.0
         
-        dominant_emotions = []
-        for emotions in emotion_series:
-            max_emotion = max(emotions.items(), key=lambda x: x[1])[0]
-            emotion_map = {'neutral': 0, 'happy': 1, 'sad': 2, 'angry': 3, 'fearful': 4}
-            dominant_emotions.append(emotion_map.get(max_emotion, 0))
+        dominant_emotions = [self.dominant_emotion_index(emotions) for emotions in emotion_series]
         
         changes = np.abs(np.diff(dominant_emotions))
-        volatility = float(np.mean(changes) * 2.5)
-        return min(volatility, 10.0)
+        volatility = float(np.mean(changes) * VOLATILITY_GAIN)
+        return min(volatility, VOLATILITY_MAX)
     
     def calculate_all_metrics(self, frames, emotion_series, full_audio):
-        energy_values = [self.compute_energy(frame) for frame in frames]
+        return self.calculate_metrics_from_features(
+            self.compute_frame_rms(frames), emotion_series, self.estimate_tempo(full_audio)
+        )
+    
+    def calculate_metrics_from_features(self, rms_values, emotion_series, tempo):
+        """Compute metrics from stored per-frame RMS values instead of raw audio frames."""
+        rms_values = np.asarray(rms_values)
+        energy_values = self.energy_from_rms(rms_values).tolist()
+        frame_count = len(rms_values)
+        
+        if frame_count > 0:
+            silence_pct = float(np.sum(rms_values < SILENCE_THRESHOLD) / frame_count * 100)
+            participation = float(np.sum(rms_values > PARTICIPATION_THRESHOLD) / frame_count * 100)
+        else:
+            silence_pct = 0
+            participation = 0.0
         
         metrics = {
             'avg_energy': float(np.mean(energy_values)),
-            'silence_percentage': self.detect_silence(frames),
-            'participation': self.compute_participation(frames),
+            'silence_percentage': silence_pct,
+            'participation': participation,
             'volatility': self.compute_volatility(emotion_series),
-            'tempo': self.estimate_tempo(full_audio),
+            'tempo': float(tempo),
             'energy_timeline': energy_values
         }
         
@@ -1,5 +1,5 @@
 import numpy as np
-from config import MOODFLO_CATEGORIES
+from config import MOODFLO_CATEGORIES, MOOD_CUTOFFS
 
 class MoodMapper:
     
@@ -11,16 +11,21 @@ class MoodMapper:
         sad = emotion_dict.get('sad', 0)
         neutral = emotion_dict.get('neutral', 0)
         
-        if happy > 0.4 and energy > 30:
+        cutoffs = MOOD_CUTOFFS['energised']
+        if happy > cutoffs['happy'] and energy > cutoffs['min_energy']:
             return "energised"
         
-        if (angry + fearful) > 0.35 or (energy > 40 and angry > 0.25):
+        cutoffs = MOOD_CUTOFFS['stressed']
+        if (angry + fearful) > cutoffs['angry_fearful'] or (energy > cutoffs['high_energy'] and angry > cutoffs['angry']):
             return "stressed"
         
-        if neutral > 0.55 and energy < 20:
+        cutoffs = MOOD_CUTOFFS['flat']
+        if neutral > cutoffs['neutral'] and energy < cutoffs['max_energy']:
             return "flat"
         
-        if neutral > 0.35 and 20 <= energy <= 45 and sad < 0.25:
+        cutoffs = MOOD_CUTOFFS['thoughtful']
+        if (neutral > cutoffs['neutral'] and cutoffs['min_energy'] <= energy <= cutoffs['max_energy']
+                and sad < cutoffs['max_sad']):
             return "thoughtful"
         
         return "volatile"
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from config import OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE, OPENAI_KEEPALIVE_EXPIRY, INSIGHT_TIMEOUT
+
+class ConnectionStats:
+    """Counts requests and newly opened connections through httpcore's trace hook, so
+    the share of requests served on a kept-alive connection can be reported."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+    
+    def on_request(self, request):
+        with self.lock:
+            self.requests += 1
+        request.extensions['trace'] = self.trace
+    
+    def trace(self, event_name, info):
+        if event_name == 'connection.connect_tcp.started':
+            with self.lock:
+                self.connections += 1
+        elif event_name == 'connection.start_tls.started':
+            with self.lock:
+                self.tls_handshakes += 1
+    
+    def snapshot(self):
+        with self.lock:
+            requests, connections, tls_handshakes = self.requests, self.connections, self.tls_handshakes
+        reused = max(0, requests - connections)
+        return {
+            'requests': requests,
+            'new_connections': connections,
+            'tls_handshakes': tls_handshakes,
+            'reused': reused,
+            'reuse_rate': reused / requests if requests else 0.0
+        }
+
+class OpenAIClientRegistry:
+    """Process-wide OpenAI clients keyed by API key and base URL. Each client keeps a
+    pool of kept-alive HTTP connections, so analyses and sessions sharing a key skip
+    connection and TLS setup on every insights request."""
+    
+    def __init__(self, max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive=OPENAI_MAX_KEEPALIVE,
+                 keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY, timeout=INSIGHT_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.clients = {}
+        self.stats_by_client = {}
+    
+    @staticmethod
+    def _key(api_key, base_url):
+        # Keys are only kept inside the clients themselves
+        return hashlib.sha256(f"{api_key}\0{base_url or ''}".encode('utf-8')).hexdigest()
+    
+    def _build(self, api_key, base_url, stats):
+        import httpx
+        from openai import OpenAI, DefaultHttpxClient
+        
+        http_client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            event_hooks={'request': [stats.on_request]}
+        )
+        return OpenAI(api_key=api_key, base_url=base_url, timeout=self.timeout, http_client=http_client)
+    
+    def get(self, api_key, base_url=None):
+        key = self._key(api_key, base_url)
+        with self.lock:
+            if key not in self.clients:
+                stats = ConnectionStats()
+                self.clients[key] = self._build(api_key, base_url, stats)
+                self.stats_by_client[key] = stats
+            return self.clients[key]
+    
+    def stats(self):
+        """Connection reuse summed over every registered client."""
+        with self.lock:
+            snapshots = [stats.snapshot() for stats in self.stats_by_client.values()]
+        
+        totals = {'clients': len(snapshots)}
+        for field in ('requests', 'new_connections', 'tls_handshakes', 'reused'):
+            totals[field] = sum(snapshot[field] for snapshot in snapshots)
+        totals['reuse_rate'] = totals['reused'] / totals['requests'] if totals['requests'] else 0.0
+        return totals
+    
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
+            self.stats_by_client = {}
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def shared_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = OpenAIClientRegistry()
+        return _registry
+
+def get_client(api_key, base_url=None):
+    """Shared, pooled OpenAI client for api_key."""
+    return shared_registry().get(api_key, base_url)
@@ -0,0 +1,56 @@
+import threading
+import time
+
+class _Bucket:
+    
+    def __init__(self, per_minute, burst_seconds):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+    
+    def refill(self, elapsed):
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+    
+    def wait_for(self, amount):
+        # Requests larger than the bucket go through once it is full and leave it in debt
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+class RateLimiter:
+    """Thread-safe token-bucket limiter for an API quota given as requests per minute
+    and, optionally, tokens per minute. acquire() blocks until both budgets allow the
+    call; bursts are capped at burst_seconds worth of quota."""
+    
+    def __init__(self, requests_per_minute, tokens_per_minute=None, burst_seconds=1.0):
+        self.requests = _Bucket(requests_per_minute, burst_seconds)
+        self.tokens = _Bucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+        self.lock = threading.Lock()
+        self.last_refill = time.monotonic()
+        self.waited_s = 0.0
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.requests.refill(elapsed)
+        if self.tokens is not None:
+            self.tokens.refill(elapsed)
+    
+    def acquire(self, tokens=0):
+        """Block until one request of the given token cost fits; returns seconds waited."""
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                self._refill()
+                wait = self.requests.wait_for(1)
+                if self.tokens is not None:
+                    wait = max(wait, self.tokens.wait_for(tokens))
+                
+                if wait <= 0:
+                    self.requests.level -= 1
+                    if self.tokens is not None:
+                        self.tokens.level -= tokens
+                    waited = time.monotonic() - start
+                    self.waited_s += waited
+                    return waited
+            time.sleep(wait)
@@ -0,0 +1,80 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import REPORT_CACHE_MAX_ENTRIES, REPORT_WORKERS
+from modules.chart_renderer import shared_renderer
+from modules.frame_export import write_frames
+from modules.report_generator import ReportGenerator
+from modules.stage_profiler import StageProfiler
+
+class ReportCache:
+    """Rendered TXT/PDF reports and Parquet frame exports, keyed by a hash of the result.
+    submit() renders on a background thread and returns a future that later calls for
+    the same result share, so each report is built once however often the page reruns."""
+    
+    def __init__(self, max_entries=REPORT_CACHE_MAX_ENTRIES, workers=REPORT_WORKERS):
+        self.max_entries = max_entries
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reports')
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+    
+    @staticmethod
+    def result_key(results):
+        """Hash of everything a report shows: the recording, its summary and suggestions."""
+        payload = {
+            'content_hash': results.get('content_hash'),
+            'summary': results['summary'],
+            'suggestions': results.get('suggestions'),
+            'duration': results['duration'],
+            'filename': results.get('filename')
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    @staticmethod
+    def render(results):
+        profiler = StageProfiler()
+        report_gen = ReportGenerator(results, results['summary'], results['timeline'])
+        # Charts rasterize on their own threads while the text and tables are laid out
+        with profiler.stage('report_charts', items=3):
+            charts = shared_renderer().charts(results)
+        
+        with profiler.stage('report_txt', items=1):
+            txt = report_gen.generate_txt_report().encode('utf-8')
+        with profiler.stage('report_pdf', items=1):
+            buffer = io.BytesIO()
+            report_gen.write_pdf_report(buffer, charts)
+            pdf = buffer.getvalue()
+        
+        frames = None
+        with profiler.stage('report_frames', items=len(results['timeline'])):
+            try:
+                buffer = io.BytesIO()
+                write_frames(results, buffer, 'parquet')
+                frames = buffer.getvalue()
+            except ImportError:
+                pass
+        
+        return {'txt': txt, 'pdf': pdf, 'parquet': frames, 'stage_timings': profiler.stages}
+    
+    def submit(self, results):
+        key = self.result_key(results)
+        with self.lock:
+            future = self.entries.get(key)
+            if future is None:
+                # A copy, since the dashboard may swap in upgraded suggestions meanwhile
+                future = self.executor.submit(self.render, dict(results))
+                self.entries[key] = future
+            self.entries.move_to_end(key)
+            
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return future
+    
+    def discard(self, results):
+        """Forget the render for a result, so the next submit() starts a fresh one."""
+        with self.lock:
+            self.entries.pop(self.result_key(results), None)
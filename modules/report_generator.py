@@ -1,11 +1,10 @@
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import io
+import math
+import os
+import numpy as np
+import pandas as pd
+from config import REPORT_MAX_ROWS, REPORT_INTERVAL_STEPS, CHART_WIDTH_PX, CHART_HEIGHT_PX
 
 class ReportGenerator:
     def __init__(self, results, summary, timeline_df):
@@ -43,53 +42,103 @@ class ReportGenerator:
         secs = int(seconds % 60)
         return f"{mins}:{secs:02d}"
     
+    def format_interval(self, seconds):
+        if seconds < 60:
+            return f"{seconds}-second"
+        if seconds < 3600:
+            return f"{seconds // 60}-minute"
+        return f"{seconds // 3600}-hour"
+    
+    def report_interval(self):
+        """Bucket width of the timeline section: 30 seconds, widened in steps for long
+        meetings so the section never exceeds REPORT_MAX_ROWS rows."""
+        duration = self.results['duration']
+        for interval in REPORT_INTERVAL_STEPS:
+            if duration / interval <= REPORT_MAX_ROWS:
+                return interval
+        return math.ceil(duration / REPORT_MAX_ROWS / 3600) * 3600
+    
+    def timeline_buckets(self, interval=None):
+        """Mean energy and majority mood of the windows in each interval-second bucket."""
+        interval = interval or self.report_interval()
+        if len(self.timeline_df) == 0:
+            return pd.DataFrame({'start': [], 'category': [], 'energy': []})
+        
+        times = self.timeline_df['time'].to_numpy(dtype=float)
+        energy = self.timeline_df['energy'].to_numpy(dtype=float)
+        codes, labels = pd.factorize(self.timeline_df['category'])
+        
+        buckets = (times // interval).astype(np.int64)
+        count = int(buckets.max()) + 1
+        windows = np.bincount(buckets, minlength=count)
+        energy_sums = np.bincount(buckets, weights=energy, minlength=count)
+        votes = np.bincount(buckets * len(labels) + codes, minlength=count * len(labels)).reshape(count, len(labels))
+        
+        present = windows > 0
+        return pd.DataFrame({
+            'start': np.flatnonzero(present) * interval,
+            'category': np.asarray(labels)[votes.argmax(axis=1)][present],
+            'energy': energy_sums[present] / windows[present]
+        })
+    
     def generate_txt_report(self):
         """Generate a detailed TXT report"""
-        report_lines = []
-        
+        return "\n".join(self.iter_txt_report())
+    
+    def write_txt_report(self, target):
+        """Write the TXT report line by line to target, a file path or text stream."""
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, 'w', encoding='utf-8') as stream:
+                return self.write_txt_report(stream)
+        
+        for index, line in enumerate(self.iter_txt_report()):
+            target.write(line if index == 0 else "\n" + line)
+    
+    def iter_txt_report(self):
+        """Lines of the TXT report, produced one at a time."""
         # Header
-        report_lines.append("=" * 80)
-        report_lines.append("MOODFLO - MEETING EMOTION ANALYSIS REPORT".center(80))
-        report_lines.append("=" * 80)
-        report_lines.append("")
-        report_lines.append(f"Generated: {self.timestamp}")
-        report_lines.append(f"File: {self.results.get('filename', 'N/A')}")
-        report_lines.append(f"Duration: {self.format_time(self.results['duration'])}")
-        report_lines.append("")
+        yield "=" * 80
+        yield "MOODFLO - MEETING EMOTION ANALYSIS REPORT".center(80)
+        yield "=" * 80
+        yield ""
+        yield f"Generated: {self.timestamp}"
+        yield f"File: {self.results.get('filename', 'N/A')}"
+        yield f"Duration: {self.format_time(self.results['duration'])}"
+        yield ""
         
         # Executive Summary
-        report_lines.append("-" * 80)
-        report_lines.append("EXECUTIVE SUMMARY")
-        report_lines.append("-" * 80)
-        report_lines.append("")
+        yield "-" * 80
+        yield "EXECUTIVE SUMMARY"
+        yield "-" * 80
+        yield ""
         
         dominant_emotion = self.get_emotion_name(self.summary['dominant_emotion'])
-        report_lines.append(f"Dominant Emotion:        {dominant_emotion}")
-        report_lines.append(f"Average Energy Level:    {self.summary['avg_energy']:.1f}")
-        report_lines.append(f"Silence Percentage:      {self.summary['silence_pct']:.1f}%")
-        report_lines.append(f"Participation Rate:      {self.summary['participation']:.1f}%")
-        report_lines.append(f"Emotional Volatility:    {self.summary['volatility']:.2f}")
-        report_lines.append(f"Psychological Safety:    {self.summary['psych_risk']}")
-        report_lines.append("")
+        yield f"Dominant Emotion:        {dominant_emotion}"
+        yield f"Average Energy Level:    {self.summary['avg_energy']:.1f}"
+        yield f"Silence Percentage:      {self.summary['silence_pct']:.1f}%"
+        yield f"Participation Rate:      {self.summary['participation']:.1f}%"
+        yield f"Emotional Volatility:    {self.summary['volatility']:.2f}"
+        yield f"Psychological Safety:    {self.summary['psych_risk']}"
+        yield ""
         
         # Key Insights
-        report_lines.append("-" * 80)
-        report_lines.append("AI-POWERED INSIGHTS & RECOMMENDATIONS")
-        report_lines.append("-" * 80)
-        report_lines.append("")
+        yield "-" * 80
+        yield "AI-POWERED INSIGHTS & RECOMMENDATIONS"
+        yield "-" * 80
+        yield ""
         
         # Parse suggestions into lines
         suggestions_text = self.results.get('suggestions', 'No insights available.')
         for line in suggestions_text.split('\n'):
             if line.strip():
-                report_lines.append(line)
-        report_lines.append("")
+                yield line
+        yield ""
         
         # Emotion Distribution
-        report_lines.append("-" * 80)
-        report_lines.append("EMOTION DISTRIBUTION")
-        report_lines.append("-" * 80)
-        report_lines.append("")
+        yield "-" * 80
+        yield "EMOTION DISTRIBUTION"
+        yield "-" * 80
+        yield ""
         
         emotion_counts = self.timeline_df['category'].value_counts()
         total_frames = len(self.timeline_df)
@@ -98,60 +147,94 @@ class ReportGenerator:
             emotion = self.get_emotion_name(cat_num)
             percentage = (count / total_frames) * 100
             bar = "█" * int(percentage / 2)
-            report_lines.append(f"{emotion:25} {bar} {percentage:5.1f}%")
-        report_lines.append("")
-        
-        # Timeline Summary (every 30 seconds)
-        report_lines.append("-" * 80)
-        report_lines.append("EMOTION TIMELINE (30-SECOND INTERVALS)")
-        report_lines.append("-" * 80)
-        report_lines.append("")
-        report_lines.append(f"{'Time':>8} | {'Emotion':25} | {'Energy':>6}")
-        report_lines.append("-" * 80)
-        
-        # Sample every 30 seconds
-        duration = self.results['duration']
-        for t in range(0, int(duration), 30):
-            idx = int((t / duration) * len(self.timeline_df))
-            if idx < len(self.timeline_df):
-                row = self.timeline_df.iloc[idx]
-                emotion = self.get_emotion_name(row['category'])
-                time_str = self.format_time(t)
-                energy = row['energy']
-                report_lines.append(f"{time_str:>8} | {emotion:25} | {energy:6.1f}")
+            yield f"{emotion:25} {bar} {percentage:5.1f}%"
+        yield ""
+        
+        # Timeline Summary (mean energy and majority mood per interval)
+        interval = self.report_interval()
+        yield "-" * 80
+        yield f"EMOTION TIMELINE ({self.format_interval(interval).upper()} INTERVALS)"
+        yield "-" * 80
+        yield ""
+        yield f"{'Time':>8} | {'Emotion':25} | {'Energy':>6}"
+        yield "-" * 80
         
-        report_lines.append("")
+        for start, category, energy in self.timeline_buckets(interval).itertuples(index=False):
+            emotion = self.get_emotion_name(category)
+            yield f"{self.format_time(start):>8} | {emotion:25} | {energy:6.1f}"
+        
+        yield ""
         
         # Critical Moments
-        report_lines.append("-" * 80)
-        report_lines.append("CRITICAL MOMENTS")
-        report_lines.append("-" * 80)
-        report_lines.append("")
+        yield "-" * 80
+        yield "CRITICAL MOMENTS"
+        yield "-" * 80
+        yield ""
         
         critical_moments = self.results.get('critical_moments', [])
         if critical_moments:
             for moment in critical_moments:
                 time_str = self.format_time(moment['time'])
-                report_lines.append(f"[{time_str}] {moment['type']}: {moment['description']}")
+                yield f"[{time_str}] {moment['type']}: {moment['description']}"
         else:
-            report_lines.append("No critical moments detected.")
+            yield "No critical moments detected."
         
-        report_lines.append("")
+        yield ""
         
         # Footer
-        report_lines.append("=" * 80)
-        report_lines.append("End of Report")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-        report_lines.append("This report is confidential and intended for internal use only.")
-        report_lines.append("Data processed locally - no information sent to external servers.")
-        
-        return "\n".join(report_lines)
+        yield "=" * 80
+        yield "End of Report"
+        yield "=" * 80
+        yield ""
+        yield "This report is confidential and intended for internal use only."
+        yield "Data processed locally - no information sent to external servers."
+    
     
     def generate_pdf_report(self):
         """Generate a professional PDF report"""
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+        self.write_pdf_report(buffer)
+        buffer.seek(0)
+        return buffer
+    
+    def write_pdf_report(self, target, charts=None):
+        """Lay out the PDF report straight into target, a file path or binary stream.
+        
+        charts maps chart names to PNG bytes or futures of them (ChartRenderer.charts(),
+        used by default); a chart still rendering is only waited for when its page is drawn."""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+        from reportlab.lib.utils import ImageReader
+        from reportlab.platypus import Flowable
+        
+        if charts is None:
+            from modules.chart_renderer import shared_renderer
+            charts = shared_renderer().charts(self.results)
+        
+        class ChartImage(Flowable):
+            
+            def __init__(self, chart, width, height):
+                super().__init__()
+                self.chart = chart
+                self.width = width
+                self.height = height
+            
+            def wrap(self, available_width, available_height):
+                return self.width, self.height
+            
+            def draw(self):
+                png = self.chart.result() if hasattr(self.chart, 'result') else self.chart
+                self.canv.drawImage(ImageReader(io.BytesIO(png)), 0, 0, self.width, self.height)
+        
+        def chart_image(name):
+            width = doc.width
+            return ChartImage(charts[name], width, width * CHART_HEIGHT_PX / CHART_WIDTH_PX)
+        
+        doc = SimpleDocTemplate(target, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         story = []
         
         # Styles
@@ -251,6 +334,8 @@ class ReportGenerator:
         
         # Emotion Distribution
         story.append(Paragraph("Emotion Distribution", heading_style))
+        story.append(chart_image('distribution'))
+        story.append(Spacer(1, 0.2*inch))
         
         emotion_counts = self.timeline_df['category'].value_counts()
         total_frames = len(self.timeline_df)
@@ -278,18 +363,20 @@ class ReportGenerator:
         story.append(Spacer(1, 0.3*inch))
         
         # Timeline Summary
-        story.append(Paragraph("Emotion Timeline (30-second intervals)", heading_style))
+        interval = self.report_interval()
+        story.append(PageBreak())
+        story.append(Paragraph("Emotion Timeline Chart", heading_style))
+        story.append(chart_image('timeline'))
+        story.append(Spacer(1, 0.2*inch))
+        story.append(Paragraph("Energy Trajectory", heading_style))
+        story.append(chart_image('trajectory'))
+        story.append(Spacer(1, 0.3*inch))
         
-        timeline_data = [["Time", "Emotion", "Energy"]]
-        duration = self.results['duration']
-        for t in range(0, int(duration), 30):
-            idx = int((t / duration) * len(self.timeline_df))
-            if idx < len(self.timeline_df):
-                row = self.timeline_df.iloc[idx]
-                emotion = self.get_emotion_name(row['category'])
-                time_str = self.format_time(t)
-                energy = f"{row['energy']:.1f}"
-                timeline_data.append([time_str, emotion, energy])
+        story.append(Paragraph(f"Emotion Timeline ({self.format_interval(interval)} intervals)", heading_style))
+        
+        timeline_data = [["Time", "Emotion", "Avg Energy"]]
+        for start, category, energy in self.timeline_buckets(interval).itertuples(index=False):
+            timeline_data.append([self.format_time(start), self.get_emotion_name(category), f"{energy:.1f}"])
         
         timeline_table = Table(timeline_data, colWidths=[1*inch, 3*inch, 1.5*inch])
         timeline_table.setStyle(TableStyle([
@@ -349,5 +436,3 @@ class ReportGenerator:
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
-        return buffer
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import config
+from config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES, ANALYZER_VERSION
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class ResultCache:
+    """Persistent, content-addressed store of analysis results with size-bounded LRU eviction."""
+    
+    def __init__(self, cache_dir=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def hash_file(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def hash_bytes(data):
+        return hashlib.sha256(data).hexdigest()
+    
+    @staticmethod
+    def config_version():
+        """Fingerprint of every setting that changes analysis output."""
+        settings = {
+            'version': ANALYZER_VERSION,
+            'sample_rate': config.AUDIO_SAMPLE_RATE,
+            'frame': config.FRAME_DURATION,
+            'hop': config.HOP_DURATION,
+            'silence': config.SILENCE_THRESHOLD,
+            'low_energy': config.LOW_ENERGY_THRESHOLD,
+            'participation': config.PARTICIPATION_THRESHOLD,
+            'energy_scale': config.ENERGY_SCALE,
+            'energy_gain': config.ENERGY_GAIN,
+            'volatility': [config.VOLATILITY_GAIN, config.VOLATILITY_MAX],
+            'emotions': config.EMOTION_KEYS,
+            'categories': config.MOODFLO_CATEGORIES,
+            'mood_cutoffs': config.MOOD_CUTOFFS,
+            'thresholds': config.PSYCH_SAFETY_THRESHOLDS,
+            'risk_scoring': config.PSYCH_SAFETY_SCORING,
+            'digest': [
+                config.DIGEST_MAX_SEGMENTS, config.DIGEST_MIN_SEGMENT, config.DIGEST_TENSION_SPANS,
+                config.DIGEST_TENSION_GAP, config.DIGEST_QUARTERS
+            ]
+        }
+        encoded = json.dumps(settings, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+    
+    def make_key(self, content_hash, variant=""):
+        return f"{content_hash}-{self.config_version()}{'-' + variant if variant else ''}"
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+    
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        
+        # Touch on read so eviction order follows last use, not creation
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+    
+    def put(self, key, result):
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._path(key))
+        self.evict()
+    
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self):
+        with self._lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+    
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
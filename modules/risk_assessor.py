@@ -1,4 +1,4 @@
-from config import PSYCH_SAFETY_THRESHOLDS
+from config import PSYCH_SAFETY_THRESHOLDS, PSYCH_SAFETY_SCORING
 
 class RiskAssessor:
     
@@ -16,27 +16,19 @@ class RiskAssessor:
                 stress_pct = pct
                 break
         
-        if silence > PSYCH_SAFETY_THRESHOLDS['high_risk']['silence']:
-            risk_score += 3
-        elif silence > PSYCH_SAFETY_THRESHOLDS['medium_risk']['silence']:
-            risk_score += 1
+        scoring = PSYCH_SAFETY_SCORING
+        for name, value in (('silence', silence), ('stress', stress_pct), ('volatility', volatility)):
+            if value > PSYCH_SAFETY_THRESHOLDS['high_risk'][name]:
+                risk_score += scoring['high_points'][name]
+            elif value > PSYCH_SAFETY_THRESHOLDS['medium_risk'][name]:
+                risk_score += scoring['medium_points'][name]
         
-        if stress_pct > PSYCH_SAFETY_THRESHOLDS['high_risk']['stress']:
-            risk_score += 3
-        elif stress_pct > PSYCH_SAFETY_THRESHOLDS['medium_risk']['stress']:
-            risk_score += 1
+        if participation < scoring['min_participation']:
+            risk_score += scoring['low_participation_points']
         
-        if volatility > PSYCH_SAFETY_THRESHOLDS['high_risk']['volatility']:
-            risk_score += 2
-        elif volatility > PSYCH_SAFETY_THRESHOLDS['medium_risk']['volatility']:
-            risk_score += 1
-        
-        if participation < 40:
-            risk_score += 2
-        
-        if risk_score >= 5:
+        if risk_score >= scoring['levels']['High']:
             return "High"
-        elif risk_score >= 2:
+        elif risk_score >= scoring['levels']['Medium']:
             return "Medium"
         else:
             return "Low"
@@ -0,0 +1,50 @@
+from config import MOODFLO_CATEGORIES, SILENCE_THRESHOLD, PARTICIPATION_THRESHOLD
+from modules.metrics_processor import MetricsProcessor
+
+class RunningMetrics:
+    """O(1)-per-window accumulators for the meeting-level metrics, so partial results
+    can be reported while audio is still being decoded."""
+    
+    def __init__(self):
+        self.frame_count = 0
+        self.energy_sum = 0.0
+        self.silent_count = 0
+        self.active_count = 0
+        self.shift_total = 0
+        self.category_counts = {}
+        self._last_dominant = None
+    
+    def update(self, rms, energy, emotion, category):
+        self.frame_count += 1
+        self.energy_sum += float(energy)
+        
+        if rms < SILENCE_THRESHOLD:
+            self.silent_count += 1
+        if rms > PARTICIPATION_THRESHOLD:
+            self.active_count += 1
+        
+        dominant = MetricsProcessor.dominant_emotion_index(emotion)
+        if self._last_dominant is not None:
+            self.shift_total += abs(dominant - self._last_dominant)
+        self._last_dominant = dominant
+        
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+    
+    def snapshot(self):
+        if self.frame_count == 0:
+            return {
+                'frames': 0, 'avg_energy': 0.0, 'silence_pct': 0.0,
+                'participation': 0.0, 'volatility': 0.0, 'distribution': {}
+            }
+        
+        return {
+            'frames': self.frame_count,
+            'avg_energy': self.energy_sum / self.frame_count,
+            'silence_pct': self.silent_count / self.frame_count * 100,
+            'participation': self.active_count / self.frame_count * 100,
+            'volatility': MetricsProcessor.volatility_from_shifts(self.shift_total, self.frame_count),
+            'distribution': {
+                MOODFLO_CATEGORIES[category]: count / self.frame_count * 100
+                for category, count in self.category_counts.items()
+            }
+        }
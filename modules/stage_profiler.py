@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class StageProfiler:
+    """Records wall time, CPU time, peak RSS growth and item counts per pipeline stage."""
+    
+    def __init__(self):
+        self.stages = []
+        self._origin = time.perf_counter()
+    
+    @staticmethod
+    def peak_rss_mb():
+        if resource is None:
+            return 0.0
+        
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+        if sys.platform == "darwin":
+            return peak / (1024 * 1024)
+        return peak / 1024
+    
+    @contextmanager
+    def stage(self, name, items=None):
+        record = {'stage': name, 'items': items}
+        rss_before = self.peak_rss_mb()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        
+        try:
+            yield record
+        finally:
+            wall_end = time.perf_counter()
+            record['start_ms'] = (wall_start - self._origin) * 1000
+            record['wall_ms'] = (wall_end - wall_start) * 1000
+            record['cpu_ms'] = (time.process_time() - cpu_start) * 1000
+            record['peak_rss_delta_mb'] = max(self.peak_rss_mb() - rss_before, 0.0)
+            self.stages.append(record)
+    
+    def total_wall_ms(self):
+        return sum(stage['wall_ms'] for stage in self.stages)
+    
+    @staticmethod
+    def to_chrome_trace(stages, process_name="moodflo"):
+        """Convert stage records to the Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [{
+            'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+            'args': {'name': process_name}
+        }]
+        
+        for stage in stages:
+            events.append({
+                'name': stage['stage'],
+                'cat': 'analysis',
+                'ph': 'X',
+                'ts': stage['start_ms'] * 1000,
+                'dur': stage['wall_ms'] * 1000,
+                'pid': pid,
+                'tid': 0,
+                'args': {
+                    'cpu_ms': round(stage['cpu_ms'], 3),
+                    'peak_rss_delta_mb': round(stage['peak_rss_delta_mb'], 3),
+                    'items': stage['items']
+                }
+            })
+        
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    @staticmethod
+    def export_chrome_trace(stages, path, process_name="moodflo"):
+        with open(path, 'w') as f:
+            json.dump(StageProfiler.to_chrome_trace(stages, process_name), f)
+        return path
@@ -0,0 +1,194 @@
+import numpy as np
+from config import (
+    MOODFLO_CATEGORIES, HOP_DURATION, DIGEST_MAX_SEGMENTS, DIGEST_MIN_SEGMENT, DIGEST_TENSION_SPANS,
+    DIGEST_TENSION_GAP, DIGEST_QUARTERS, DIGEST_MAX_TOKENS
+)
+
+TENSE_CATEGORIES = ('stressed', 'volatile')
+
+def format_time(seconds):
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    if hours:
+        return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+    return f"{rest // 60:02d}:{rest % 60:02d}"
+
+class TimelineDigest:
+    """Fixed-size summary of an analysis timeline for the insights prompt: the main mood
+    segments, the longest tension spans and per-quarter energy. Every part has a fixed
+    number of entries, so the prompt stays the same size however long the meeting is."""
+    
+    def __init__(self, segments, tension, quarters):
+        self.segments = segments
+        self.tension = tension
+        self.quarters = quarters
+    
+    @staticmethod
+    def _runs(values):
+        """(start, stop) index pairs of runs of equal values."""
+        if len(values) == 0:
+            return []
+        boundaries = np.flatnonzero(values[1:] != values[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(values)]])
+        return list(zip(starts.tolist(), stops.tolist()))
+    
+    @staticmethod
+    def _label(durations):
+        return max(durations, key=durations.get)
+    
+    @staticmethod
+    def _merge(segments, index):
+        """Merge segments[index + 1] into segments[index]."""
+        first, second = segments[index], segments.pop(index + 1)
+        first['end'] = second['end']
+        for category, duration in second['durations'].items():
+            first['durations'][category] = first['durations'].get(category, 0.0) + duration
+    
+    @classmethod
+    def _segments(cls, categories, edges, max_segments, min_duration):
+        segments = []
+        for start, stop in cls._runs(categories):
+            segments.append({
+                'start': edges[start],
+                'end': edges[stop],
+                'durations': {categories[start]: edges[stop] - edges[start]}
+            })
+            # Linear first pass: blips shorter than min_duration join the segment before them
+            if len(segments) > 1 and edges[stop] - edges[start] < min_duration:
+                cls._merge(segments, len(segments) - 2)
+            while len(segments) > 1 and cls._label(segments[-2]['durations']) == cls._label(segments[-1]['durations']):
+                cls._merge(segments, len(segments) - 2)
+        
+        # Fold the shortest segment into a neighbour until the rest are long enough and few enough
+        while len(segments) > 1:
+            lengths = [segment['end'] - segment['start'] for segment in segments]
+            shortest = int(np.argmin(lengths))
+            if lengths[shortest] >= min_duration and len(segments) <= max_segments:
+                break
+            
+            if shortest == 0:
+                neighbour = 1
+            elif shortest == len(segments) - 1:
+                neighbour = shortest - 1
+            else:
+                neighbour = shortest - 1 if lengths[shortest - 1] <= lengths[shortest + 1] else shortest + 1
+            
+            first = min(shortest, neighbour)
+            cls._merge(segments, first)
+            
+            # Neighbours that now share a label become one segment
+            label = cls._label(segments[first]['durations'])
+            if first + 1 < len(segments) and cls._label(segments[first + 1]['durations']) == label:
+                cls._merge(segments, first)
+            if first > 0 and cls._label(segments[first - 1]['durations']) == label:
+                cls._merge(segments, first - 1)
+        
+        return [
+            {'start': round(segment['start']), 'end': round(segment['end']), 'category': cls._label(segment['durations'])}
+            for segment in segments
+        ]
+    
+    @classmethod
+    def _tension(cls, categories, energy, edges, top_k, gap):
+        tense = np.isin(categories, TENSE_CATEGORIES)
+        spans = []
+        for start, stop in cls._runs(tense):
+            if not tense[start]:
+                continue
+            # Short calmer stretches inside a tense passage do not split it
+            if spans and edges[start] - edges[spans[-1][1]] <= gap:
+                spans[-1] = (spans[-1][0], stop)
+            else:
+                spans.append((start, stop))
+        
+        spans.sort(key=lambda span: (edges[span[1]] - edges[span[0]], energy[span[0]:span[1]].mean()), reverse=True)
+        
+        tension = []
+        for start, stop in sorted(spans[:top_k]):
+            window = slice(start, stop)
+            tense_categories, counts = np.unique(categories[window][tense[window]], return_counts=True)
+            tension.append({
+                'start': round(edges[start]),
+                'end': round(edges[stop]),
+                'category': str(tense_categories[np.argmax(counts)]),
+                'avg_energy': round(float(energy[window].mean()), 1),
+                'peak_energy': round(float(energy[window].max()), 1)
+            })
+        return tension
+    
+    @staticmethod
+    def _quarters(categories, energy, edges, count):
+        quarters = []
+        for indices in np.array_split(np.arange(len(energy)), count):
+            if len(indices) == 0:
+                continue
+            names, counts = np.unique(categories[indices], return_counts=True)
+            quarters.append({
+                'start': round(edges[indices[0]]),
+                'end': round(edges[indices[-1] + 1]),
+                'avg_energy': round(float(energy[indices].mean()), 1),
+                'category': str(names[np.argmax(counts)])
+            })
+        return quarters
+    
+    @classmethod
+    def build(cls, timeline_df, max_segments=DIGEST_MAX_SEGMENTS, min_segment=DIGEST_MIN_SEGMENT,
+              tension_spans=DIGEST_TENSION_SPANS, tension_gap=DIGEST_TENSION_GAP, quarters=DIGEST_QUARTERS):
+        times = timeline_df['time'].to_numpy(dtype=float)
+        if len(times) == 0:
+            return cls([], [], [])
+        
+        energy = timeline_df['energy'].to_numpy(dtype=float)
+        categories = timeline_df['category'].to_numpy(dtype=str)
+        # Window i covers [edges[i], edges[i + 1])
+        edges = np.append(times, times[-1] + HOP_DURATION).tolist()
+        
+        return cls(
+            cls._segments(categories, edges, max_segments, min_segment),
+            cls._tension(categories, energy, edges, tension_spans, tension_gap),
+            cls._quarters(categories, energy, edges, quarters)
+        )
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['segments'], data['tension'], data['quarters'])
+    
+    def to_dict(self):
+        return {'segments': self.segments, 'tension': self.tension, 'quarters': self.quarters}
+    
+    @staticmethod
+    def _span(entry):
+        return f"{format_time(entry['start'])}-{format_time(entry['end'])}"
+    
+    @staticmethod
+    def _name(category):
+        return MOODFLO_CATEGORIES.get(category, category)
+    
+    def to_prompt(self, max_tokens=DIGEST_MAX_TOKENS):
+        """Prompt section for the digest, trimmed to roughly max_tokens (four characters
+        per token) by dropping the shortest mood segments first."""
+        segments = list(self.segments)
+        while True:
+            lines = ["Mood Segments:"]
+            lines += [f"- {self._span(segment)} {self._name(segment['category'])}" for segment in segments]
+            
+            lines.append("Longest Tension Spans:")
+            if self.tension:
+                lines += [
+                    f"- {self._span(span)} {self._name(span['category'])}, energy avg {span['avg_energy']:.0f} peak {span['peak_energy']:.0f}"
+                    for span in self.tension
+                ]
+            else:
+                lines.append("- none")
+            
+            lines.append("Energy by Quarter:")
+            lines += [
+                f"- Q{index} {self._span(quarter)}: {quarter['avg_energy']:.0f}/100, mostly {self._name(quarter['category'])}"
+                for index, quarter in enumerate(self.quarters, start=1)
+            ]
+            
+            text = "\n".join(lines) + "\n"
+            if len(text) // 4 <= max_tokens or not segments:
+                return text
+            segments.remove(min(segments, key=lambda segment: segment['end'] - segment['start']))
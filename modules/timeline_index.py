@@ -0,0 +1,101 @@
+import numpy as np
+from config import MOODFLO_CATEGORIES, LOW_ENERGY_THRESHOLD
+
+class TimelineIndex:
+    """Prefix sums over the analysis timeline, so any "so far" KPI at any playback
+    position is a constant-time lookup instead of a scan of the timeline prefix."""
+    
+    def __init__(self, times, energy_cumsum, low_energy_cumsum, change_cumsum, category_cumsum):
+        self.times = np.asarray(times, dtype=float)
+        self.energy_cumsum = np.asarray(energy_cumsum, dtype=float)
+        self.low_energy_cumsum = np.asarray(low_energy_cumsum, dtype=np.int64)
+        self.change_cumsum = np.asarray(change_cumsum, dtype=np.int64)
+        self.category_cumsum = {
+            category: np.asarray(counts, dtype=np.int64) for category, counts in category_cumsum.items()
+        }
+    
+    @classmethod
+    def build(cls, timeline_df):
+        energy = timeline_df['energy'].to_numpy(dtype=float)
+        categories = timeline_df['category'].to_numpy()
+        changes = np.zeros(len(categories), dtype=np.int64)
+        if len(categories) > 1:
+            changes[1:] = categories[1:] != categories[:-1]
+        
+        return cls(
+            times=timeline_df['time'].to_numpy(dtype=float),
+            energy_cumsum=np.cumsum(energy),
+            low_energy_cumsum=np.cumsum(energy < LOW_ENERGY_THRESHOLD),
+            change_cumsum=np.cumsum(changes),
+            category_cumsum={
+                category: np.cumsum(categories == category)
+                for category in MOODFLO_CATEGORIES
+            }
+        )
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+    
+    @classmethod
+    def from_result(cls, results):
+        """Index carried by an analysis result, built on the spot for older results without one."""
+        if results.get('timeline_index'):
+            return cls.from_dict(results['timeline_index'])
+        return cls.build(results['timeline'])
+    
+    def to_dict(self):
+        """JSON-safe form stored in analysis results."""
+        return {
+            'times': self.times.tolist(),
+            'energy_cumsum': self.energy_cumsum.tolist(),
+            'low_energy_cumsum': self.low_energy_cumsum.tolist(),
+            'change_cumsum': self.change_cumsum.tolist(),
+            'category_cumsum': {category: counts.tolist() for category, counts in self.category_cumsum.items()}
+        }
+    
+    def __len__(self):
+        return len(self.times)
+    
+    def index_at(self, playback_time, duration):
+        if len(self) == 0:
+            return 0
+        index = int((playback_time / duration) * len(self)) if duration > 0 else 0
+        return min(max(index, 0), len(self) - 1)
+    
+    def so_far(self, index):
+        """Meeting KPIs over windows 0..index inclusive."""
+        count = index + 1
+        return {
+            'avg_energy': float(self.energy_cumsum[index] / count),
+            'silence_pct': float(self.low_energy_cumsum[index] / count * 100),
+            'emotion_shifts': int(self.change_cumsum[index]),
+            'distribution': {
+                category: float(counts[index] / count * 100)
+                for category, counts in self.category_cumsum.items() if counts[index] > 0
+            }
+        }
+    
+    def running_avg_energy(self, index):
+        """Running average energy for windows 0..index, as a view-derived array."""
+        return self.energy_cumsum[:index + 1] / np.arange(1, index + 2)
+    
+    def to_live_payload(self, timeline_df, duration):
+        """Compact, JSON-ready timeline for the in-browser live dashboard: per-window
+        values plus the prefix sums, with categories sent as small integer codes."""
+        categories = list(self.category_cumsum)
+        codes = {category: code for code, category in enumerate(categories)}
+        return {
+            'duration': round(float(duration), 2),
+            'times': np.round(self.times, 2).tolist(),
+            'energy': np.round(timeline_df['energy'].to_numpy(dtype=float), 1).tolist(),
+            'codes': [codes.get(category, -1) for category in timeline_df['category']],
+            'categories': [
+                {'key': category, 'label': MOODFLO_CATEGORIES.get(category, category)}
+                for category in categories
+            ],
+            'energy_cumsum': np.round(self.energy_cumsum, 2).tolist(),
+            'low_energy_cumsum': self.low_energy_cumsum.tolist(),
+            'change_cumsum': self.change_cumsum.tolist(),
+            'category_cumsum': [self.category_cumsum[category].tolist() for category in categories]
+        }
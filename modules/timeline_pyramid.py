@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from config import MOODFLO_CATEGORIES, TIMELINE_POINT_BUDGET, TIMELINE_PYRAMID_FACTOR
+
+class TimelinePyramid:
+    """Multi-resolution copies of the analysis timeline for plotting long meetings.
+    
+    Level 0 is the full timeline. Each coarser level groups `factor` times more windows
+    per bucket, keeping the minimum and maximum energy point of every bucket (so peaks
+    and dips survive) and labelling the bucket with its majority category."""
+    
+    def __init__(self, levels, factor=TIMELINE_PYRAMID_FACTOR):
+        self.levels = levels
+        self.factor = factor
+    
+    @staticmethod
+    def _downsample(times, energy, codes, bucket, category_count):
+        n = len(energy)
+        buckets = -(-n // bucket)
+        padding = buckets * bucket - n
+        
+        padded_energy = np.concatenate([energy, np.full(padding, np.nan)]).reshape(buckets, bucket)
+        padded_codes = np.concatenate([codes, np.full(padding, -1)]).reshape(buckets, bucket)
+        offsets = np.arange(buckets) * bucket
+        
+        min_idx = offsets + np.nanargmin(padded_energy, axis=1)
+        max_idx = offsets + np.nanargmax(padded_energy, axis=1)
+        first = np.minimum(min_idx, max_idx)
+        second = np.maximum(min_idx, max_idx)
+        
+        counts = (padded_codes[:, :, None] == np.arange(category_count)).sum(axis=1)
+        majority = np.argmax(counts, axis=1)
+        
+        # Interleave each bucket's two extremes in time order, dropping duplicates
+        indices = np.stack([first, second], axis=1).ravel()
+        bucket_codes = np.repeat(majority, 2)
+        keep = np.ones(len(indices), dtype=bool)
+        keep[1::2] = second != first
+        indices = indices[keep]
+        return times[indices], energy[indices], bucket_codes[keep]
+    
+    @classmethod
+    def build(cls, timeline_df, factor=TIMELINE_PYRAMID_FACTOR, min_points=TIMELINE_POINT_BUDGET // 4):
+        categories = list(MOODFLO_CATEGORIES)
+        codes = {category: code for code, category in enumerate(categories)}
+        times = timeline_df['time'].to_numpy(dtype=float)
+        energy = timeline_df['energy'].to_numpy(dtype=float)
+        window_codes = np.array([codes.get(category, -1) for category in timeline_df['category']], dtype=np.int64)
+        
+        levels = []
+        bucket = factor
+        while len(energy) and 2 * -(-len(energy) // bucket) >= min_points:
+            level_times, level_energy, level_codes = cls._downsample(
+                times, energy, window_codes, bucket, len(categories)
+            )
+            levels.append({
+                'bucket': bucket,
+                'time': level_times.tolist(),
+                'energy': level_energy.tolist(),
+                'category': [categories[code] for code in level_codes]
+            })
+            bucket *= factor
+        
+        return cls([{'bucket': 1, 'frame': timeline_df}] + levels, factor)
+    
+    def to_dict(self):
+        """JSON-safe form stored in analysis results; level 0 is the timeline itself."""
+        return {
+            'factor': self.factor,
+            'levels': [
+                {key: value for key, value in level.items() if key != 'frame'} for level in self.levels[1:]
+            ]
+        }
+    
+    @classmethod
+    def from_result(cls, results):
+        """Pyramid carried by an analysis result, built on the spot for older results without one."""
+        data = results.get('timeline_pyramid')
+        if data is None:
+            return cls.build(results['timeline'])
+        return cls([{'bucket': 1, 'frame': results['timeline']}] + data['levels'], data['factor'])
+    
+    def _frame(self, level):
+        if 'frame' not in level:
+            level['frame'] = pd.DataFrame({
+                'time': level['time'], 'energy': level['energy'], 'category': level['category']
+            })
+        return level['frame']
+    
+    def select(self, start=None, end=None, max_points=TIMELINE_POINT_BUDGET):
+        """Finest level whose points inside [start, end] fit the budget, sliced to that range."""
+        for level in self.levels:
+            frame = self._frame(level)
+            times = frame['time']
+            first = 0 if start is None else times.searchsorted(start, side='left')
+            last = len(frame) if end is None else times.searchsorted(end, side='right')
+            if last - first <= max_points:
+                break
+        return frame.iloc[first:last]
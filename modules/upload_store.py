@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from config import UPLOAD_DIR, UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE, UPLOAD_LEASE_SECONDS
+
+class UploadStore:
+    """Spools uploads to disk in bounded chunks, hashing them on the way, and keeps the
+    spool directory under a size budget by evicting the oldest unreferenced uploads first.
+    
+    Files saved here stay owned until release(); files from other processes are only
+    evicted once untouched for lease_seconds."""
+    
+    def __init__(self, upload_dir=UPLOAD_DIR, max_bytes=UPLOAD_MAX_BYTES, chunk_size=UPLOAD_CHUNK_SIZE,
+                 lease_seconds=UPLOAD_LEASE_SECONDS):
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._owned = set()
+        os.makedirs(self.upload_dir, exist_ok=True)
+    
+    def save(self, stream, suffix=''):
+        """Copy a binary stream to a new spool file. Returns (path, sha256 hex digest)."""
+        digest = hashlib.sha256()
+        fd, path = tempfile.mkstemp(dir=self.upload_dir, suffix=suffix)
+        with self._lock:
+            self._owned.add(path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            self.release(path)
+            raise
+        
+        self.evict()
+        return path, digest.hexdigest()
+    
+    def release(self, path):
+        """Delete an upload once nothing needs it any more."""
+        if not path:
+            return
+        with self._lock:
+            self._owned.discard(path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def entries(self):
+        entries = []
+        for entry in os.scandir(self.upload_dir):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self):
+        """Delete the oldest uploads nobody holds until the spool fits the budget. Live
+        sessions and queued analyses can leave it over budget rather than lose a file."""
+        with self._lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            leased_after = time.time() - self.lease_seconds
+            
+            for mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in self._owned or mtime > leased_after:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
@@ -0,0 +1,30 @@
+"""Local analysis service with a durable SQLite job queue.
+    
+    python service.py --port 8765 --workers 4
+
+API:
+    POST /jobs                 raw file body, X-Filename header  -> {"job_id": ...}
+    GET  /jobs/<id>            status, progress, queue position, wait and service time
+    GET  /jobs/<id>/result     analysis result JSON
+    GET  /stats                queue depth and wait/service time percentiles
+
+Point the dashboard at it with MOODFLO_SERVICE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+from config import SERVICE_DATA_DIR
+from modules.analysis_service import AnalysisService
+
+def main():
+    parser = argparse.ArgumentParser(description="Moodflo analysis service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help="Analysis worker processes")
+    parser.add_argument('--data-dir', default=SERVICE_DATA_DIR)
+    args = parser.parse_args()
+    
+    service = AnalysisService(data_dir=args.data_dir, workers=args.workers)
+    print(f"Moodflo analysis service on http://{args.host}:{args.port} with {args.workers} workers")
+    service.serve(host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
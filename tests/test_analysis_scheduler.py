@@ -0,0 +1,44 @@
+import threading
+from types import SimpleNamespace
+import pytest
+from modules import analysis_scheduler
+from modules.analysis_scheduler import AnalysisScheduler, available_memory_mb
+
+def test_available_memory_uses_psutil(monkeypatch):
+    memory = SimpleNamespace(available=3 * 1024 * 1024 * 1024)
+    monkeypatch.setattr(analysis_scheduler, 'PSUTIL_AVAILABLE', True)
+    monkeypatch.setattr(analysis_scheduler, 'psutil', SimpleNamespace(virtual_memory=lambda: memory), raising=False)
+    assert available_memory_mb() == pytest.approx(3072)
+
+def test_available_memory_falls_back_to_sysconf(monkeypatch):
+    sizes = {'SC_AVPHYS_PAGES': 1024, 'SC_PAGE_SIZE': 4096}
+    monkeypatch.setattr(analysis_scheduler, 'PSUTIL_AVAILABLE', False)
+    monkeypatch.setattr(analysis_scheduler.os, 'sysconf', lambda name: sizes[name], raising=False)
+    assert available_memory_mb() == pytest.approx(4)
+
+def test_unknown_memory_does_not_block_admission(monkeypatch):
+    def unsupported(name):
+        raise ValueError(name)
+    monkeypatch.setattr(analysis_scheduler, 'PSUTIL_AVAILABLE', False)
+    monkeypatch.setattr(analysis_scheduler.os, 'sysconf', unsupported, raising=False)
+    assert available_memory_mb() is None
+    
+    scheduler = AnalysisScheduler(max_concurrent=2, emotion_workers=1, min_free_mb=10 ** 9, poll_interval=0.01)
+    first_admitted = threading.Event()
+    release_first = threading.Event()
+    
+    def hold_slot():
+        with scheduler.slot('first'):
+            first_admitted.set()
+            release_first.wait(5)
+    
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    assert first_admitted.wait(5)
+    try:
+        waits = []
+        with scheduler.slot('second', on_wait=lambda position, reason: waits.append(reason)):
+            assert 'memory' not in waits
+    finally:
+        release_first.set()
+        holder.join()
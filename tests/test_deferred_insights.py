@@ -0,0 +1,35 @@
+from concurrent.futures import Future
+from modules.analyzer import MeetingAnalyzer
+
+class RecordingCache:
+    def __init__(self):
+        self.stored = {}
+    
+    def put(self, key, results):
+        self.stored[key] = results
+
+def test_late_insights_are_cached_from_a_snapshot():
+    cache = RecordingCache()
+    analyzer = MeetingAnalyzer(result_cache=cache)
+    future = Future()
+    results = {'summary': {}, 'suggestions': 'fallback text', 'suggestions_source': 'pending', 'insights_future': future}
+    analyzer._cache_when_insights_arrive('key', results)
+    
+    # What resolve_insights() does on the dashboard thread once the future is done
+    del results['insights_future']
+    results['suggestions_source'] = 'fallback'
+    future.set_result('llm text')
+    
+    assert cache.stored['key']['suggestions'] == 'llm text'
+    assert cache.stored['key']['suggestions_source'] == 'llm'
+    assert 'insights_future' not in cache.stored['key']
+    assert results['suggestions'] == 'fallback text'
+
+def test_failed_insights_are_not_cached():
+    cache = RecordingCache()
+    analyzer = MeetingAnalyzer(result_cache=cache)
+    future = Future()
+    analyzer._cache_when_insights_arrive('key', {'suggestions': 'fallback text', 'insights_future': future})
+    future.set_exception(TimeoutError())
+    
+    assert cache.stored == {}
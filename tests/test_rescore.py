@@ -0,0 +1,80 @@
+import json
+import numpy as np
+import pytest
+import soundfile as sf
+import config
+from modules.analyzer import MeetingAnalyzer
+from modules.audio_processor import AudioProcessor
+from modules.batch_runner import BatchRunner
+from modules.feature_store import FeatureStore
+
+@pytest.fixture
+def recording(tmp_path):
+    """20 s of amplitude-modulated tone and noise, mono at 16 kHz."""
+    rate = 16000
+    rng = np.random.default_rng(1)
+    t = np.arange(20 * rate) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * t / 5)
+    signal = envelope * (0.3 * np.sin(2 * np.pi * 200 * t) + 0.05 * rng.standard_normal(len(t)))
+    path = tmp_path / 'recordings' / 'meeting.wav'
+    path.parent.mkdir()
+    sf.write(path, signal, rate, subtype='PCM_16')
+    return path
+
+def test_rescore_applies_new_thresholds_without_decoding(recording, tmp_path, monkeypatch):
+    analyzer = MeetingAnalyzer(feature_store=FeatureStore(str(tmp_path / 'features')))
+    first = analyzer.analyze(str(recording))
+    energised = config.MOODFLO_CATEGORIES['energised']
+    assert first['summary']['distribution'] != {energised: 100.0}
+    
+    def no_decode(*args, **kwargs):
+        raise AssertionError("rescore decoded the recording")
+    monkeypatch.setattr(AudioProcessor, 'decode_file', no_decode)
+    monkeypatch.setitem(config.MOOD_CUTOFFS['energised'], 'happy', -1.0)
+    monkeypatch.setitem(config.MOOD_CUTOFFS['energised'], 'min_energy', -1.0)
+    
+    rescored = analyzer.rescore(analyzer.feature_key(first['content_hash']))
+    
+    assert rescored['summary']['distribution'] == {energised: 100.0}
+    assert 'decode' not in [stage['stage'] for stage in rescored['stage_timings']]
+    np.testing.assert_allclose(rescored['timeline']['energy'], first['timeline']['energy'])
+
+def test_batch_rescores_files_whose_scoring_settings_changed(recording, tmp_path):
+    output_dir = tmp_path / 'results'
+    runner_args = (recording.parent, output_dir)
+    runner_kwargs = {'workers': 1, 'feature_dir': str(tmp_path / 'features')}
+    
+    first = BatchRunner(*runner_args, **runner_kwargs).run()
+    assert (first['files_done'], first['files_rescored']) == (1, 0)
+    assert BatchRunner(*runner_args, **runner_kwargs).run()['files_skipped'] == 1
+    
+    # Same as a threshold change: the recorded settings no longer match the current ones
+    manifest_path = output_dir / BatchRunner.MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    manifest['files']['meeting.wav']['config_version'] = 'stale'
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    
+    runner = BatchRunner(*runner_args, **runner_kwargs)
+    report = runner.run()
+    entry = runner.manifest['files']['meeting.wav']
+    
+    assert (report['files_done'], report['files_rescored'], report['files_skipped']) == (1, 1, 0)
+    assert 'decode' not in [stage['stage'] for stage in entry['stage_timings']]
+    assert entry['config_version'] != 'stale'
+
+def test_batch_reanalyzes_stale_files_without_features(recording, tmp_path):
+    output_dir = tmp_path / 'results'
+    BatchRunner(recording.parent, output_dir, workers=1).run()
+    
+    manifest_path = output_dir / BatchRunner.MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    manifest['files']['meeting.wav']['config_version'] = 'stale'
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    
+    runner = BatchRunner(recording.parent, output_dir, workers=1)
+    report = runner.run()
+    entry = runner.manifest['files']['meeting.wav']
+    
+    assert (report['files_done'], report['files_rescored'], report['files_skipped']) == (1, 0, 0)
+    assert 'decode' in [stage['stage'] for stage in entry['stage_timings']]
+    assert entry['config_version'] != 'stale'
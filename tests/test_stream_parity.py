@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.analyzer import MeetingAnalyzer
+from modules.audio_processor import AudioProcessor
+
+@pytest.fixture
+def stereo_44k(tmp_path):
+    """30 s of amplitude-modulated tones and noise, stereo at 44.1 kHz."""
+    rate = 44100
+    rng = np.random.default_rng(0)
+    t = np.arange(30 * rate) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * t / 7)
+    left = envelope * (0.3 * np.sin(2 * np.pi * 180 * t) + 0.05 * rng.standard_normal(len(t)))
+    right = envelope * (0.2 * np.sin(2 * np.pi * 240 * t) + 0.05 * rng.standard_normal(len(t)))
+    path = tmp_path / 'meeting_44k.wav'
+    sf.write(path, np.stack([left, right], axis=1), rate, subtype='PCM_16')
+    return str(path)
+
+def test_decode_matches_streamed_blocks(stereo_44k):
+    processor = AudioProcessor()
+    audio, sample_rate = processor.decode_file(stereo_44k)
+    streamed = np.concatenate(list(processor.iter_audio_blocks(stereo_44k, block_duration=3.3)))
+    
+    assert sample_rate == processor.sample_rate
+    assert abs(len(audio) - 30 * sample_rate) <= 1
+    np.testing.assert_allclose(streamed, audio, atol=1e-9)
+
+def test_stream_summary_matches_batch(stereo_44k):
+    analyzer = MeetingAnalyzer()
+    batch = analyzer.analyze(stereo_44k)
+    events = list(analyzer.analyze_stream(stereo_44k, block_duration=4.0))
+    stream = events[-1]['result']
+    
+    assert events[-1]['type'] == 'summary'
+    assert sum(event['type'] == 'window' for event in events) == len(batch['timeline'])
+    np.testing.assert_allclose(stream['timeline']['time'], batch['timeline']['time'])
+    np.testing.assert_allclose(stream['timeline']['energy'], batch['timeline']['energy'], atol=1e-6)
+    assert list(stream['timeline']['category']) == list(batch['timeline']['category'])
+    
+    for field in ('avg_energy', 'silence_pct', 'participation', 'volatility'):
+        assert stream['summary'][field] == pytest.approx(batch['summary'][field], abs=1e-6)
+    assert stream['summary']['psych_risk'] == batch['summary']['psych_risk']
+    assert stream['summary']['distribution'].keys() == batch['summary']['distribution'].keys()
+    for category, percentage in batch['summary']['distribution'].items():
+        assert stream['summary']['distribution'][category] == pytest.approx(percentage)